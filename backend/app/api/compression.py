@@ -0,0 +1,53 @@
+from __future__ import annotations
+
+import gzip
+
+from app.core.config import get_settings
+
+try:
+    import brotli
+except ImportError:  # optional: gzip only
+    brotli = None
+
+# Preferred first when a client weights them equally
+SUPPORTED_ENCODINGS = ("br", "gzip") if brotli is not None else ("gzip",)
+
+
+def negotiate(accept_encoding: str | None) -> str | None:
+    """
+    Picks the content coding for an Accept-Encoding header: the supported
+    coding with the highest q-value, or None for an uncompressed body.
+    """
+    if not accept_encoding or not get_settings().compression_enabled:
+        return None
+    weights: dict[str, float] = {}
+    for item in accept_encoding.split(","):
+        coding, _, params = item.strip().partition(";")
+        q = 1.0
+        name, _, value = params.strip().partition("=")
+        if name.strip().lower() == "q":
+            try:
+                q = float(value)
+            except ValueError:
+                q = 0.0
+        weights[coding.strip().lower()] = q
+    wildcard = weights.get("*", 0.0)
+    best, best_q = None, 0.0
+    for coding in SUPPORTED_ENCODINGS:
+        q = weights.get(coding, wildcard)
+        if q > best_q:
+            best, best_q = coding, q
+    return best
+
+
+def compress(body: bytes, encoding: str) -> bytes:
+    settings = get_settings()
+    if encoding == "br" and brotli is not None:
+        return brotli.compress(body, quality=settings.brotli_quality)
+    if encoding == "gzip":
+        return gzip.compress(body, compresslevel=settings.gzip_level, mtime=0)
+    raise ValueError(f"Unsupported content coding: {encoding}")
+
+
+def worth_compressing(body: bytes) -> bool:
+    return len(body) >= get_settings().compress_min_bytes
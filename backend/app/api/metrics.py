@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+from fastapi import APIRouter, HTTPException, Response
+
+from app.cache.digest_cache import get_digest_cache
+from app.cache.fragments import get_fragment_cache
+from app.core.metrics import Labels, get_metrics
+from app.pipeline.orchestrator import get_async_digest_flight, get_digest_flight
+from app.pipeline.shards import get_shard_cache
+
+router = APIRouter(tags=["metrics"])
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _cache_lookups() -> dict[Labels, float]:
+    digests, shards, fragments = get_digest_cache(), get_shard_cache(), get_fragment_cache()
+    return {
+        ("digest", "hit"): digests.hits,
+        ("digest", "stale"): digests.stale_hits,
+        ("digest", "miss"): digests.misses,
+        ("shard", "hit"): shards.hits,
+        ("shard", "miss"): shards.misses,
+        ("card", "hit"): fragments.hits,
+        ("card", "miss"): fragments.misses,
+    }
+
+
+def _cache_entries() -> dict[Labels, float]:
+    return {
+        ("digest",): len(get_digest_cache()),
+        ("shard",): len(get_shard_cache()),
+        ("card",): len(get_fragment_cache()),
+    }
+
+
+def _flight_calls() -> dict[Labels, float]:
+    sync, async_ = get_digest_flight(), get_async_digest_flight()
+    return {
+        ("sync", "executed"): sync.executions,
+        ("sync", "coalesced"): sync.coalesced,
+        ("async", "executed"): async_.executions,
+        ("async", "coalesced"): async_.coalesced,
+    }
+
+
+def _flight_ratios() -> dict[Labels, float]:
+    return {
+        ("sync",): get_digest_flight().coalescing_ratio,
+        ("async",): get_async_digest_flight().coalescing_ratio,
+    }
+
+
+# The caches and flights already count their calls, so these are only read when scraped
+get_metrics().callback(
+    "news_agent_cache_lookups_total",
+    "counter",
+    "Cache lookups by result (stale: served past its TTL while rebuilding).",
+    ("cache", "result"),
+    _cache_lookups,
+)
+get_metrics().callback(
+    "news_agent_cache_entries", "gauge", "Entries held per cache.", ("cache",), _cache_entries
+)
+get_metrics().callback(
+    "news_agent_digest_flight_calls_total",
+    "counter",
+    "Digest build calls by flight (sync build_digest, async /digest path) and whether they ran "
+    "the build or waited on an identical one in flight.",
+    ("flight", "result"),
+    _flight_calls,
+)
+get_metrics().callback(
+    "news_agent_digest_flight_coalescing_ratio",
+    "gauge",
+    "Share of digest build calls served by another caller's build.",
+    ("flight",),
+    _flight_ratios,
+)
+
+
+@router.get("/metrics", include_in_schema=False)
+def metrics() -> Response:
+    """
+    Prometheus text exposition of pipeline, feed and cache metrics.
+    """
+    registry = get_metrics()
+    if not registry.enabled:
+        raise HTTPException(status_code=404, detail="Metrics are disabled")
+    return Response(registry.render(), media_type=CONTENT_TYPE)
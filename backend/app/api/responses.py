@@ -0,0 +1,118 @@
+from __future__ import annotations
+
+from collections.abc import Callable, Mapping
+from typing import Any
+
+import orjson
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+from starlette.background import BackgroundTask
+
+from app.api.compression import SUPPORTED_ENCODINGS, compress, negotiate, worth_compressing
+from app.cache.fragments import get_fragment_cache
+from app.cache.model_memo import ModelMemo
+from app.core.config import get_settings
+from app.core.metrics import timed_stage
+from app.core.schemas import DigestCard, DigestResponse
+
+
+@timed_stage("serialize")
+def _dump_json(model: BaseModel) -> bytes:
+    """
+    Serializes a model with every list of cards spliced in from the card
+    fragment cache, so only new or changed stories are serialized.
+    """
+    card_lists = {
+        name: value
+        for name in type(model).model_fields
+        if isinstance(value := getattr(model, name), list)
+        and value
+        and isinstance(value[0], DigestCard)
+    }
+    if not card_lists:
+        return model.__pydantic_serializer__.to_json(model)
+
+    fragments = get_fragment_cache()
+    envelope = model.model_dump(mode="json", exclude=set(card_lists))
+    body = {
+        name: (
+            [orjson.Fragment(fragments.fragment(card)) for card in card_lists[name]]
+            if name in card_lists
+            else envelope[name]
+        )
+        for name in type(model).model_fields
+    }
+    return orjson.dumps(body)
+
+
+# Cached digests are handed out as the same instance on every hit, so their
+# body and its compressed forms are kept alongside the cached entry.
+_rendered_digests = ModelMemo(_dump_json, get_settings().digest_cache_size)
+
+
+def _compressor(encoding: str) -> Callable[[DigestResponse], bytes]:
+    return lambda model: compress(_rendered_digests(model), encoding)
+
+
+_compressed_digests = {
+    encoding: ModelMemo(_compressor(encoding), get_settings().digest_cache_size)
+    for encoding in SUPPORTED_ENCODINGS
+}
+
+
+def render_model(model: BaseModel) -> bytes:
+    """
+    JSON bytes of a validated model; a digest is only serialized once.
+    """
+    if isinstance(model, DigestResponse):
+        return _rendered_digests(model)
+    return _dump_json(model)
+
+
+class FastJSONResponse(JSONResponse):
+    """
+    JSON response for models the pipeline already validated. Routes return
+    it directly, so FastAPI's response_model pass is skipped; models are
+    serialized by pydantic-core and spliced into lists by orjson as
+    fragments.
+
+    Given the request's Accept-Encoding, bodies above the size threshold
+    are compressed; a cached digest is only compressed once per coding.
+    """
+
+    def __init__(
+        self,
+        content: Any,
+        status_code: int = 200,
+        headers: Mapping[str, str] | None = None,
+        media_type: str | None = None,
+        background: BackgroundTask | None = None,
+        accept_encoding: str | None = None,
+    ):
+        self.encoding = negotiate(accept_encoding)
+        super().__init__(content, status_code, headers, media_type, background)
+        if accept_encoding is not None:
+            self.headers["Vary"] = "Accept-Encoding"
+
+    def render(self, content: Any) -> bytes:
+        if isinstance(content, BaseModel):
+            body = render_model(content)
+        else:
+            body = orjson.dumps(content, default=_default)
+        if self.encoding is None or not worth_compressing(body):
+            self.encoding = None
+            return body
+        if isinstance(content, DigestResponse):
+            return _compressed_digests[self.encoding](content)
+        return compress(body, self.encoding)
+
+    def init_headers(self, headers: Mapping[str, str] | None = None) -> None:
+        super().init_headers(headers)
+        if self.encoding is not None:
+            self.raw_headers.append((b"content-encoding", self.encoding.encode()))
+
+
+def _default(obj: Any) -> Any:
+    if isinstance(obj, BaseModel):
+        return orjson.Fragment(render_model(obj))
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
@@ -1,13 +1,324 @@
 from __future__ import annotations
 
-from fastapi import APIRouter
+from collections.abc import AsyncIterator, Iterable
+from contextlib import aclosing
+from functools import partial
 
-from app.core.schemas import DigestRequest, DigestResponse
-from app.pipeline.orchestrator import build_digest
+import anyio
+from fastapi import (
+    APIRouter,
+    HTTPException,
+    Query,
+    Request,
+    Response,
+    WebSocket,
+    WebSocketDisconnect,
+    status,
+)
+from fastapi.responses import StreamingResponse
+from pydantic import ValidationError
+
+from app.api.compression import negotiate
+from app.api.responses import FastJSONResponse
+from app.cache.digest_cache import CacheEntry, get_digest_cache
+from app.cache.digest_history import get_digest_history
+from app.cache.keys import digest_request_key
+from app.cache.snapshots import decode_cursor, encode_cursor
+from app.core.admission import Overloaded
+from app.core.config import get_settings
+from app.core.executors import run_cpu
+from app.core.schemas import (
+    DigestDelta,
+    DigestPage,
+    DigestRequest,
+    DigestResponse,
+    DigestStreamFrame,
+    QAStatus,
+)
+from app.pipeline.format.versioning import card_fingerprints, digest_delta, digest_version
+from app.pipeline.orchestrator import (
+    build_digest_async,
+    build_digests_async,
+    get_snapshot_store,
+    page_cards,
+    rank_digest_async,
+    stream_digest,
+    stream_frames,
+)
+from app.pipeline.prewarm import get_prewarmer
+from app.pipeline.subscriptions import get_subscription_hub
 
 router = APIRouter(tags=["digest"])
 
 
-@router.post("/digest", response_model=DigestResponse)
-def digest(req: DigestRequest) -> DigestResponse:
-    return build_digest(req)
+@router.post("/digest", response_model=DigestResponse, response_class=FastJSONResponse)
+async def digest(req: DigestRequest, request: Request) -> Response:
+    """
+    Returns the digest with a strong ETag per content coding; an
+    If-None-Match naming the same version (in any coding) gets 304,
+    without the body being rendered or compressed.
+    """
+    result, version = await _versioned_digest(req)
+    accept_encoding = _accept_encoding(request)
+    matched = _matching_etag(
+        request.headers.get("if-none-match"), version, negotiate(accept_encoding)
+    )
+    if matched is not None:
+        return Response(status_code=304, headers={"ETag": matched, "Vary": "Accept-Encoding"})
+    response = FastJSONResponse(result, accept_encoding=accept_encoding)
+    response.headers["ETag"] = _etag(version, response.encoding)
+    return response
+
+
+@router.post("/digest/delta", response_model=DigestDelta, response_class=FastJSONResponse)
+async def digest_delta_since(
+    req: DigestRequest, request: Request, since: str | None = None
+) -> Response:
+    """
+    Delta mode: only the cards added, changed or removed since version
+    `since` (a previous ETag, quotes optional). 304 when nothing changed.
+    """
+    result, version = await _versioned_digest(req)
+    since = _etag_version(since) if since else None
+    if since == version:
+        return Response(status_code=304, headers={"ETag": f'"{version}"'})
+    previous = get_digest_history().get(since) if since else None
+    delta = digest_delta(result, version, since, previous)
+    return FastJSONResponse(delta, accept_encoding=_accept_encoding(request))
+
+
+async def _versioned_digest(req: DigestRequest) -> tuple[DigestResponse, str]:
+    get_prewarmer().record(req)
+    cache = get_digest_cache()
+    try:
+        result = await cache.get_or_build_async(req, build_digest_async)
+    except Overloaded as e:
+        result = _stale_or_unavailable(req, cache.peek(req), e)
+    version = digest_version(result)
+    get_digest_history().record(version, partial(card_fingerprints, result))
+    return result, version
+
+
+def _stale_or_unavailable(
+    req: DigestRequest, entry: CacheEntry | None, overloaded: Overloaded
+) -> DigestResponse:
+    """
+    When a build is shed, the last cached digest for the request (however
+    old) is served with a `stale` note; without one the client gets 503.
+    """
+    if entry is None:
+        raise _unavailable(overloaded)
+    cached = entry.response
+    generated = cached.generated_at.strftime("%Y-%m-%d %H:%M UTC")
+    note = f"stale: the server is at capacity, so this is the digest generated at {generated}."
+    return cached.model_copy(update={"request": req, "qa_notes": [*(cached.qa_notes or []), note]})
+
+
+def _unavailable(overloaded: Overloaded) -> HTTPException:
+    return HTTPException(
+        status_code=503,
+        detail=f"{overloaded}; retry later",
+        headers={"Retry-After": str(overloaded.retry_after)},
+    )
+
+
+def _accept_encoding(request: Request) -> str:
+    return request.headers.get("accept-encoding", "")
+
+
+def _etag(version: str, encoding: str | None) -> str:
+    # Each coding is its own representation, so it needs its own strong ETag
+    return f'"{version}-{encoding}"' if encoding else f'"{version}"'
+
+
+def _etag_version(tag: str) -> str:
+    """
+    The digest version an ETag was issued for, whatever its coding.
+    """
+    # Versions are hex, so anything after a dash is the coding suffix
+    return tag.strip().removeprefix("W/").strip('"').partition("-")[0]
+
+
+def _matching_etag(if_none_match: str | None, version: str, encoding: str | None) -> str | None:
+    """
+    The ETag a 304 for `version` carries, or None when If-None-Match names
+    another version. A body too small to compress is sent uncoded, which
+    the negotiated `encoding` cannot tell, so a client already holding the
+    uncoded tag gets that one back.
+    """
+    if not if_none_match:
+        return None
+    preferred = _etag(version, encoding)
+    if if_none_match.strip() == "*":
+        return preferred
+    # If-None-Match uses weak comparison, so W/ prefixes are ignored
+    tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    if not any(_etag_version(tag) == version for tag in tags):
+        return None
+    if preferred not in tags and _etag(version, None) in tags:
+        return _etag(version, None)
+    return preferred
+
+
+@router.post("/digest/pages", response_model=DigestPage, response_class=FastJSONResponse)
+async def digest_pages(
+    req: DigestRequest,
+    request: Request,
+    cursor: str | None = None,
+    limit: int = Query(10, ge=1, le=50),
+) -> Response:
+    """
+    Cursor pagination over every ranked story (max_cards does not apply).
+    The first page ranks a snapshot (or reuses the latest one for the same
+    request until the digest TTL has passed); `next_cursor` pages through
+    that snapshot, only building the cards of each page. An expired cursor
+    gets 410, and a first page that cannot get a build slot gets 503.
+    """
+    store = get_snapshot_store()
+    if cursor is None:
+        try:
+            snapshot, offset = await store.latest_or_rank(req, rank_digest_async), 0
+        except Overloaded as e:
+            raise _unavailable(e) from None
+    else:
+        try:
+            snapshot_id, offset = decode_cursor(cursor)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Malformed cursor") from None
+        found = store.get(snapshot_id)
+        if found is None:
+            raise HTTPException(status_code=410, detail="Cursor expired; start from page one")
+        if found.request_key != digest_request_key(req):
+            raise HTTPException(status_code=400, detail="Cursor belongs to another request")
+        snapshot = found
+
+    ranked = snapshot.ranked
+    cards, next_offset = await run_cpu(page_cards, ranked, offset, limit)
+    if ranked.fallback is not None:
+        qa_status, qa_notes = ranked.fallback.qa_status, ranked.fallback.qa_notes
+    elif ranked.summaries:
+        qa_status, qa_notes = QAStatus.PASS, None
+    else:
+        qa_status, qa_notes = QAStatus.FAIL, ["No stories matched this request."]
+    page = DigestPage(
+        snapshot=snapshot.id,
+        generated_at=ranked.generated_at,
+        qa_status=qa_status,
+        qa_notes=qa_notes,
+        request=req,
+        cards=cards,
+        next_cursor=encode_cursor(snapshot.id, next_offset) if next_offset is not None else None,
+        total_clusters=len(ranked.fallback.cards if ranked.fallback else ranked.summaries),
+    )
+    return FastJSONResponse(page, accept_encoding=_accept_encoding(request))
+
+
+@router.post("/digest/stream")
+async def digest_stream(req: DigestRequest, request: Request) -> StreamingResponse:
+    """
+    Streams the digest as NDJSON frames, or as server-sent events when the
+    client accepts text/event-stream. A fresh cached digest is replayed
+    as frames; otherwise cards are sent as feeds arrive, or 503 when no
+    build slot is free.
+    """
+    get_prewarmer().record(req)
+    cache = get_digest_cache()
+    cached = cache.get_fresh(req)
+    if cached is not None:
+        return _frame_stream(_replay(stream_frames(cached)), request)
+    frames = stream_digest(req, on_complete=lambda response: cache.put(req, response))
+    # Admission happens before the first frame, while a 503 can still be sent
+    try:
+        first = await anext(frames)
+    except Overloaded as e:
+        raise _unavailable(e) from None
+    return _frame_stream(_prepend(first, frames), request)
+
+
+def _frame_stream(frames: AsyncIterator[DigestStreamFrame], request: Request) -> StreamingResponse:
+    if "text/event-stream" in request.headers.get("accept", ""):
+        return StreamingResponse(_sse(frames), media_type="text/event-stream")
+    return StreamingResponse(_ndjson(frames), media_type="application/x-ndjson")
+
+
+async def _replay(frames: Iterable[DigestStreamFrame]) -> AsyncIterator[DigestStreamFrame]:
+    for frame in frames:
+        yield frame
+
+
+async def _prepend(
+    first: DigestStreamFrame, rest: AsyncIterator[DigestStreamFrame]
+) -> AsyncIterator[DigestStreamFrame]:
+    yield first
+    async for frame in rest:
+        yield frame
+
+
+async def _ndjson(frames: AsyncIterator[DigestStreamFrame]) -> AsyncIterator[str]:
+    async for frame in frames:
+        yield frame.model_dump_json() + "\n"
+
+
+async def _sse(frames: AsyncIterator[DigestStreamFrame]) -> AsyncIterator[str]:
+    async for frame in frames:
+        yield f"event: {frame.type}\ndata: {frame.model_dump_json()}\n\n"
+
+
+@router.post("/digest/subscribe")
+async def digest_subscribe(req: DigestRequest, request: Request) -> StreamingResponse:
+    """
+    Subscribes to a digest over NDJSON or server-sent events: the current
+    digest as frames, then only the cards added, updated or removed each
+    time it changes. Subscribers to the same request share one refresh.
+    """
+    get_prewarmer().record(req)
+    return _frame_stream(get_subscription_hub().subscribe(req), request)
+
+
+@router.websocket("/digest/subscribe")
+async def digest_subscribe_ws(websocket: WebSocket) -> None:
+    """
+    WebSocket form of POST /digest/subscribe: the client sends the
+    DigestRequest as its first message and then receives frames.
+    """
+    await websocket.accept()
+    try:
+        req = DigestRequest.model_validate(await websocket.receive_json())
+    except (ValidationError, ValueError) as e:
+        await websocket.close(code=status.WS_1007_INVALID_FRAME_PAYLOAD_DATA, reason=str(e)[:120])
+        return
+    get_prewarmer().record(req)
+
+    async with anyio.create_task_group() as tasks:
+
+        async def push() -> None:
+            try:
+                async with aclosing(get_subscription_hub().subscribe(req)) as frames:
+                    async for frame in frames:
+                        await websocket.send_text(frame.model_dump_json())
+            except WebSocketDisconnect:
+                pass
+            tasks.cancel_scope.cancel()
+
+        async def until_disconnect() -> None:
+            while (await websocket.receive())["type"] != "websocket.disconnect":
+                pass
+            tasks.cancel_scope.cancel()
+
+        tasks.start_soon(push)
+        tasks.start_soon(until_disconnect)
+
+
+@router.post("/digests", response_model=list[DigestResponse], response_class=FastJSONResponse)
+async def digests(reqs: list[DigestRequest], request: Request) -> Response:
+    """
+    Builds a batch of digests with one shared gather; results follow input order.
+    """
+    limit = get_settings().digest_batch_max
+    if len(reqs) > limit:
+        raise HTTPException(status_code=413, detail=f"At most {limit} requests per batch")
+    try:
+        results = await get_digest_cache().get_or_build_many_async(reqs, build_digests_async)
+    except Overloaded as e:
+        raise _unavailable(e) from None
+    return FastJSONResponse(results, accept_encoding=_accept_encoding(request))
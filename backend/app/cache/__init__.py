@@ -0,0 +1 @@
+# Cache layer: response caching and request coalescing
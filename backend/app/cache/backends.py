@@ -0,0 +1,452 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import math
+import socket
+import sqlite3
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Protocol
+from urllib.parse import urlparse
+
+from app.core.config import Settings, get_settings
+from app.core.executors import run_cpu
+
+logger = logging.getLogger(__name__)
+
+
+class CacheBackendError(RuntimeError):
+    """
+    The backend could not be reached or answered with an error.
+    Callers treat this as a cache miss.
+    """
+
+
+class CacheBackend(Protocol):
+    """
+    Byte-oriented key/value cache with per-key TTLs.
+
+    `ttl` values are seconds; None means no expiry. `remaining_ttl` returns
+    None for a missing key and math.inf for a key without expiry.
+    `compare_and_set` writes only if the current value equals `expected`
+    (None meaning "key absent") and reports whether it wrote.
+    """
+
+    def get(self, key: str) -> bytes | None: ...
+
+    def set(self, key: str, value: bytes, ttl: float | None = None) -> None: ...
+
+    def remaining_ttl(self, key: str) -> float | None: ...
+
+    def compare_and_set(
+        self, key: str, expected: bytes | None, value: bytes, ttl: float | None = None
+    ) -> bool: ...
+
+    def delete(self, key: str) -> None: ...
+
+
+class MemoryBackend:
+    """
+    In-process LRU backend; the default for a single process.
+    """
+
+    def __init__(self, max_entries: int = 4096, clock: Callable[[], float] = time.monotonic):
+        self.max_entries = max_entries
+        self._clock = clock
+        self._entries: OrderedDict[str, tuple[bytes, float | None]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _live(self, key: str) -> tuple[bytes, float | None] | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry[1] is not None and self._clock() >= entry[1]:
+            del self._entries[key]
+            return None
+        return entry
+
+    def _store(self, key: str, value: bytes, ttl: float | None) -> None:
+        expires_at = None if ttl is None else self._clock() + ttl
+        self._entries[key] = (value, expires_at)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def get(self, key: str) -> bytes | None:
+        with self._lock:
+            entry = self._live(key)
+            if entry is None:
+                return None
+            self._entries.move_to_end(key)
+            return entry[0]
+
+    def set(self, key: str, value: bytes, ttl: float | None = None) -> None:
+        with self._lock:
+            self._store(key, value, ttl)
+
+    def remaining_ttl(self, key: str) -> float | None:
+        with self._lock:
+            entry = self._live(key)
+            if entry is None:
+                return None
+            return math.inf if entry[1] is None else entry[1] - self._clock()
+
+    def compare_and_set(
+        self, key: str, expected: bytes | None, value: bytes, ttl: float | None = None
+    ) -> bool:
+        with self._lock:
+            entry = self._live(key)
+            if (entry[0] if entry else None) != expected:
+                return False
+            self._store(key, value, ttl)
+            return True
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+
+SQLITE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS cache (
+    key TEXT PRIMARY KEY,
+    value BLOB NOT NULL,
+    expires_at REAL
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_cache_expires ON cache (expires_at);
+"""
+
+
+class SQLiteBackend:
+    """
+    On-disk backend shared by every process on a host (WAL, per-thread
+    connections). Expiry uses wall-clock time so processes agree on it;
+    expired rows are ignored on read and purged every `purge_every` writes.
+    """
+
+    def __init__(self, path: Path, clock: Callable[[], float] = time.time, purge_every: int = 256):
+        self.path = path
+        self.purge_every = purge_every
+        self._clock = clock
+        self._local = threading.local()
+        self._writes = 0
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._connect().executescript(SQLITE_SCHEMA)
+
+    def _connect(self) -> sqlite3.Connection:
+        conn: sqlite3.Connection | None = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def _read(self, conn: sqlite3.Connection, key: str) -> tuple[bytes, float | None] | None:
+        row = conn.execute(
+            "SELECT value, expires_at FROM cache WHERE key = ? "
+            "AND (expires_at IS NULL OR expires_at > ?)",
+            (key, self._clock()),
+        ).fetchone()
+        return None if row is None else (bytes(row[0]), row[1])
+
+    def _write(self, conn: sqlite3.Connection, key: str, value: bytes, ttl: float | None) -> None:
+        expires_at = None if ttl is None else self._clock() + ttl
+        conn.execute(
+            "INSERT INTO cache (key, value, expires_at) VALUES (?, ?, ?) "
+            "ON CONFLICT (key) DO UPDATE SET value = excluded.value, "
+            "expires_at = excluded.expires_at",
+            (key, value, expires_at),
+        )
+        self._writes += 1
+        if self._writes % self.purge_every == 0:
+            conn.execute("DELETE FROM cache WHERE expires_at <= ?", (self._clock(),))
+
+    def get(self, key: str) -> bytes | None:
+        entry = self._read(self._connect(), key)
+        return None if entry is None else entry[0]
+
+    def set(self, key: str, value: bytes, ttl: float | None = None) -> None:
+        self._write(self._connect(), key, value, ttl)
+
+    def remaining_ttl(self, key: str) -> float | None:
+        entry = self._read(self._connect(), key)
+        if entry is None:
+            return None
+        return math.inf if entry[1] is None else entry[1] - self._clock()
+
+    def compare_and_set(
+        self, key: str, expected: bytes | None, value: bytes, ttl: float | None = None
+    ) -> bool:
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            entry = self._read(conn, key)
+            if (entry[0] if entry else None) != expected:
+                conn.execute("ROLLBACK")
+                return False
+            self._write(conn, key, value, ttl)
+            conn.execute("COMMIT")
+            return True
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+
+    def delete(self, key: str) -> None:
+        self._connect().execute("DELETE FROM cache WHERE key = ?", (key,))
+
+
+class _RespConnection:
+    """
+    Minimal RESP2 client connection: enough of the protocol for the
+    commands RedisBackend sends.
+    """
+
+    def __init__(self, host: str, port: int, db: int, timeout: float):
+        self._sock = socket.create_connection((host, port), timeout=timeout)
+        self._file = self._sock.makefile("rb")
+        if db:
+            self.call("SELECT", db)
+
+    def call(self, *args: str | bytes | int | float) -> Any:
+        parts = [b"*%d\r\n" % len(args)]
+        for arg in args:
+            data = arg if isinstance(arg, bytes) else str(arg).encode()
+            parts.append(b"$%d\r\n%s\r\n" % (len(data), data))
+        self._sock.sendall(b"".join(parts))
+        return self._read_reply()
+
+    def _read_reply(self) -> Any:
+        line = self._file.readline()
+        if not line:
+            raise CacheBackendError("connection closed")
+        kind, body = line[:1], line[1:-2]
+        if kind == b"+":
+            return body.decode()
+        if kind == b"-":
+            raise CacheBackendError(body.decode())
+        if kind == b":":
+            return int(body)
+        if kind == b"$":
+            length = int(body)
+            if length < 0:
+                return None
+            data = self._file.read(length + 2)
+            return data[:-2]
+        if kind == b"*":
+            length = int(body)
+            return None if length < 0 else [self._read_reply() for _ in range(length)]
+        raise CacheBackendError(f"unexpected reply {line!r}")
+
+    def close(self) -> None:
+        self._file.close()
+        self._sock.close()
+
+
+class RedisBackend:
+    """
+    Backend for a Redis-protocol server shared by a fleet. One connection
+    per thread; compare-and-set uses WATCH/MULTI/EXEC (or SET NX when the
+    key must be absent).
+    """
+
+    def __init__(
+        self, host: str = "localhost", port: int = 6379, db: int = 0, timeout: float = 2.0
+    ):
+        self.host = host
+        self.port = port
+        self.db = db
+        self.timeout = timeout
+        self._local = threading.local()
+
+    @classmethod
+    def from_url(cls, url: str) -> RedisBackend:
+        parsed = urlparse(url)
+        db = int(parsed.path.lstrip("/") or 0)
+        return cls(host=parsed.hostname or "localhost", port=parsed.port or 6379, db=db)
+
+    def _call(self, *args: str | bytes | int | float) -> Any:
+        conn: _RespConnection | None = getattr(self._local, "conn", None)
+        try:
+            if conn is None:
+                conn = self._local.conn = _RespConnection(
+                    self.host, self.port, self.db, self.timeout
+                )
+            return conn.call(*args)
+        except (OSError, ValueError, CacheBackendError) as e:
+            # After a transport error, a closed socket, a reply we could not
+            # parse or an error reply the connection may be dead or mid
+            # reply/transaction, so drop it; the next call reconnects
+            self._drop()
+            if isinstance(e, CacheBackendError):
+                raise
+            raise CacheBackendError(str(e)) from e
+
+    def _drop(self) -> None:
+        conn: _RespConnection | None = getattr(self._local, "conn", None)
+        self._local.conn = None
+        if conn is not None:
+            try:
+                conn.close()
+            except OSError:
+                pass
+
+    @staticmethod
+    def _px(ttl: float | None) -> list[str | int]:
+        return [] if ttl is None else ["PX", max(1, int(ttl * 1000))]
+
+    def get(self, key: str) -> bytes | None:
+        value: bytes | None = self._call("GET", key)
+        return value
+
+    def set(self, key: str, value: bytes, ttl: float | None = None) -> None:
+        self._call("SET", key, value, *self._px(ttl))
+
+    def remaining_ttl(self, key: str) -> float | None:
+        ms = int(self._call("PTTL", key))
+        if ms == -2:
+            return None
+        return math.inf if ms == -1 else ms / 1000
+
+    def compare_and_set(
+        self, key: str, expected: bytes | None, value: bytes, ttl: float | None = None
+    ) -> bool:
+        if expected is None:
+            return self._call("SET", key, value, *self._px(ttl), "NX") is not None
+        try:
+            self._call("WATCH", key)
+            if self._call("GET", key) != expected:
+                self._call("UNWATCH")
+                return False
+            self._call("MULTI")
+            self._call("SET", key, value, *self._px(ttl))
+            return self._call("EXEC") is not None
+        except BaseException:
+            # Never leave this thread's connection inside WATCH or MULTI
+            self._drop()
+            raise
+
+    def delete(self, key: str) -> None:
+        self._call("DEL", key)
+
+
+def backend_from_settings(settings: Settings) -> CacheBackend | None:
+    kind = settings.cache_backend
+    if not kind:
+        return None
+    if kind == "memory":
+        return MemoryBackend(max_entries=settings.cache_size)
+    if kind == "sqlite":
+        if settings.cache_path is None:
+            raise ValueError("NEWS_AGENT_CACHE_BACKEND=sqlite needs NEWS_AGENT_CACHE_PATH")
+        return SQLiteBackend(settings.cache_path)
+    if kind == "redis":
+        return RedisBackend.from_url(settings.cache_url)
+    raise ValueError(f"Unknown cache backend {kind!r}")
+
+
+@lru_cache
+def _backend_for(settings: Settings) -> CacheBackend | None:
+    return backend_from_settings(settings)
+
+
+def get_cache_backend() -> CacheBackend | None:
+    """
+    The configured shared cache backend (NEWS_AGENT_CACHE_BACKEND), or None.
+    """
+    return _backend_for(get_settings())
+
+
+def cached_fill(
+    backend: CacheBackend,
+    key: str,
+    fill: Callable[[], bytes | None],
+    ttl: float,
+    lease_seconds: float = 30.0,
+    wait_seconds: float = 10.0,
+    poll_seconds: float = 0.05,
+) -> bytes | None:
+    """
+    Returns the cached value for `key`, or computes it with `fill` and
+    stores it for `ttl` seconds. A compare-and-set lock key makes one
+    caller across the fleet fill a missing key while the others poll for
+    its result (and fill it themselves after `wait_seconds`). Backend
+    errors degrade to calling `fill` directly.
+    """
+    try:
+        deadline = time.monotonic() + wait_seconds
+        lock_key, token = f"{key}:lock", uuid.uuid4().hex.encode()
+        while True:
+            value = backend.get(key)
+            if value is not None:
+                return value
+            if backend.compare_and_set(lock_key, None, token, lease_seconds):
+                break
+            if time.monotonic() >= deadline:
+                return fill()
+            time.sleep(poll_seconds)
+    except CacheBackendError as e:
+        logger.warning("Cache backend unavailable for %s: %s", key, e)
+        return fill()
+
+    try:
+        value = fill()
+        if value is not None:
+            try:
+                backend.set(key, value, ttl)
+            except CacheBackendError as e:
+                logger.warning("Cache backend unavailable for %s: %s", key, e)
+        return value
+    finally:
+        try:
+            backend.compare_and_set(lock_key, token, b"", 0.001)
+        except CacheBackendError:
+            pass
+
+
+async def cached_fill_async(
+    backend: CacheBackend,
+    key: str,
+    fill: Callable[[], Awaitable[bytes | None]],
+    ttl: float,
+    lease_seconds: float = 30.0,
+    wait_seconds: float = 10.0,
+    poll_seconds: float = 0.05,
+) -> bytes | None:
+    """
+    cached_fill for async fillers; backend calls run on the CPU executor.
+    """
+    try:
+        deadline = time.monotonic() + wait_seconds
+        lock_key, token = f"{key}:lock", uuid.uuid4().hex.encode()
+        while True:
+            value = await run_cpu(backend.get, key)
+            if value is not None:
+                return value
+            if await run_cpu(backend.compare_and_set, lock_key, None, token, lease_seconds):
+                break
+            if time.monotonic() >= deadline:
+                return await fill()
+            await asyncio.sleep(poll_seconds)
+    except CacheBackendError as e:
+        logger.warning("Cache backend unavailable for %s: %s", key, e)
+        return await fill()
+
+    try:
+        value = await fill()
+        if value is not None:
+            try:
+                await run_cpu(backend.set, key, value, ttl)
+            except CacheBackendError as e:
+                logger.warning("Cache backend unavailable for %s: %s", key, e)
+        return value
+    finally:
+        try:
+            await run_cpu(backend.compare_and_set, lock_key, token, b"", 0.001)
+        except CacheBackendError:
+            pass
@@ -0,0 +1,166 @@
+from __future__ import annotations
+
+import struct
+import zlib
+from collections.abc import Sequence
+
+from app.core.schemas import Topic
+from app.core.timeutil import from_epoch_us, to_epoch_us
+from app.pipeline.gather.models import Article, FeedEntry
+
+# Compact binary encodings for what the shared cache stores most: article
+# batches and parsed feed entries. Strings are length-prefixed UTF-8,
+# publishers are interned once per batch, dates are int64 epoch
+# microseconds, and the whole payload is zlib-compressed (level 1), which
+# roughly thirds the size of URL-heavy batches for little CPU.
+
+ARTICLES_MAGIC = b"NAA1"
+ENTRIES_MAGIC = b"NAE1"
+
+_TOPICS: list[Topic] = list(Topic)
+_TOPIC_CODES = {t: i for i, t in enumerate(_TOPICS)}
+_NONE = -1
+
+_HEADER = struct.Struct("<4sI")
+_LEN = struct.Struct("<i")
+_COUNT = struct.Struct("<H")
+_ENTRY_DATE = struct.Struct("<?q")
+_ARTICLE = struct.Struct("<qBHB")  # published_us, topic code, publisher index, flags
+_HAS_DATE = 1
+_HAS_SUMMARY = 2
+_CANONICAL_DIFFERS = 4
+
+
+class CodecError(ValueError):
+    pass
+
+
+class _Writer:
+    __slots__ = ("buf",)
+
+    def __init__(self) -> None:
+        self.buf = bytearray()
+
+    def pack(self, fmt: struct.Struct, *values: object) -> None:
+        self.buf += fmt.pack(*values)
+
+    def text(self, value: str | None) -> None:
+        if value is None:
+            self.buf += _LEN.pack(_NONE)
+            return
+        data = value.encode()
+        self.buf += _LEN.pack(len(data))
+        self.buf += data
+
+    def finish(self) -> bytes:
+        return zlib.compress(bytes(self.buf), 1)
+
+
+class _Reader:
+    __slots__ = ("data", "pos")
+
+    def __init__(self, blob: bytes) -> None:
+        try:
+            self.data = memoryview(zlib.decompress(blob))
+        except zlib.error as e:
+            raise CodecError(str(e)) from e
+        self.pos = 0
+
+    def unpack(self, fmt: struct.Struct) -> tuple:
+        values = fmt.unpack_from(self.data, self.pos)
+        self.pos += fmt.size
+        return values
+
+    def text(self) -> str | None:
+        (length,) = _LEN.unpack_from(self.data, self.pos)
+        self.pos += 4
+        if length == _NONE:
+            return None
+        value = bytes(self.data[self.pos : self.pos + length]).decode()
+        self.pos += length
+        return value
+
+    def header(self, magic: bytes) -> int:
+        found, count = self.unpack(_HEADER)
+        if found != magic:
+            raise CodecError(f"expected {magic!r} payload, got {found!r}")
+        return int(count)
+
+
+def encode_articles(articles: Sequence[Article]) -> bytes:
+    w = _Writer()
+    w.pack(_HEADER, ARTICLES_MAGIC, len(articles))
+    publishers: dict[str, int] = {}
+    for a in articles:
+        publishers.setdefault(a.publisher_name, len(publishers))
+    w.pack(_COUNT, len(publishers))
+    for name in publishers:
+        w.text(name)
+
+    for a in articles:
+        flags = 0
+        if a.published_at is not None:
+            flags |= _HAS_DATE
+        if a.summary is not None:
+            flags |= _HAS_SUMMARY
+        if a.canonical_url != a.url:
+            flags |= _CANONICAL_DIFFERS
+        published_us = to_epoch_us(a.published_at) if a.published_at is not None else 0
+        w.pack(_ARTICLE, published_us, _TOPIC_CODES[a.topic], publishers[a.publisher_name], flags)
+        w.text(a.title)
+        w.text(a.url)
+        if flags & _HAS_SUMMARY:
+            w.text(a.summary)
+        if flags & _CANONICAL_DIFFERS:
+            w.text(a.canonical_url)
+    return w.finish()
+
+
+def decode_articles(blob: bytes) -> list[Article]:
+    r = _Reader(blob)
+    count = r.header(ARTICLES_MAGIC)
+    (n_publishers,) = r.unpack(_COUNT)
+    publishers = [r.text() or "" for _ in range(n_publishers)]
+
+    articles: list[Article] = []
+    for _ in range(count):
+        published_us, topic_code, publisher_idx, flags = r.unpack(_ARTICLE)
+        title = r.text() or ""
+        url = r.text() or ""
+        summary = r.text() if flags & _HAS_SUMMARY else None
+        canonical = r.text() if flags & _CANONICAL_DIFFERS else url
+        articles.append(
+            Article(
+                title=title,
+                url=url,
+                publisher_name=publishers[publisher_idx],
+                published_at=from_epoch_us(published_us) if flags & _HAS_DATE else None,
+                topic=_TOPICS[topic_code],
+                summary=summary,
+                canonical_url=canonical or url,
+            )
+        )
+    return articles
+
+
+def encode_feed_entries(entries: Sequence[FeedEntry]) -> bytes:
+    w = _Writer()
+    w.pack(_HEADER, ENTRIES_MAGIC, len(entries))
+    for title, link, published_us, summary in entries:
+        w.pack(_ENTRY_DATE, published_us is not None, published_us or 0)
+        w.text(title)
+        w.text(link)
+        w.text(summary)
+    return w.finish()
+
+
+def decode_feed_entries(blob: bytes) -> list[FeedEntry]:
+    r = _Reader(blob)
+    entries: list[FeedEntry] = []
+    for _ in range(r.header(ENTRIES_MAGIC)):
+        has_date, published_us = r.unpack(_ENTRY_DATE)
+        title = r.text()
+        link = r.text()
+        summary = r.text()
+        entries.append((title, link, published_us if has_date else None, summary))
+    return entries
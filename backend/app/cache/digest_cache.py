@@ -0,0 +1,249 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable, Sequence
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+
+from app.core.config import Settings, get_settings
+from app.core.schemas import DigestRequest, DigestResponse, TimeRange
+
+from .keys import digest_request_key, normalize_request
+
+logger = logging.getLogger(__name__)
+
+DigestBuilder = Callable[[DigestRequest], DigestResponse]
+AsyncDigestBuilder = Callable[[DigestRequest], Awaitable[DigestResponse]]
+AsyncBatchBuilder = Callable[[Sequence[DigestRequest]], Awaitable[list[DigestResponse]]]
+
+
+@dataclass(slots=True)
+class CacheEntry:
+    response: DigestResponse
+    stored_at: float
+    expires_at: float
+    refreshing: bool = False
+
+
+class DigestCache:
+    """
+    TTL + LRU cache of DigestResponses keyed by the normalized request.
+
+    - Fresh entries are served directly.
+    - Expired entries younger than `stale_seconds` past expiry are served
+      as-is while exactly one background rebuild refreshes them.
+    - Anything older (or missing) is rebuilt on the calling thread.
+
+    Builders always receive the normalized request; callers get the cached
+    response with their own request echoed back. All bookkeeping happens
+    under one lock, and builds run outside it, so the cache is safe to use
+    from FastAPI's threadpool.
+    """
+
+    def __init__(
+        self,
+        ttl_by_range: dict[TimeRange, float],
+        max_entries: int = 256,
+        stale_seconds: float = 600.0,
+        clock: Callable[[], float] = time.monotonic,
+        revalidate_workers: int = 2,
+    ):
+        self.ttl_by_range = ttl_by_range
+        self.max_entries = max_entries
+        self.stale_seconds = stale_seconds
+        self._clock = clock
+        self._entries: OrderedDict[str, CacheEntry] = OrderedDict()
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(
+            max_workers=revalidate_workers, thread_name_prefix="digest-revalidate"
+        )
+        self._tasks: set[asyncio.Task[None]] = set()
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+
+    @classmethod
+    def from_settings(cls, settings: Settings) -> DigestCache:
+        return cls(
+            ttl_by_range={
+                TimeRange.H24: settings.digest_ttl_24h,
+                TimeRange.D3: settings.digest_ttl_3d,
+                TimeRange.D7: settings.digest_ttl_7d,
+            },
+            max_entries=settings.digest_cache_size,
+            stale_seconds=settings.digest_stale_seconds,
+        )
+
+    def get_or_build(self, req: DigestRequest, build: DigestBuilder) -> DigestResponse:
+        cached, revalidate = self._lookup(req)
+        if cached is not None:
+            if revalidate:
+                self._executor.submit(self._revalidate, req, build)
+            return self._for_caller(cached, req)
+
+        response = self.put(req, build(normalize_request(req)))
+        return self._for_caller(response, req)
+
+    async def get_or_build_async(
+        self, req: DigestRequest, build: AsyncDigestBuilder
+    ) -> DigestResponse:
+        """
+        get_or_build for async builders; stale revalidation runs as a task
+        on the caller's event loop instead of the revalidation threads.
+        """
+        cached, revalidate = self._lookup(req)
+        if cached is not None:
+            if revalidate:
+                task = asyncio.get_running_loop().create_task(self._revalidate_async(req, build))
+                self._tasks.add(task)
+                task.add_done_callback(self._tasks.discard)
+            return self._for_caller(cached, req)
+
+        response = self.put(req, await build(normalize_request(req)))
+        return self._for_caller(response, req)
+
+    async def get_or_build_many_async(
+        self, reqs: Sequence[DigestRequest], build_many: AsyncBatchBuilder
+    ) -> list[DigestResponse]:
+        """
+        Batch get_or_build: fresh entries are served, and every other
+        request (missing or stale) goes into a single `build_many` call so
+        the misses share one gather. Results keep the input order.
+        """
+        cached = [self.get_fresh(req) for req in reqs]
+        missing = [req for req, hit in zip(reqs, cached, strict=True) if hit is None]
+        built = iter(await build_many(missing) if missing else [])
+        results: list[DigestResponse] = []
+        for req, hit in zip(reqs, cached, strict=True):
+            if hit is None:
+                results.append(self._for_caller(self.put(req, next(built)), req))
+            else:
+                results.append(hit)
+        return results
+
+    def get_fresh(self, req: DigestRequest) -> DigestResponse | None:
+        """
+        The cached response for `req` if it has not expired, else None.
+        """
+        key = digest_request_key(req)
+        now = self._clock()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and now < entry.expires_at:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._for_caller(entry.response, req)
+            self.misses += 1
+            return None
+
+    def _lookup(self, req: DigestRequest) -> tuple[DigestResponse | None, bool]:
+        """
+        Returns (cached response or None on a miss, whether the caller
+        should start the one background revalidation).
+        """
+        key = digest_request_key(req)
+        now = self._clock()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and now < entry.expires_at:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry.response, False
+            if entry is not None and now < entry.expires_at + self.stale_seconds:
+                self._entries.move_to_end(key)
+                self.stale_hits += 1
+                revalidate = not entry.refreshing
+                entry.refreshing = True
+                return entry.response, revalidate
+            self.misses += 1
+            return None, False
+
+    def peek(self, req: DigestRequest) -> CacheEntry | None:
+        """
+        Returns the entry for a request regardless of age, without touching LRU order.
+        """
+        with self._lock:
+            return self._entries.get(digest_request_key(req))
+
+    def expires_in(self, req: DigestRequest) -> float | None:
+        """
+        Seconds until the cached entry for `req` expires (negative once stale),
+        or None when nothing is cached.
+        """
+        now = self._clock()
+        with self._lock:
+            entry = self._entries.get(digest_request_key(req))
+            return None if entry is None else entry.expires_at - now
+
+    def put(self, req: DigestRequest, response: DigestResponse) -> DigestResponse:
+        """
+        Stores a build and returns the response now cached for `req`: the
+        earlier one if the rebuild changed nothing, so the response (and
+        its ETag) stays byte-identical while the content does.
+        """
+        ttl = self.ttl_by_range.get(req.range, 0.0)
+        if ttl <= 0:
+            return response
+        now = self._clock()
+        key = digest_request_key(req)
+        with self._lock:
+            previous = self._entries.get(key)
+        if previous is not None and self._same_content(previous.response, response):
+            response = previous.response
+        with self._lock:
+            self._entries[key] = CacheEntry(response=response, stored_at=now, expires_at=now + ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return response
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.stale_hits = self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _revalidate(self, req: DigestRequest, build: DigestBuilder) -> None:
+        try:
+            self.put(req, build(normalize_request(req)))
+        except Exception:
+            self._revalidate_failed(req)
+
+    async def _revalidate_async(self, req: DigestRequest, build: AsyncDigestBuilder) -> None:
+        try:
+            self.put(req, await build(normalize_request(req)))
+        except Exception:
+            self._revalidate_failed(req)
+
+    def _revalidate_failed(self, req: DigestRequest) -> None:
+        key = digest_request_key(req)
+        logger.exception("Background digest rebuild failed for %s", key)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                entry.refreshing = False
+
+    @staticmethod
+    def _same_content(a: DigestResponse, b: DigestResponse) -> bool:
+        # Same cards and QA outcome, whenever generated and whoever asked
+        exclude = {"generated_at", "request"}
+        return a.model_dump(exclude=exclude) == b.model_dump(exclude=exclude)
+
+    @staticmethod
+    def _for_caller(response: DigestResponse, req: DigestRequest) -> DigestResponse:
+        if response.request == req:
+            return response
+        return response.model_copy(update={"request": req})
+
+
+_digest_cache = DigestCache.from_settings(get_settings())
+
+
+def get_digest_cache() -> DigestCache:
+    return _digest_cache
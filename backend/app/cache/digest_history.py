@@ -0,0 +1,56 @@
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from collections.abc import Callable
+
+from app.core.config import get_settings
+
+
+class DigestHistory:
+    """
+    Recently served digest versions and their card fingerprints, so delta
+    requests can be answered against the version a client last saw.
+    Bounded LRU; clients with an evicted version get a full delta.
+    """
+
+    def __init__(self, max_entries: int = 1024):
+        self.max_entries = max_entries
+        self._versions: OrderedDict[str, dict[str, str]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def record(self, version: str, fingerprints: Callable[[], dict[str, str]]) -> None:
+        """
+        Remembers a served version; `fingerprints` is only called for a
+        version not already recorded.
+        """
+        with self._lock:
+            if version in self._versions:
+                self._versions.move_to_end(version)
+                return
+        computed = fingerprints()
+        with self._lock:
+            self._versions[version] = computed
+            while len(self._versions) > self.max_entries:
+                self._versions.popitem(last=False)
+
+    def get(self, version: str) -> dict[str, str] | None:
+        with self._lock:
+            fingerprints = self._versions.get(version)
+            if fingerprints is not None:
+                self._versions.move_to_end(version)
+            return fingerprints
+
+    def clear(self) -> None:
+        with self._lock:
+            self._versions.clear()
+
+    def __len__(self) -> int:
+        return len(self._versions)
+
+
+_digest_history = DigestHistory(get_settings().digest_history_size)
+
+
+def get_digest_history() -> DigestHistory:
+    return _digest_history
@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from collections.abc import Callable, Hashable
+from dataclasses import dataclass
+
+from app.core.config import Settings, get_settings
+from app.core.schemas import DigestCard
+
+CardBuilder = Callable[[], DigestCard]
+
+
+@dataclass(slots=True)
+class _Entry:
+    card: DigestCard
+    fragment: bytes | None = None
+
+
+class CardFragmentCache:
+    """
+    Cards and their serialized JSON, keyed by story (the pipeline passes
+    stable cluster ID plus cluster version), shared by every digest that
+    contains the story.
+
+    A digest built from an unchanged cluster gets the cached card instance,
+    and serializing it reuses the cached fragment, so assembling a response
+    only serializes the stories that are new or changed. Cached cards are
+    shared between digests and must not be mutated. Bounded LRU.
+    """
+
+    def __init__(self, max_entries: int = 4096):
+        self.max_entries = max_entries
+        self._entries: OrderedDict[Hashable, _Entry] = OrderedDict()
+        # id(card) -> entry key, for cards handed out by card()
+        self._keys: dict[int, Hashable] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @classmethod
+    def from_settings(cls, settings: Settings) -> CardFragmentCache:
+        return cls(max_entries=settings.fragment_cache_size)
+
+    def card(self, key: Hashable, build: CardBuilder) -> DigestCard:
+        """
+        The cached card for `key`, or the one `build` returns on a miss.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry.card
+            self.misses += 1
+        card = build()
+        with self._lock:
+            self._entries[key] = _Entry(card)
+            self._keys[id(card)] = key
+            while len(self._entries) > self.max_entries:
+                _, evicted = self._entries.popitem(last=False)
+                self._keys.pop(id(evicted.card), None)
+        return card
+
+    def fragment(self, card: DigestCard) -> bytes:
+        """
+        Serialized JSON of a card; cards that did not come from card() are
+        serialized without caching.
+        """
+        with self._lock:
+            key = self._keys.get(id(card))
+            entry = self._entries.get(key) if key is not None else None
+            if entry is None or entry.card is not card:
+                entry = None
+            elif entry.fragment is not None:
+                return entry.fragment
+        fragment = card.__pydantic_serializer__.to_json(card)
+        if entry is not None:
+            entry.fragment = fragment
+        return fragment
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._keys.clear()
+            self.hits = self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+_fragment_cache = CardFragmentCache.from_settings(get_settings())
+
+
+def get_fragment_cache() -> CardFragmentCache:
+    return _fragment_cache
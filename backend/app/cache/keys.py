@@ -0,0 +1,43 @@
+from __future__ import annotations
+
+import json
+
+from app.core.schemas import DigestRequest, Region, Topic
+
+_TOPIC_ORDER = {t: i for i, t in enumerate(Topic)}
+_REGION_ORDER = {r: i for i, r in enumerate(Region)}
+
+
+def normalize_request(req: DigestRequest) -> DigestRequest:
+    """
+    Returns an equivalent request with list fields deduped and in a fixed order.
+
+    Topics follow the Topic declaration order so that "first requested topic
+    wins" tagging gives the same result for [tech, finance] and [finance, tech].
+    """
+    publishers = sorted(set(req.publishers)) if req.publishers else None
+    return req.model_copy(
+        update={
+            "topics": sorted(set(req.topics), key=_TOPIC_ORDER.__getitem__),
+            "regions": sorted(set(req.regions), key=_REGION_ORDER.__getitem__),
+            "publishers": publishers,
+        }
+    )
+
+
+def digest_request_key(req: DigestRequest) -> str:
+    """
+    Stable cache key for a request; list order and duplicates do not matter.
+    """
+    norm = normalize_request(req)
+    return json.dumps(
+        {
+            "topics": [t.value for t in norm.topics],
+            "regions": [r.value for r in norm.regions],
+            "range": norm.range.value,
+            "publishers": norm.publishers,
+            "max_cards": norm.max_cards,
+            "max_cards_per_topic": norm.max_cards_per_topic,
+        },
+        separators=(",", ":"),
+    )
@@ -0,0 +1,53 @@
+from __future__ import annotations
+
+import threading
+import weakref
+from collections import OrderedDict
+from collections.abc import Callable
+
+from pydantic import BaseModel
+
+
+class ModelMemo[M: BaseModel, T]:
+    """
+    Remembers fn(model) per model instance, for derived values of responses
+    that are served many times (the digest cache hands out the same
+    instance until a rebuild changes its content). Keyed by identity, so
+    it relies on served models not being mutated. Bounded LRU; entries of
+    collected models are dropped as they reach the old end.
+    """
+
+    def __init__(self, fn: Callable[[M], T], max_entries: int = 1024):
+        self.fn = fn
+        self.max_entries = max_entries
+        self._entries: OrderedDict[int, tuple[weakref.ref[M], T]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __call__(self, model: M) -> T:
+        key = id(model)
+        with self._lock:
+            entry = self._entries.get(key)
+            # A dead ref means the id was reused by a newer object
+            if entry is not None and entry[0]() is model:
+                self._entries.move_to_end(key)
+                return entry[1]
+        value = self.fn(model)
+        with self._lock:
+            self._entries[key] = (weakref.ref(model), value)
+            self._entries.move_to_end(key)
+            while self._entries and (
+                len(self._entries) > self.max_entries or self._oldest_is_dead()
+            ):
+                self._entries.popitem(last=False)
+        return value
+
+    def _oldest_is_dead(self) -> bool:
+        ref, _ = next(iter(self._entries.values()))
+        return ref() is None
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
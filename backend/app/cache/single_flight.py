@@ -0,0 +1,119 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+from collections.abc import Awaitable, Callable, Hashable
+
+
+class _Call[V]:
+    __slots__ = ("done", "value", "error", "waiters")
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.value: V | None = None
+        self.error: BaseException | None = None
+        self.waiters = 0
+
+
+class SingleFlight[K: Hashable, V]:
+    """
+    Coalesces concurrent calls with the same key into one execution.
+
+    The first caller for a key runs `fn`; callers arriving while it is in
+    flight block and receive the same result (or exception). Nothing is
+    cached once the call finishes; that is the response cache's job.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._calls: dict[K, _Call[V]] = {}
+        self.executions = 0
+        self.coalesced = 0
+
+    def do(self, key: K, fn: Callable[[], V]) -> V:
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if call is None:
+                call = self._calls[key] = _Call()
+                self.executions += 1
+            else:
+                call.waiters += 1
+                self.coalesced += 1
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.value  # type: ignore[return-value]
+
+        try:
+            call.value = fn()
+            return call.value
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+    @property
+    def coalescing_ratio(self) -> float:
+        """
+        Share of calls that were served by another caller's execution.
+        """
+        total = self.executions + self.coalesced
+        return self.coalesced / total if total else 0.0
+
+    def in_flight(self) -> int:
+        with self._lock:
+            return len(self._calls)
+
+    def reset_stats(self) -> None:
+        with self._lock:
+            self.executions = self.coalesced = 0
+
+
+class AsyncSingleFlight[K: Hashable, V]:
+    """
+    asyncio counterpart of SingleFlight for coroutines on one event loop.
+
+    The leader's coroutine runs as a task; every caller awaits it through
+    `asyncio.shield`, so a cancelled caller never cancels the shared call.
+    """
+
+    def __init__(self) -> None:
+        self._tasks: dict[K, asyncio.Future[V]] = {}
+        self.executions = 0
+        self.coalesced = 0
+
+    async def do(self, key: K, fn: Callable[[], Awaitable[V]]) -> V:
+        task = self._tasks.get(key)
+        # A task left behind by a closed loop (e.g. a finished test) is ignored
+        if task is None or task.get_loop() is not asyncio.get_running_loop():
+            task = asyncio.ensure_future(fn())
+            self._tasks[key] = task
+            task.add_done_callback(lambda t: self._forget(key, t))
+            self.executions += 1
+        else:
+            self.coalesced += 1
+        return await asyncio.shield(task)
+
+    @property
+    def coalescing_ratio(self) -> float:
+        """
+        Share of calls that were served by another caller's execution.
+        """
+        total = self.executions + self.coalesced
+        return self.coalesced / total if total else 0.0
+
+    def in_flight(self) -> int:
+        return len(self._tasks)
+
+    def reset_stats(self) -> None:
+        self.executions = self.coalesced = 0
+
+    def _forget(self, key: K, task: asyncio.Future[V]) -> None:
+        if self._tasks.get(key) is task:
+            del self._tasks[key]
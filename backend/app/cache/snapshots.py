@@ -0,0 +1,137 @@
+from __future__ import annotations
+
+import base64
+import binascii
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+
+from app.core.config import Settings
+from app.core.schemas import DigestRequest, TimeRange
+
+from .keys import digest_request_key
+from .single_flight import AsyncSingleFlight
+
+type AsyncRanker[R] = Callable[[DigestRequest], Awaitable[R]]
+
+
+@dataclass(slots=True)
+class Snapshot[R]:
+    id: str
+    request_key: str
+    ranked: R
+    created_at: float
+    expires_at: float
+
+
+class SnapshotStore[R]:
+    """
+    Ranked results that paginated clients read from, so every page of a
+    scroll comes from the same ranking.
+
+    The first page of a request reuses the latest snapshot for that
+    request while it is younger than the request's digest TTL (`fresh_by_range`),
+    and ranks a new one after that; concurrent first pages share one
+    ranking. Later pages address their snapshot through the cursor and
+    stay on it until it expires. Bounded LRU with a TTL per snapshot.
+    """
+
+    def __init__(
+        self,
+        fresh_by_range: dict[TimeRange, float],
+        ttl_seconds: float = 600.0,
+        max_entries: int = 256,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.fresh_by_range = fresh_by_range
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._clock = clock
+        self._snapshots: OrderedDict[str, Snapshot[R]] = OrderedDict()
+        self._latest: dict[str, str] = {}
+        self._lock = threading.Lock()
+        self._flight: AsyncSingleFlight[str, Snapshot[R]] = AsyncSingleFlight()
+
+    @classmethod
+    def from_settings(cls, settings: Settings) -> SnapshotStore[R]:
+        return cls(
+            fresh_by_range={
+                TimeRange.H24: settings.digest_ttl_24h,
+                TimeRange.D3: settings.digest_ttl_3d,
+                TimeRange.D7: settings.digest_ttl_7d,
+            },
+            ttl_seconds=settings.page_snapshot_ttl,
+            max_entries=settings.page_snapshot_size,
+        )
+
+    async def latest_or_rank(self, req: DigestRequest, rank: AsyncRanker[R]) -> Snapshot[R]:
+        key = digest_request_key(req)
+        with self._lock:
+            snapshot_id = self._latest.get(key)
+        if snapshot_id is not None:
+            snapshot = self.get(snapshot_id)
+            fresh = self.fresh_by_range.get(req.range, 0.0)
+            if snapshot is not None and self._clock() < snapshot.created_at + fresh:
+                return snapshot
+        return await self._flight.do(key, lambda: self._rank_and_store(key, req, rank))
+
+    def get(self, snapshot_id: str) -> Snapshot[R] | None:
+        with self._lock:
+            snapshot = self._snapshots.get(snapshot_id)
+            if snapshot is None:
+                return None
+            if self._clock() >= snapshot.expires_at:
+                del self._snapshots[snapshot_id]
+                return None
+            self._snapshots.move_to_end(snapshot_id)
+            return snapshot
+
+    def clear(self) -> None:
+        with self._lock:
+            self._snapshots.clear()
+            self._latest.clear()
+
+    def __len__(self) -> int:
+        return len(self._snapshots)
+
+    async def _rank_and_store(
+        self, key: str, req: DigestRequest, rank: AsyncRanker[R]
+    ) -> Snapshot[R]:
+        ranked = await rank(req)
+        now = self._clock()
+        snapshot = Snapshot(
+            id=uuid.uuid4().hex[:16],
+            request_key=key,
+            ranked=ranked,
+            created_at=now,
+            expires_at=now + self.ttl_seconds,
+        )
+        with self._lock:
+            self._snapshots[snapshot.id] = snapshot
+            self._latest[key] = snapshot.id
+            while len(self._snapshots) > self.max_entries:
+                evicted = self._snapshots.popitem(last=False)[1]
+                if self._latest.get(evicted.request_key) == evicted.id:
+                    del self._latest[evicted.request_key]
+        return snapshot
+
+
+def encode_cursor(snapshot_id: str, offset: int) -> str:
+    return base64.urlsafe_b64encode(f"{snapshot_id}:{offset}".encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[str, int]:
+    """
+    Returns (snapshot id, offset); raises ValueError for a malformed cursor.
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+    except (binascii.Error, UnicodeDecodeError) as e:
+        raise ValueError("malformed cursor") from e
+    snapshot_id, _, offset = raw.partition(":")
+    if not snapshot_id or not offset.isdigit():
+        raise ValueError("malformed cursor")
+    return snapshot_id, int(offset)
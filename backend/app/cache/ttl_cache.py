@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+import threading
+import time
+from collections.abc import Callable, Hashable, Iterable
+
+from .single_flight import SingleFlight
+
+
+class TTLCache[K: Hashable, V]:
+    """
+    Small TTL map for intermediate pipeline results.
+
+    Misses are built through a SingleFlight, so concurrent requests that
+    need the same missing value build it once. Intended for bounded key
+    spaces (e.g. region x topic x range shards), so there is no LRU.
+    """
+
+    def __init__(self, ttl_seconds: float, clock: Callable[[], float] = time.monotonic):
+        self.ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._entries: dict[K, tuple[float, V]] = {}
+        self._lock = threading.Lock()
+        self._flight: SingleFlight[K, V] = SingleFlight()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: K) -> V | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or self._clock() >= entry[0]:
+                return None
+            return entry[1]
+
+    def missing(self, keys: Iterable[K]) -> list[K]:
+        """
+        Returns the keys that would have to be built right now.
+        """
+        return [k for k in keys if self.get(k) is None]
+
+    def get_or_build(self, key: K, build: Callable[[], V]) -> V:
+        value = self.get(key)
+        if value is not None:
+            with self._lock:
+                self.hits += 1
+            return value
+        with self._lock:
+            self.misses += 1
+        return self._flight.do(key, lambda: self._build_and_store(key, build))
+
+    def put(self, key: K, value: V) -> None:
+        if self.ttl_seconds <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (self._clock() + self.ttl_seconds, value)
+
+    def discard(self, keys: Iterable[K]) -> None:
+        with self._lock:
+            for key in keys:
+                self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _build_and_store(self, key: K, build: Callable[[], V]) -> V:
+        value = build()
+        self.put(key, value)
+        return value
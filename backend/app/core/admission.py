@@ -0,0 +1,133 @@
+from __future__ import annotations
+
+import asyncio
+import math
+import time
+from collections import deque
+from collections.abc import AsyncIterator, Callable
+from contextlib import asynccontextmanager
+
+from app.core.config import Settings, get_settings
+
+
+class Overloaded(RuntimeError):
+    """
+    Raised instead of admitting a build: the wait queue was full, or the
+    wait timed out. `retry_after` is a hint in whole seconds.
+    """
+
+    def __init__(self, reason: str, retry_after: int):
+        super().__init__(reason)
+        self.retry_after = retry_after
+
+
+class AdmissionController:
+    """
+    Bounds concurrent digest builds on one event loop: up to
+    `max_concurrent` run, up to `max_queue` more wait (each for at most
+    `queue_timeout` seconds) and anything beyond is rejected at once, so a
+    burst degrades into fast Overloaded errors instead of unbounded latency.
+    A released slot is handed straight to the oldest waiter.
+    `max_concurrent` <= 0 admits everything.
+    """
+
+    def __init__(
+        self,
+        max_concurrent: int = 8,
+        max_queue: int = 32,
+        queue_timeout: float = 5.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.max_concurrent = max_concurrent
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self._clock = clock
+        self._active = 0
+        self._waiters: deque[asyncio.Future[None]] = deque()
+        # Moving average of how long an admitted build holds its slot
+        self._hold_seconds = 1.0
+        self.admitted = 0
+        self.rejected = 0
+        self.timed_out = 0
+
+    @classmethod
+    def from_settings(cls, settings: Settings) -> AdmissionController:
+        return cls(
+            max_concurrent=settings.admission_max_concurrent,
+            max_queue=settings.admission_max_queue,
+            queue_timeout=settings.admission_queue_timeout,
+        )
+
+    @asynccontextmanager
+    async def slot(self) -> AsyncIterator[None]:
+        if self.max_concurrent <= 0:
+            yield
+            return
+        await self._acquire()
+        self.admitted += 1
+        start = self._clock()
+        try:
+            yield
+        finally:
+            self._hold_seconds += 0.2 * (self._clock() - start - self._hold_seconds)
+            self._release()
+
+    @property
+    def active(self) -> int:
+        return self._active
+
+    @property
+    def waiting(self) -> int:
+        return sum(1 for waiter in self._waiters if not waiter.done())
+
+    def retry_after(self) -> int:
+        """
+        Seconds until the queue ahead of a new request should have drained.
+        """
+        backlog = self.waiting + 1
+        return max(1, math.ceil(self._hold_seconds * backlog / max(1, self.max_concurrent)))
+
+    async def _acquire(self) -> None:
+        if self._active < self.max_concurrent and not self.waiting:
+            self._active += 1
+            return
+        if self.waiting >= self.max_queue:
+            self.rejected += 1
+            raise Overloaded("Digest build queue is full", self.retry_after())
+
+        while self._waiters and self._waiters[0].done():
+            self._waiters.popleft()
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            await asyncio.wait_for(asyncio.shield(waiter), self.queue_timeout)
+        except TimeoutError:
+            if waiter.done():
+                # The slot was handed over just as the wait timed out
+                return
+            waiter.cancel()
+            self.timed_out += 1
+            raise Overloaded(
+                "Timed out waiting for a digest build slot", self.retry_after()
+            ) from None
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                self._release()
+            waiter.cancel()
+            raise
+
+    def _release(self) -> None:
+        # Hand the slot to the oldest live waiter, else free it
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done() and not waiter.get_loop().is_closed():
+                waiter.set_result(None)
+                return
+        self._active -= 1
+
+
+_admission = AdmissionController.from_settings(get_settings())
+
+
+def get_admission() -> AdmissionController:
+    return _admission
@@ -0,0 +1,183 @@
+from __future__ import annotations
+
+import os
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+
+ENV_PREFIX = "NEWS_AGENT_"
+
+
+def _env(name: str) -> str | None:
+    value = os.environ.get(ENV_PREFIX + name)
+    return value if value else None
+
+
+def _env_int(name: str, default: int) -> int:
+    value = _env(name)
+    return int(value) if value is not None else default
+
+
+def _env_bool(name: str, default: bool) -> bool:
+    value = _env(name)
+    return value.lower() in ("1", "true", "yes", "on") if value is not None else default
+
+
+def _env_float(name: str, default: float) -> float:
+    value = _env(name)
+    return float(value) if value is not None else default
+
+
+@dataclass(frozen=True)
+class Settings:
+    """
+    Runtime knobs read from NEWS_AGENT_* environment variables.
+    Everything has a default so the app runs with no configuration.
+    """
+
+    # Persistent article corpus (SQLite). Disabled when unset.
+    article_store_path: Path | None = None
+    article_retention_days: int = 7
+
+    # Digest response cache: TTL per TimeRange (0 disables), LRU size, and
+    # how long past expiry a stale digest may be served while it rebuilds.
+    digest_ttl_24h: float = 60.0
+    digest_ttl_3d: float = 300.0
+    digest_ttl_7d: float = 900.0
+    digest_cache_size: int = 256
+    digest_stale_seconds: float = 600.0
+
+    # Most requests accepted by one POST /digests batch.
+    digest_batch_max: int = 1000
+
+    # Digest versions remembered for delta requests (/digest/delta).
+    digest_history_size: int = 1024
+
+    # Ranked snapshots behind /digest/pages cursors: lifetime and LRU size.
+    page_snapshot_ttl: float = 600.0
+    page_snapshot_size: int = 256
+
+    # Admission control for digest builds: at most `admission_max_concurrent`
+    # run at once (0 disables), `admission_max_queue` more wait up to
+    # `admission_queue_timeout` seconds; beyond that /digest serves the last
+    # cached digest marked stale, or 503 with Retry-After.
+    admission_max_concurrent: int = 8
+    admission_max_queue: int = 32
+    admission_queue_timeout: float = 5.0
+
+    # Fallback refresh interval of a digest subscription channel (through
+    # the digest cache); ingests that add articles wake it sooner.
+    subscription_interval_seconds: float = 30.0
+
+    # Response compression negotiated from Accept-Encoding (br when the
+    # optional brotli package is installed, else gzip). Bodies smaller than
+    # `compress_min_bytes` are sent uncompressed.
+    compression_enabled: bool = True
+    compress_min_bytes: int = 1024
+    gzip_level: int = 6
+    brotli_quality: int = 5
+
+    # Cards and their serialized JSON shared by digests with the same story.
+    fragment_cache_size: int = 4096
+
+    # Per-(region, topic, range) shard partials reused across digests.
+    shard_ttl_seconds: float = 60.0
+
+    # Background prewarming of the most requested digests. Popularity is a
+    # decaying count; each cycle may use `prewarm_cpu_budget` of one core.
+    prewarm_enabled: bool = False
+    prewarm_top_n: int = 10
+    prewarm_interval_seconds: float = 15.0
+    prewarm_cpu_budget: float = 0.25
+    prewarm_half_life_seconds: float = 600.0
+
+    # Worker threads for CPU-bound stages of the async digest path.
+    cpu_workers: int = 4
+
+    # Optional process pool for feed parsing, tagging and clustering
+    # (0 disables). Tagging/clustering only use it for inputs of at least
+    # `process_min_items` articles.
+    process_workers: int = 0
+    process_min_items: int = 2000
+
+    # Host-wide feed cache shared by uvicorn workers (SQLite). Disabled when
+    # unset. Entries are fresh for `feed_cache_ttl` seconds; a worker holds
+    # the refresh lease for at most `feed_lease_seconds`.
+    feed_cache_path: Path | None = None
+    feed_cache_ttl: float = 300.0
+    feed_lease_seconds: float = 30.0
+
+    # Pluggable cache backend for parsed feeds and shard partials shared by
+    # workers: "memory" (in-process LRU of `cache_size` entries), "sqlite"
+    # (file at `cache_path`) or "redis" (`cache_url`). Disabled when unset.
+    cache_backend: str = ""
+    cache_path: Path | None = None
+    cache_url: str = "redis://localhost:6379/0"
+    cache_size: int = 4096
+
+    # Prometheus-style metrics at /metrics (pipeline stage latencies, feed
+    # fetches, cache hit rates). When disabled, recording is a no-op and
+    # /metrics answers 404.
+    metrics_enabled: bool = True
+
+    @classmethod
+    def from_env(cls) -> Settings:
+        store_path = _env("STORE_PATH")
+        feed_cache_path = _env("FEED_CACHE_PATH")
+        cache_path = _env("CACHE_PATH")
+        return cls(
+            article_store_path=Path(store_path) if store_path else None,
+            article_retention_days=_env_int("RETENTION_DAYS", cls.article_retention_days),
+            digest_ttl_24h=_env_float("DIGEST_TTL_24H", cls.digest_ttl_24h),
+            digest_ttl_3d=_env_float("DIGEST_TTL_3D", cls.digest_ttl_3d),
+            digest_ttl_7d=_env_float("DIGEST_TTL_7D", cls.digest_ttl_7d),
+            digest_cache_size=_env_int("DIGEST_CACHE_SIZE", cls.digest_cache_size),
+            digest_stale_seconds=_env_float("DIGEST_STALE_SECONDS", cls.digest_stale_seconds),
+            digest_batch_max=_env_int("DIGEST_BATCH_MAX", cls.digest_batch_max),
+            digest_history_size=_env_int("DIGEST_HISTORY_SIZE", cls.digest_history_size),
+            page_snapshot_ttl=_env_float("PAGE_SNAPSHOT_TTL", cls.page_snapshot_ttl),
+            page_snapshot_size=_env_int("PAGE_SNAPSHOT_SIZE", cls.page_snapshot_size),
+            admission_max_concurrent=_env_int(
+                "ADMISSION_MAX_CONCURRENT", cls.admission_max_concurrent
+            ),
+            admission_max_queue=_env_int("ADMISSION_MAX_QUEUE", cls.admission_max_queue),
+            admission_queue_timeout=_env_float(
+                "ADMISSION_QUEUE_TIMEOUT", cls.admission_queue_timeout
+            ),
+            subscription_interval_seconds=_env_float(
+                "SUBSCRIPTION_INTERVAL", cls.subscription_interval_seconds
+            ),
+            compression_enabled=_env_bool("COMPRESSION", cls.compression_enabled),
+            compress_min_bytes=_env_int("COMPRESS_MIN_BYTES", cls.compress_min_bytes),
+            gzip_level=_env_int("GZIP_LEVEL", cls.gzip_level),
+            brotli_quality=_env_int("BROTLI_QUALITY", cls.brotli_quality),
+            fragment_cache_size=_env_int("FRAGMENT_CACHE_SIZE", cls.fragment_cache_size),
+            shard_ttl_seconds=_env_float("SHARD_TTL", cls.shard_ttl_seconds),
+            prewarm_enabled=_env_bool("PREWARM", cls.prewarm_enabled),
+            prewarm_top_n=_env_int("PREWARM_TOP_N", cls.prewarm_top_n),
+            prewarm_interval_seconds=_env_float("PREWARM_INTERVAL", cls.prewarm_interval_seconds),
+            prewarm_cpu_budget=_env_float("PREWARM_CPU_BUDGET", cls.prewarm_cpu_budget),
+            prewarm_half_life_seconds=_env_float(
+                "PREWARM_HALF_LIFE", cls.prewarm_half_life_seconds
+            ),
+            cpu_workers=_env_int("CPU_WORKERS", cls.cpu_workers),
+            process_workers=_env_int("PROCESS_WORKERS", cls.process_workers),
+            process_min_items=_env_int("PROCESS_MIN_ITEMS", cls.process_min_items),
+            feed_cache_path=Path(feed_cache_path) if feed_cache_path else None,
+            feed_cache_ttl=_env_float("FEED_CACHE_TTL", cls.feed_cache_ttl),
+            feed_lease_seconds=_env_float("FEED_LEASE_SECONDS", cls.feed_lease_seconds),
+            cache_backend=(_env("CACHE_BACKEND") or cls.cache_backend).lower(),
+            cache_path=Path(cache_path) if cache_path else None,
+            cache_url=_env("CACHE_URL") or cls.cache_url,
+            cache_size=_env_int("CACHE_SIZE", cls.cache_size),
+            metrics_enabled=_env_bool("METRICS", cls.metrics_enabled),
+        )
+
+
+@lru_cache
+def get_settings() -> Settings:
+    """
+    Returns process-wide settings. Call `get_settings.cache_clear()` after
+    changing the environment (tests do this).
+    """
+    return Settings.from_env()
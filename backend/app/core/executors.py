@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+import asyncio
+import multiprocessing
+import threading
+from collections.abc import Callable, Sequence
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from app.core.config import get_settings
+
+_cpu_executor: ThreadPoolExecutor | None = None
+_process_pool: ProcessPoolExecutor | None = None
+_lock = threading.Lock()
+
+
+def get_cpu_executor() -> ThreadPoolExecutor:
+    """
+    Bounded pool for CPU-bound pipeline stages (parse, tag, cluster) called
+    from async code. Keeping them off Starlette's threadpool means slow
+    digests cannot starve other requests of workers.
+    """
+    global _cpu_executor
+    with _lock:
+        if _cpu_executor is None:
+            _cpu_executor = ThreadPoolExecutor(
+                max_workers=get_settings().cpu_workers, thread_name_prefix="digest-cpu"
+            )
+        return _cpu_executor
+
+
+async def run_cpu[**P, R](fn: Callable[P, R], *args: P.args, **kwargs: P.kwargs) -> R:
+    """
+    Awaits `fn(*args, **kwargs)` on the CPU executor.
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_cpu_executor(), lambda: fn(*args, **kwargs))
+
+
+def get_process_pool() -> ProcessPoolExecutor | None:
+    """
+    Optional process pool (NEWS_AGENT_PROCESS_WORKERS > 0) for pure-Python
+    CPU work that would otherwise serialize on the GIL. Workers are spawned,
+    not forked, so they never inherit the parent's threads or locks.
+    """
+    global _process_pool
+    workers = get_settings().process_workers
+    if workers <= 0:
+        return None
+    with _lock:
+        if _process_pool is None:
+            _process_pool = ProcessPoolExecutor(
+                max_workers=workers, mp_context=multiprocessing.get_context("spawn")
+            )
+        return _process_pool
+
+
+def shutdown_process_pool() -> None:
+    global _process_pool
+    with _lock:
+        pool, _process_pool = _process_pool, None
+    if pool is not None:
+        pool.shutdown(wait=True, cancel_futures=True)
+
+
+def process_pool_for(size: int | None = None) -> ProcessPoolExecutor | None:
+    """
+    The process pool if it is enabled and `size` items are worth the IPC
+    (at least NEWS_AGENT_PROCESS_MIN_ITEMS); None means run in-process.
+    """
+    if size is not None and size < get_settings().process_min_items:
+        return None
+    return get_process_pool()
+
+
+def run_offloaded[*Ts, R](fn: Callable[[*Ts], R], *args: *Ts, size: int | None = None) -> R:
+    """
+    Runs `fn(*args)` in the process pool when `process_pool_for(size)` allows
+    it, else inline. `fn` must be a module-level function, and arguments and
+    results should be plain tuples/lists/strings/ints so they pickle cheaply.
+    """
+    pool = process_pool_for(size)
+    if pool is None:
+        return fn(*args)
+    return pool.submit(fn, *args).result()
+
+
+async def run_offloaded_async[*Ts, R](
+    fn: Callable[[*Ts], R], *args: *Ts, size: int | None = None
+) -> R:
+    """
+    Async run_offloaded; falls back to the CPU thread executor.
+    """
+    pool = process_pool_for(size)
+    if pool is None:
+        return await run_cpu(fn, *args)
+    return await asyncio.get_running_loop().run_in_executor(pool, fn, *args)
+
+
+def map_chunks[T, R](fn: Callable[[Sequence[T]], list[R]], items: Sequence[T]) -> list[R]:
+    """
+    Applies a batch function to `items`, split into one chunk per worker
+    when the process pool is enabled and the input is large enough.
+    Results are concatenated in input order.
+    """
+    pool = process_pool_for(len(items))
+    if pool is None:
+        return fn(items)
+    workers = get_settings().process_workers
+    step = -(-len(items) // workers)
+    chunks = [items[i : i + step] for i in range(0, len(items), step)]
+    return [r for part in pool.map(fn, chunks) for r in part]
@@ -0,0 +1,34 @@
+from __future__ import annotations
+
+import asyncio
+
+import httpx
+
+# One client per event loop: its connection pool is bound to the loop it
+# was first used on, and tests run several loops in one process.
+_client: httpx.AsyncClient | None = None
+_client_loop: asyncio.AbstractEventLoop | None = None
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """
+    Process-wide AsyncClient for feed fetches on the running loop. Builds
+    share its connection pool, and since no build owns it, cancelling one
+    build can never close a fetch that other builds are waiting on.
+    """
+    global _client, _client_loop
+    loop = asyncio.get_running_loop()
+    if _client is None or _client_loop is not loop or _client.is_closed:
+        _client = httpx.AsyncClient(follow_redirects=True)
+        _client_loop = loop
+    return _client
+
+
+async def close_http_client() -> None:
+    """
+    Closes the shared client (app shutdown).
+    """
+    global _client, _client_loop
+    client, _client, _client_loop = _client, None, None
+    if client is not None:
+        await client.aclose()
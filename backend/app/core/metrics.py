@@ -0,0 +1,295 @@
+from __future__ import annotations
+
+import functools
+import math
+import threading
+import time
+from bisect import bisect_left
+from collections.abc import Callable, Iterator, Mapping, Sequence
+from types import TracebackType
+
+from app.core.config import Settings, get_settings
+
+# Seconds: from sub-millisecond stages up to slow feed fetches
+LATENCY_BUCKETS = (
+    0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0,
+)  # fmt: skip
+SIZE_BUCKETS = (1, 2, 3, 4, 6, 8, 12, 16, 32)
+RATIO_BUCKETS = (0.0, 0.05, 0.1, 0.2, 0.3, 0.4, 0.5, 0.6, 0.8, 1.0)
+
+type Labels = tuple[str, ...]
+type Reader = Callable[[], Mapping[Labels, float]]
+
+
+class Counter:
+    """
+    Monotonic count per label values.
+    """
+
+    kind = "counter"
+
+    def __init__(self, registry: MetricsRegistry, name: str, help: str, labelnames: Labels):
+        self._registry = registry
+        self.name, self.help, self.labelnames = name, help, labelnames
+        self._values: dict[Labels, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *labels: str, amount: float = 1.0) -> None:
+        if not self._registry.enabled:
+            return
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0.0) + amount
+
+    def value(self, *labels: str) -> float:
+        return self._values.get(labels, 0.0)
+
+    def samples(self) -> Iterator[tuple[str, Labels, Labels, float]]:
+        with self._lock:
+            values = list(self._values.items())
+        for labels, value in values:
+            yield self.name, self.labelnames, labels, value
+
+    def clear(self) -> None:
+        with self._lock:
+            self._values.clear()
+
+
+class Histogram:
+    """
+    Bucketed observations per label values. An observation is a bisect
+    and two additions under the metric's lock; buckets are only made
+    cumulative when scraped.
+    """
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        registry: MetricsRegistry,
+        name: str,
+        help: str,
+        labelnames: Labels,
+        buckets: Sequence[float],
+    ):
+        self._registry = registry
+        self.name, self.help, self.labelnames = name, help, labelnames
+        self.buckets = tuple(buckets)
+        # Per label values: a count per bucket (plus +Inf), then the sum
+        self._series: dict[Labels, list[float]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *labels: str) -> None:
+        if not self._registry.enabled:
+            return
+        i = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [0.0] * (len(self.buckets) + 2)
+            series[i] += 1
+            series[-1] += value
+
+    def time(self, *labels: str) -> _Timer:
+        """
+        Context manager observing the seconds its block took.
+        """
+        return _Timer(self, labels)
+
+    def count(self, *labels: str) -> int:
+        series = self._series.get(labels)
+        return int(sum(series[:-1])) if series else 0
+
+    def samples(self) -> Iterator[tuple[str, Labels, Labels, float]]:
+        with self._lock:
+            snapshot = [(labels, list(series)) for labels, series in self._series.items()]
+        names = (*self.labelnames, "le")
+        for labels, series in snapshot:
+            cumulative = 0.0
+            for bound, count in zip((*self.buckets, math.inf), series, strict=False):
+                cumulative += count
+                yield f"{self.name}_bucket", names, (*labels, _bucket_bound(bound)), cumulative
+            yield f"{self.name}_sum", self.labelnames, labels, series[-1]
+            yield f"{self.name}_count", self.labelnames, labels, cumulative
+
+    def clear(self) -> None:
+        with self._lock:
+            self._series.clear()
+
+
+class _Timer:
+    __slots__ = ("_histogram", "_labels", "_start")
+
+    def __init__(self, histogram: Histogram, labels: Labels):
+        self._histogram = histogram
+        self._labels = labels
+        self._start = 0.0
+
+    def __enter__(self) -> None:
+        self._start = time.perf_counter()
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        self._histogram.observe(time.perf_counter() - self._start, *self._labels)
+
+
+class _Callback:
+    """
+    Values read from elsewhere (e.g. cache hit counters) when scraped, so
+    they cost nothing on the hot path.
+    """
+
+    def __init__(self, name: str, kind: str, help: str, labelnames: Labels, read: Reader):
+        self.name, self.kind, self.help, self.labelnames = name, kind, help, labelnames
+        self._read = read
+
+    def samples(self) -> Iterator[tuple[str, Labels, Labels, float]]:
+        for labels, value in self._read().items():
+            yield self.name, self.labelnames, labels, value
+
+    def clear(self) -> None:
+        pass
+
+
+class MetricsRegistry:
+    """
+    In-process metrics rendered in the Prometheus text exposition format.
+    When disabled, recording is a no-op.
+    """
+
+    def __init__(self, enabled: bool = True):
+        self.enabled = enabled
+        self._metrics: dict[str, Counter | Histogram | _Callback] = {}
+
+    @classmethod
+    def from_settings(cls, settings: Settings) -> MetricsRegistry:
+        return cls(enabled=settings.metrics_enabled)
+
+    def counter(self, name: str, help: str, labelnames: Labels = ()) -> Counter:
+        return self._add(Counter(self, name, help, labelnames))
+
+    def histogram(
+        self,
+        name: str,
+        help: str,
+        labelnames: Labels = (),
+        buckets: Sequence[float] = LATENCY_BUCKETS,
+    ) -> Histogram:
+        return self._add(Histogram(self, name, help, labelnames, buckets))
+
+    def callback(self, name: str, kind: str, help: str, labelnames: Labels, read: Reader) -> None:
+        """
+        Registers a counter or gauge whose samples `read` returns at scrape time.
+        """
+        self._add(_Callback(name, kind, help, labelnames, read))
+
+    def _add[M: Counter | Histogram | _Callback](self, metric: M) -> M:
+        if metric.name in self._metrics:
+            raise ValueError(f"Metric {metric.name} is already registered")
+        self._metrics[metric.name] = metric
+        return metric
+
+    def render(self) -> str:
+        lines: list[str] = []
+        for metric in self._metrics.values():
+            lines.append(f"# HELP {metric.name} {metric.help}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            for name, labelnames, labels, value in metric.samples():
+                if labelnames:
+                    pairs = ",".join(
+                        f'{k}="{_escape(v)}"' for k, v in zip(labelnames, labels, strict=True)
+                    )
+                    name = f"{name}{{{pairs}}}"
+                lines.append(f"{name} {_format(value)}")
+        return "\n".join(lines) + "\n"
+
+    def clear(self) -> None:
+        for metric in self._metrics.values():
+            metric.clear()
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", r"\\").replace('"', r"\"").replace("\n", r"\n")
+
+
+def _bucket_bound(bound: float) -> str:
+    # Always a float (le="1.0"), as Prometheus client libraries write it
+    return "+Inf" if bound == math.inf else repr(float(bound))
+
+
+def _format(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    return str(int(value)) if value == int(value) else repr(value)
+
+
+_registry = MetricsRegistry.from_settings(get_settings())
+
+
+def get_metrics() -> MetricsRegistry:
+    return _registry
+
+
+STAGE_SECONDS = _registry.histogram(
+    "news_agent_stage_seconds", "Time spent in each digest pipeline stage.", ("stage",)
+)
+FEED_FETCH_SECONDS = _registry.histogram(
+    "news_agent_feed_fetch_seconds", "Feed fetch latency (network only).", ("feed",)
+)
+FEED_FETCHES = _registry.counter(
+    "news_agent_feed_fetches_total",
+    "Feed fetches by HTTP status (or error when no response arrived).",
+    ("feed", "status"),
+)
+FEED_FETCH_BYTES = _registry.counter(
+    "news_agent_feed_fetch_bytes_total", "Feed body bytes downloaded.", ("feed",)
+)
+ENTRIES_SKIPPED = _registry.counter(
+    "news_agent_entries_skipped_total", "Feed entries dropped during normalization.", ("reason",)
+)
+DEDUPE_COLLAPSE = _registry.histogram(
+    "news_agent_dedupe_collapse_ratio",
+    "Fraction of a shard's articles removed as duplicate URLs, per shard build.",
+    buckets=RATIO_BUCKETS,
+)
+CLUSTER_SIZE = _registry.histogram(
+    "news_agent_cluster_size",
+    "Articles per story cluster, per shard build.",
+    buckets=SIZE_BUCKETS,
+)
+
+
+def time_stage(stage: str) -> _Timer:
+    """
+    Times a pipeline stage into news_agent_stage_seconds{stage=...}.
+    """
+    return STAGE_SECONDS.time(stage)
+
+
+def timed_stage[**P, R](stage: str) -> Callable[[Callable[P, R]], Callable[P, R]]:
+    """
+    Decorator form of time_stage for stages that are a whole function.
+    """
+
+    def decorate(fn: Callable[P, R]) -> Callable[P, R]:
+        @functools.wraps(fn)
+        def timed(*args: P.args, **kwargs: P.kwargs) -> R:
+            with STAGE_SECONDS.time(stage):
+                return fn(*args, **kwargs)
+
+        return timed
+
+    return decorate
+
+
+def record_feed_fetch(feed: str, seconds: float, status: int | None, size: int = 0) -> None:
+    """
+    Records one feed fetch; `status` is None when no response arrived.
+    """
+    FEED_FETCH_SECONDS.observe(seconds, feed)
+    FEED_FETCHES.inc(feed, str(status) if status is not None else "error")
+    if size:
+        FEED_FETCH_BYTES.inc(feed, amount=size)
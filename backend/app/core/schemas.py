@@ -2,6 +2,7 @@ from __future__ import annotations
 
 from datetime import datetime
 from enum import Enum
+from typing import Literal
 
 from pydantic import BaseModel, ConfigDict, Field, HttpUrl
 
@@ -117,3 +118,92 @@ class DigestResponse(BaseModel):
 
     # If FAIL/FALLBACK, explain why (for UI + debugging)
     qa_notes: list[str] | None = None
+
+
+class DigestDelta(BaseModel):
+    """
+    Changes since the digest version a client already has (delta mode).
+    When that version is unknown, `full` is set and every card is in `added`.
+    """
+
+    schema_version: str = "v1"
+    version: str
+    since: str | None = None
+    full: bool = False
+    generated_at: datetime
+    qa_status: QAStatus
+    qa_notes: list[str] | None = None
+
+    added: list[DigestCard] = Field(default_factory=list)
+    changed: list[DigestCard] = Field(default_factory=list)
+    removed: list[str] = Field(default_factory=list)
+    # Card IDs of the current digest in rank order
+    order: list[str] = Field(default_factory=list)
+
+
+class DigestPage(BaseModel):
+    """
+    One page of a ranked digest. Pass `next_cursor` back to get the next
+    page from the same snapshot; it is None on the last page.
+    """
+
+    schema_version: str = "v1"
+    snapshot: str
+    generated_at: datetime
+    qa_status: QAStatus
+    qa_notes: list[str] | None = None
+    request: DigestRequest
+    cards: list[DigestCard] = Field(default_factory=list)
+    next_cursor: str | None = None
+    total_clusters: int = 0
+
+
+# -----------------------------
+# Streaming digest frames
+# -----------------------------
+class StreamHeader(BaseModel):
+    """
+    First frame of a streamed digest.
+    """
+
+    type: Literal["header"] = "header"
+    schema_version: str = "v1"
+    generated_at: datetime
+    request: DigestRequest
+    pending_feeds: int = 0
+
+
+class StreamCard(BaseModel):
+    """
+    A card that entered the top cards ("card"), or a revised version of a
+    sent card ("update") whose cluster grew as slower feeds arrived.
+    `replaces` is the id of the card it supersedes.
+    """
+
+    type: Literal["card", "update"] = "card"
+    rank: int
+    card: DigestCard
+    replaces: str | None = None
+
+
+class StreamRemove(BaseModel):
+    """
+    A previously sent card that dropped out of the top cards.
+    """
+
+    type: Literal["remove"] = "remove"
+    id: str
+
+
+class StreamQA(BaseModel):
+    """
+    Last frame: QA outcome and the final card order.
+    """
+
+    type: Literal["qa"] = "qa"
+    qa_status: QAStatus
+    qa_notes: list[str] | None = None
+    card_ids: list[str] = Field(default_factory=list)
+
+
+DigestStreamFrame = StreamHeader | StreamCard | StreamRemove | StreamQA
@@ -0,0 +1 @@
+# Export: static digest snapshots for CDNs and static file servers
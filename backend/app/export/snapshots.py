@@ -0,0 +1,170 @@
+from __future__ import annotations
+
+import hashlib
+import itertools
+import os
+import tempfile
+from collections.abc import Callable, Mapping, Sequence
+from datetime import UTC, datetime
+from functools import partial
+from pathlib import Path
+from typing import Any
+
+import orjson
+import yaml
+
+from app.api.compression import SUPPORTED_ENCODINGS, compress
+from app.api.responses import render_model
+from app.cache.keys import digest_request_key
+from app.core.schemas import DigestRequest, DigestResponse
+from app.pipeline.format.versioning import digest_version
+from app.pipeline.orchestrator import build_digests
+
+MATRIX_PATH = Path(__file__).parent.parent / "resources" / "snapshot_matrix.yaml"
+
+MANIFEST_FORMAT = 1
+MANIFEST_NAME = "manifest.json"
+DIGESTS_DIR = "digests"
+MANIFESTS_DIR = "manifests"
+
+_SUFFIXES = {"gzip": ".gz", "br": ".br"}
+
+
+def load_matrix(path: Path = MATRIX_PATH) -> list[DigestRequest]:
+    """
+    Loads a snapshot matrix file (YAML or JSON) into digest requests.
+    """
+    with open(path) as f:
+        return expand_matrix(yaml.safe_load(f) or {})
+
+
+def expand_matrix(config: Mapping[str, Any]) -> list[DigestRequest]:
+    """
+    Every combination of the `matrix` axes merged over `defaults`, then
+    each entry of `requests`. Requests with the same cache key are kept
+    once, in first-seen order.
+    """
+    defaults = dict(config.get("defaults") or {})
+    axes = dict(config.get("matrix") or {})
+    bodies: list[dict[str, Any]] = []
+    if axes:
+        bodies += [
+            {**defaults, **dict(zip(axes, values, strict=True))}
+            for values in itertools.product(*axes.values())
+        ]
+    bodies += [{**defaults, **body} for body in config.get("requests") or []]
+
+    requests: dict[str, DigestRequest] = {}
+    for body in bodies:
+        req = DigestRequest.model_validate(body)
+        requests.setdefault(digest_request_key(req), req)
+    return list(requests.values())
+
+
+def export_snapshots(
+    reqs: Sequence[DigestRequest],
+    out_dir: Path,
+    keep: int = 3,
+    build: Callable[[Sequence[DigestRequest]], list[DigestResponse]] = build_digests,
+) -> dict[str, Any]:
+    """
+    Builds the requests in one pipeline run and writes each digest as it
+    is served by POST /digest, plus a precompressed copy per supported
+    content coding, then publishes a manifest listing them.
+
+    Digest files are named by their version (the /digest ETag), so an
+    unchanged digest keeps its URL across exports and files are never
+    rewritten in place. Every file is written to a temporary name and
+    renamed, and `manifest.json` is replaced last, so readers only see
+    complete exports. Files no longer referenced by the last `keep`
+    manifests are removed. Returns the manifest.
+    """
+    out_dir.mkdir(parents=True, exist_ok=True)
+    (out_dir / DIGESTS_DIR).mkdir(exist_ok=True)
+    (out_dir / MANIFESTS_DIR).mkdir(exist_ok=True)
+
+    now = datetime.now(UTC)
+    entries = [_write_digest(out_dir, response) for response in build(reqs)]
+    manifest = {
+        "format": MANIFEST_FORMAT,
+        "generated_at": now.isoformat(),
+        "digests": entries,
+    }
+
+    body = orjson.dumps(manifest, option=orjson.OPT_INDENT_2)
+    name = f"manifest-{now:%Y%m%dT%H%M%S%fZ}-{_content_hash(body)}.json"
+    _write_atomic(out_dir / MANIFESTS_DIR / name, body)
+    _write_atomic(out_dir / MANIFEST_NAME, body)
+    prune(out_dir, keep)
+    return manifest
+
+
+def _write_digest(out_dir: Path, response: DigestResponse) -> dict[str, Any]:
+    version = digest_version(response)
+    path = f"{DIGESTS_DIR}/{version}.json"
+    body = _write_once(out_dir / path, lambda: render_model(response))
+    encodings = {}
+    for encoding in SUPPORTED_ENCODINGS:
+        encoded_path = path + _SUFFIXES[encoding]
+        encoded = _write_once(out_dir / encoded_path, partial(compress, body, encoding))
+        encodings[encoding] = {"path": encoded_path, "bytes": len(encoded)}
+    return {
+        "key": digest_request_key(response.request),
+        "request": response.request.model_dump(mode="json"),
+        "version": version,
+        # An unchanged digest keeps the file (and generated_at) it was first exported with
+        "generated_at": orjson.loads(body)["generated_at"],
+        "qa_status": response.qa_status.value,
+        "cards": len(response.cards),
+        "path": path,
+        "bytes": len(body),
+        "sha256": hashlib.sha256(body).hexdigest(),
+        "encodings": encodings,
+    }
+
+
+def _write_once(path: Path, render: Callable[[], bytes]) -> bytes:
+    # A file named after its version already holds that content
+    if path.exists():
+        return path.read_bytes()
+    data = render()
+    _write_atomic(path, data)
+    return data
+
+
+def _write_atomic(path: Path, data: bytes) -> None:
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.chmod(tmp, 0o644)
+        os.replace(tmp, path)
+    except BaseException:
+        Path(tmp).unlink(missing_ok=True)
+        raise
+
+
+def _content_hash(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()[:16]
+
+
+def prune(out_dir: Path, keep: int) -> list[Path]:
+    """
+    Deletes all but the newest `keep` versioned manifests and any digest
+    file none of the remaining manifests reference. Returns what it removed.
+    """
+    manifests = sorted((out_dir / MANIFESTS_DIR).glob("manifest-*.json"), reverse=True)
+    removed = manifests[max(keep, 1) :]
+    referenced: set[str] = set()
+    for manifest in manifests[: max(keep, 1)]:
+        for entry in orjson.loads(manifest.read_bytes())["digests"]:
+            referenced.add(entry["path"])
+            referenced.update(e["path"] for e in entry["encodings"].values())
+    for path in (out_dir / DIGESTS_DIR).iterdir():
+        if f"{DIGESTS_DIR}/{path.name}" not in referenced and not path.name.startswith("."):
+            removed.append(path)
+    for path in removed:
+        path.unlink(missing_ok=True)
+    return removed
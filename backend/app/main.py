@@ -1,9 +1,32 @@
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
+from app.api.metrics import router as metrics_router
 from app.api.routes import router as api_router
+from app.core.config import get_settings
+from app.core.executors import shutdown_process_pool
+from app.core.http import close_http_client, get_http_client
+from app.pipeline.prewarm import get_prewarmer
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    # Feed fetches share one connection pool for the life of the app
+    get_http_client()
+    prewarm = get_settings().prewarm_enabled
+    if prewarm:
+        get_prewarmer().start()
+    yield
+    if prewarm:
+        await get_prewarmer().stop()
+    shutdown_process_pool()
+    await close_http_client()
+
 
-app = FastAPI(title="News Agent API")
+app = FastAPI(title="News Agent API", lifespan=lifespan)
 
 # Local dev CORS (Vite default: 5173)
 app.add_middleware(
@@ -18,6 +41,7 @@ app.add_middleware(
 )
 
 app.include_router(api_router)
+app.include_router(metrics_router)
 
 
 @app.get("/")
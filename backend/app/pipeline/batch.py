@@ -0,0 +1,235 @@
+from __future__ import annotations
+
+import hashlib
+from collections.abc import Sequence
+from dataclasses import dataclass, replace
+from datetime import UTC, datetime
+
+import numpy as np
+import numpy.typing as npt
+
+from app.core.executors import map_chunks
+from app.core.schemas import TimeRange, Topic
+from app.core.timeutil import to_epoch_us
+from app.pipeline.gather.models import Article
+from app.pipeline.gather.rss_gatherer import TIME_RANGE_DELTAS
+from app.pipeline.verify.topic_tagger import tag_topics
+
+# Categorical topic codes and tag bits (stable: follows Topic declaration order)
+TOPIC_CODES: list[Topic] = list(Topic)
+TOPIC_INDEX: dict[Topic, int] = {t: i for i, t in enumerate(TOPIC_CODES)}
+
+# Timestamps are int64 microseconds since the epoch. Articles without a
+# published date get a sentinel that sorts before any real date.
+NO_DATE = np.iinfo(np.int64).min
+
+IntArray = npt.NDArray[np.int64]
+
+
+def topic_bit(topic: Topic) -> int:
+    return 1 << TOPIC_INDEX[topic]
+
+
+def url_hash(canonical_url: str) -> int:
+    """
+    Signed 64-bit hash of a canonical URL for vectorized uniqueness checks.
+    """
+    digest = hashlib.blake2b(canonical_url.encode(), digest_size=8).digest()
+    return int.from_bytes(digest, "little", signed=True)
+
+
+def tag_masks_for(texts: Sequence[tuple[str, str | None, int]]) -> list[int]:
+    """
+    Tag bitmasks for (title, summary, topic code) rows, including each row's
+    own topic. Plain tuples in and ints out, so chunks can be tagged in
+    worker processes.
+    """
+    masks: list[int] = []
+    for title, summary, code in texts:
+        bits = 1 << code
+        for t in tag_topics(title, summary):
+            bits |= topic_bit(t)
+        masks.append(bits)
+    return masks
+
+
+@dataclass(slots=True)
+class ArticleBatch:
+    """
+    Struct-of-arrays view over a list of articles.
+
+    Row i of every column describes `source[rows[i]]`. Filters and dedupe
+    work on the columns and share the source list, so Article objects are
+    only touched again in `to_articles`. Tag masks (keyword tags plus the
+    feed topic) are computed lazily, so rows removed by cheaper stages are
+    never tagged.
+    """
+
+    source: list[Article]
+    rows: npt.NDArray[np.intp]
+    published_at: IntArray
+    topic_codes: npt.NDArray[np.int8]
+    publisher_ids: npt.NDArray[np.int32]
+    publishers: list[str]
+    url_hashes: IntArray
+    summary_lens: npt.NDArray[np.int32]
+    tag_masks: npt.NDArray[np.uint8] | None = None
+
+    @classmethod
+    def from_articles(cls, articles: list[Article]) -> ArticleBatch:
+        n = len(articles)
+        published_at = np.empty(n, dtype=np.int64)
+        topic_codes = np.empty(n, dtype=np.int8)
+        publisher_ids = np.empty(n, dtype=np.int32)
+        url_hashes = np.empty(n, dtype=np.int64)
+        summary_lens = np.empty(n, dtype=np.int32)
+
+        # Interned publisher vocabulary
+        publisher_index: dict[str, int] = {}
+        for i, a in enumerate(articles):
+            published_at[i] = to_epoch_us(a.published_at) if a.published_at else NO_DATE
+            topic_codes[i] = TOPIC_INDEX[a.topic]
+            publisher_ids[i] = publisher_index.setdefault(a.publisher_name, len(publisher_index))
+            url_hashes[i] = url_hash(a.canonical_url)
+            summary_lens[i] = len(a.summary) if a.summary else 0
+
+        return cls(
+            source=list(articles),
+            rows=np.arange(n),
+            published_at=published_at,
+            topic_codes=topic_codes,
+            publisher_ids=publisher_ids,
+            publishers=list(publisher_index),
+            url_hashes=url_hashes,
+            summary_lens=summary_lens,
+        )
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def ensure_tags(self) -> npt.NDArray[np.uint8]:
+        """
+        Computes keyword tag masks once per row (includes the row's own topic).
+        """
+        if self.tag_masks is None:
+            texts = [
+                (a.title, a.summary, TOPIC_INDEX[a.topic])
+                for a in (self.source[row] for row in self.rows.tolist())
+            ]
+            self.tag_masks = np.array(map_chunks(tag_masks_for, texts), dtype=np.uint8)
+        return self.tag_masks
+
+    def take(self, rows: npt.NDArray[np.intp] | npt.NDArray[np.bool_]) -> ArticleBatch:
+        """
+        Returns a new batch restricted to `rows` (index array or boolean mask).
+        """
+        idx = np.flatnonzero(rows) if rows.dtype == np.bool_ else rows
+        return ArticleBatch(
+            source=self.source,
+            rows=self.rows[idx],
+            published_at=self.published_at[idx],
+            topic_codes=self.topic_codes[idx],
+            publisher_ids=self.publisher_ids[idx],
+            publishers=self.publishers,
+            url_hashes=self.url_hashes[idx],
+            summary_lens=self.summary_lens[idx],
+            tag_masks=None if self.tag_masks is None else self.tag_masks[idx],
+        )
+
+    def to_articles(self) -> list[Article]:
+        """
+        Materializes rows, applying any topic reassignment as a copy.
+        Source Article objects are never mutated.
+        """
+        results: list[Article] = []
+        for row, code in zip(self.rows.tolist(), self.topic_codes.tolist(), strict=True):
+            a = self.source[row]
+            topic = TOPIC_CODES[code]
+            results.append(a if a.topic == topic else replace(a, topic=topic))
+        return results
+
+
+def filter_batch_by_time_range(
+    batch: ArticleBatch, range_enum: TimeRange, now: datetime | None = None
+) -> ArticleBatch:
+    """
+    Batch equivalent of filter_by_time_range.
+    """
+    if now is None:
+        now = datetime.now(UTC)
+    delta = TIME_RANGE_DELTAS.get(range_enum)
+    if delta is None:
+        return batch
+    cutoff = to_epoch_us(now - delta)
+    return batch.take(batch.published_at >= cutoff)
+
+
+def filter_batch_by_publishers(batch: ArticleBatch, publishers: list[str]) -> ArticleBatch:
+    """
+    Keeps rows whose publisher name is in `publishers`.
+    """
+    names = set(publishers)
+    wanted = [i for i, name in enumerate(batch.publishers) if name in names]
+    return batch.take(np.isin(batch.publisher_ids, wanted))
+
+
+def filter_batch_by_topics(
+    batch: ArticleBatch, requested: list[Topic], daily_fallback: bool = True
+) -> ArticleBatch:
+    """
+    Batch equivalent of filter_by_topics, including the DAILY fallback
+    (skipped when `daily_fallback` is False). Each kept row is assigned the
+    first requested topic it matched.
+    """
+    tags = batch.ensure_tags()
+    requested_bits = 0
+    for t in requested:
+        requested_bits |= topic_bit(t)
+
+    matched = (tags & requested_bits) != 0
+    if matched.any():
+        codes = batch.topic_codes.copy()
+        # Walk in reverse so the first requested topic wins
+        for t in reversed(requested):
+            codes = np.where((tags & topic_bit(t)) != 0, TOPIC_INDEX[t], codes).astype(np.int8)
+        result = batch.take(matched)
+        result.topic_codes = codes[matched]
+        return result
+
+    if Topic.DAILY in requested or not daily_fallback:
+        return batch.take(matched)
+
+    daily = (tags & topic_bit(Topic.DAILY)) != 0
+    result = batch.take(daily)
+    result.topic_codes = np.full(len(result), TOPIC_INDEX[Topic.DAILY], dtype=np.int8)
+    return result
+
+
+def deduplicate_batch(batch: ArticleBatch) -> ArticleBatch:
+    """
+    Batch equivalent of deduplicate_candidates.
+
+    Rows are grouped by canonical URL hash and each group keeps the row the
+    sequential tie-breakers would keep (dated over undated, then newest,
+    then longest summary when both are undated, then first seen). Output
+    order follows each group's first appearance.
+    """
+    n = len(batch)
+    if n == 0:
+        return batch
+
+    # One priority column: any date beats no date, newer dates win, and
+    # undated rows fall back to summary length. lexsort is stable, so equal
+    # priorities keep the first-seen row.
+    has_date = batch.published_at != NO_DATE
+    undated = batch.summary_lens.astype(np.int64) + (NO_DATE + 1)
+    priority = np.where(has_date, batch.published_at, undated)
+
+    # np.lexsort sorts by the last key first
+    order = np.lexsort((-priority, batch.url_hashes))
+    sorted_hashes = batch.url_hashes[order]
+    starts = np.flatnonzero(np.r_[True, sorted_hashes[1:] != sorted_hashes[:-1]])
+
+    winners = order[starts]
+    first_seen = np.minimum.reduceat(order, starts)
+    return batch.take(winners[np.argsort(first_seen, kind="stable")])
@@ -1,9 +1,11 @@
 from __future__ import annotations
 
 import re
+from collections.abc import Sequence
 from datetime import UTC, datetime
 
-from app.pipeline.gather.models import ArticleCandidate
+from app.core.executors import run_offloaded
+from app.pipeline.gather.models import ArticleT
 
 
 def tokenize_title(title: str) -> set[str]:
@@ -25,13 +27,37 @@ def jaccard(a: set[str], b: set[str]) -> float:
     return len(intersection) / len(union)
 
 
+def cluster_titles(titles: Sequence[str], threshold: float = 0.60) -> list[list[int]]:
+    """
+    Greedy clustering over titles that are already in priority order.
+    Each title joins the first cluster whose lead (first title) matches
+    above threshold, else starts a new cluster. Returns index groups;
+    plain strings in and ints out, so it can run in a worker process.
+    """
+    clusters: list[list[int]] = []
+    lead_tokens: list[set[str]] = []
+
+    for i, title in enumerate(titles):
+        tokens = tokenize_title(title)
+        for cluster, lead in zip(clusters, lead_tokens, strict=True):
+            if jaccard(tokens, lead) >= threshold:
+                cluster.append(i)
+                break
+        else:
+            clusters.append([i])
+            lead_tokens.append(tokens)
+
+    return clusters
+
+
 def cluster_by_title_similarity(
-    items: list[ArticleCandidate], threshold: float = 0.60
-) -> list[list[ArticleCandidate]]:
+    items: list[ArticleT], threshold: float = 0.60
+) -> list[list[ArticleT]]:
     """
     Greedy clustering: iterate items sorted by published_at desc.
     Put item into first cluster whose representative matches above threshold.
     Else create new cluster.
+    Large inputs are clustered in the process pool when one is configured.
     """
     # Sort by published_at desc
     sorted_items = sorted(
@@ -40,23 +66,6 @@ def cluster_by_title_similarity(
         reverse=True,
     )
 
-    clusters: list[list[ArticleCandidate]] = []
-
-    for item in sorted_items:
-        tokens = tokenize_title(item.title)
-        assigned = False
-
-        for cluster in clusters:
-            # First item in cluster is the representative
-            lead = cluster[0]
-            lead_tokens = tokenize_title(lead.title)
-
-            if jaccard(tokens, lead_tokens) >= threshold:
-                cluster.append(item)
-                assigned = True
-                break
-
-        if not assigned:
-            clusters.append([item])
-
-    return clusters
+    titles = [item.title for item in sorted_items]
+    groups = run_offloaded(cluster_titles, titles, threshold, size=len(titles))
+    return [[sorted_items[i] for i in group] for group in groups]
@@ -0,0 +1 @@
+# Format stage: DigestCard construction
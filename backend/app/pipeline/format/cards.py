@@ -0,0 +1,106 @@
+from __future__ import annotations
+
+import hashlib
+from datetime import UTC, datetime
+from functools import lru_cache
+
+from pydantic import HttpUrl
+
+from app.core.schemas import Bullet, Citation, ConfidenceTag, DigestCard
+from app.pipeline.gather.models import Article
+from app.pipeline.rank.ranker import ClusterSummary
+
+DEFAULT_BULLET_TEXT = "Headline summary from source."
+
+_MAX_DATE = datetime.max.replace(tzinfo=UTC)
+
+
+def cluster_id(members: list[Article]) -> str:
+    """
+    Card ID that stays stable as a story grows: derived from the cluster's
+    earliest article (by publish time, then canonical URL), which newer
+    articles joining the cluster cannot displace.
+    """
+    origin = min(members, key=lambda m: (m.published_at or _MAX_DATE, m.canonical_url))
+    return "rss-" + hashlib.md5(origin.canonical_url.encode()).hexdigest()[:12]
+
+
+def cluster_version(summary: ClusterSummary) -> tuple[object, ...]:
+    """
+    Everything build_card reads from a cluster, as a hashable key: summaries
+    with the same cluster_id and version produce identical cards. Built
+    from the members' existing strings, so it costs no serialization.
+    """
+    return (
+        summary.topic,
+        summary.multi_source,
+        summary.published_at,
+        next(i for i, m in enumerate(summary.members) if m is summary.primary),
+        *((m.url, m.publisher_name, m.published_at, m.title, m.summary) for m in summary.members),
+    )
+
+
+@lru_cache(maxsize=65536)
+def _http_url(url: str) -> HttpUrl:
+    """
+    HttpUrl objects are immutable, so rebuilding a card reuses the one
+    validated the first time instead of parsing the URL again.
+    """
+    return HttpUrl(url)
+
+
+def clean_summary(summary: str | None) -> str:
+    """
+    Drops any trailing HTML from an RSS summary.
+    """
+    if not summary:
+        return ""
+    return summary.split("<")[0].strip()
+
+
+def build_card(summary: ClusterSummary) -> DigestCard:
+    """
+    Materializes a DigestCard for a ranked cluster.
+    Citation lookups are keyed by URL so the cost is linear in cluster size.
+    """
+    primary = summary.primary
+
+    # Combine unique citations across all members
+    citations_by_url: dict[str, Citation] = {}
+    for m in summary.members:
+        if m.url not in citations_by_url:
+            citations_by_url[m.url] = Citation(
+                publisher=m.publisher_name, url=_http_url(m.url), published_at=m.published_at
+            )
+    unique_citations = list(citations_by_url.values())
+
+    confidence = (
+        ConfidenceTag.MULTI_SOURCE if summary.multi_source else ConfidenceTag.SINGLE_SOURCE
+    )
+
+    # 1st bullet from primary summary, then up to 2 more from other members
+    primary_text = clean_summary(primary.summary)[:230] or DEFAULT_BULLET_TEXT
+    bullets = [Bullet(text=primary_text, citations=[citations_by_url[primary.url]])]
+    seen_texts = {primary_text[:200]}
+
+    for m in summary.members:
+        if len(bullets) >= 3:
+            break
+        if m is primary:
+            continue
+
+        m_text = clean_summary(m.summary)
+        if m_text and m_text[:200] not in seen_texts:
+            bullets.append(Bullet(text=m_text[:230], citations=[citations_by_url[m.url]]))
+            seen_texts.add(m_text[:200])
+
+    return DigestCard(
+        id=cluster_id(summary.members),
+        topic=summary.topic,
+        headline=primary.title[:155],
+        publisher=primary.publisher_name,
+        published_at=summary.published_at,
+        confidence=confidence,
+        bullets=bullets,
+        sources=unique_citations,
+    )
@@ -0,0 +1,70 @@
+from __future__ import annotations
+
+import hashlib
+
+from app.cache.fragments import get_fragment_cache
+from app.cache.model_memo import ModelMemo
+from app.core.schemas import DigestCard, DigestDelta, DigestResponse
+
+
+def digest_version(response: DigestResponse) -> str:
+    """
+    Content version of a digest response, used as its strong ETag.
+    generated_at is left out so an unchanged rebuild keeps its version.
+    Remembered per response, since cached digests are served repeatedly.
+    """
+    return _versions(response)
+
+
+def _digest_version(response: DigestResponse) -> str:
+    # Cards are hashed from their cached fragments rather than re-serialized
+    fragments = get_fragment_cache()
+    h = hashlib.sha256(response.model_dump_json(exclude={"generated_at", "cards"}).encode())
+    for card in response.cards:
+        h.update(b"\x1e" + fragments.fragment(card))
+    return h.hexdigest()[:24]
+
+
+_versions = ModelMemo(_digest_version)
+
+
+def card_fingerprints(response: DigestResponse) -> dict[str, str]:
+    return {card.id: _fingerprint(card) for card in response.cards}
+
+
+def _fingerprint(card: DigestCard) -> str:
+    return hashlib.sha256(get_fragment_cache().fragment(card)).hexdigest()[:16]
+
+
+def digest_delta(
+    response: DigestResponse,
+    version: str,
+    since: str | None,
+    previous: dict[str, str] | None,
+) -> DigestDelta:
+    """
+    Diffs `response` against the card fingerprints of version `since`.
+    Without them (unknown or expired version) the delta carries every card.
+    """
+    delta = DigestDelta(
+        version=version,
+        since=since,
+        full=previous is None,
+        generated_at=response.generated_at,
+        qa_status=response.qa_status,
+        qa_notes=response.qa_notes,
+        order=[card.id for card in response.cards],
+    )
+    if previous is None:
+        delta.added = list(response.cards)
+        return delta
+
+    for card in response.cards:
+        old = previous.get(card.id)
+        if old is None:
+            delta.added.append(card)
+        elif old != _fingerprint(card):
+            delta.changed.append(card)
+    current = {card.id for card in response.cards}
+    delta.removed = [cid for cid in previous if cid not in current]
+    return delta
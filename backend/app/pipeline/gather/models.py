@@ -1,10 +1,13 @@
 from __future__ import annotations
 
+from dataclasses import dataclass
 from datetime import datetime
+from typing import TypeVar
 
 from pydantic import BaseModel, HttpUrl
 
 from app.core.schemas import Topic
+from app.pipeline.verify.url_canonicalize import canonicalize_url
 
 
 class ArticleCandidate(BaseModel):
@@ -14,3 +17,64 @@ class ArticleCandidate(BaseModel):
     published_at: datetime | None
     topic: Topic
     summary: str | None = None
+
+
+@dataclass(slots=True)
+class Article:
+    """
+    Internal article record passed between gather and card building.
+    The URL is a plain, already-validated string; pydantic validation only
+    happens at ingestion and on the API response.
+    """
+
+    title: str
+    url: str
+    publisher_name: str
+    published_at: datetime | None
+    topic: Topic
+    summary: str | None = None
+    canonical_url: str = ""
+
+    def __post_init__(self) -> None:
+        if not self.canonical_url:
+            self.canonical_url = canonicalize_url(self.url)
+
+    @classmethod
+    def from_candidate(cls, candidate: ArticleCandidate) -> Article:
+        return cls(
+            title=candidate.title,
+            url=str(candidate.url),
+            publisher_name=candidate.publisher_name,
+            published_at=candidate.published_at,
+            topic=candidate.topic,
+            summary=candidate.summary,
+        )
+
+    def to_candidate(self) -> ArticleCandidate:
+        return ArticleCandidate(
+            title=self.title,
+            url=HttpUrl(self.url),
+            publisher_name=self.publisher_name,
+            published_at=self.published_at,
+            topic=self.topic,
+            summary=self.summary,
+        )
+
+
+# A parsed feed entry in compact form: (title, link, published_at as epoch
+# microseconds, summary). Plain tuples keep process-pool IPC and the shared
+# feed cache cheap.
+FeedEntry = tuple[str | None, str | None, int | None, str | None]
+
+
+# Stages accept either representation and return the same one they were given
+ArticleT = TypeVar("ArticleT", ArticleCandidate, Article)
+
+
+def as_article(item: Article | ArticleCandidate) -> Article:
+    """
+    Converts a validated ArticleCandidate into the internal record (no-op for Article).
+    """
+    if isinstance(item, Article):
+        return item
+    return Article.from_candidate(item)
@@ -1,21 +1,39 @@
 from __future__ import annotations
 
+import asyncio
 import logging
+import time
 from datetime import UTC, datetime, timedelta
 from urllib.parse import urlparse
 
 import feedparser
+import httpx
 import requests
 from pydantic import HttpUrl, ValidationError
 
+from app.cache.backends import cached_fill, cached_fill_async, get_cache_backend
+from app.cache.codec import CodecError, decode_feed_entries, encode_feed_entries
+from app.cache.single_flight import AsyncSingleFlight, SingleFlight
+from app.core.config import get_settings
+from app.core.executors import run_cpu, run_offloaded, run_offloaded_async
+from app.core.http import get_http_client
+from app.core.metrics import ENTRIES_SKIPPED, record_feed_fetch, time_stage, timed_stage
 from app.core.schemas import TimeRange
 from app.core.source_registry import Feed as RegistryFeed
 from app.core.source_registry import Publisher
-from app.pipeline.gather.models import ArticleCandidate
-from app.pipeline.verify.url_canonicalize import canonicalize_url
+from app.core.timeutil import from_epoch_us, to_epoch_us
+from app.pipeline.gather.models import Article, ArticleT, FeedEntry
+from app.pipeline.verify.dedupe import canonical_url_of
+from app.storage.feed_cache import FeedRecord, SharedFeedCache, get_feed_cache
 
 logger = logging.getLogger(__name__)
 
+TIME_RANGE_DELTAS: dict[TimeRange, timedelta] = {
+    TimeRange.H24: timedelta(hours=24),
+    TimeRange.D3: timedelta(days=3),
+    TimeRange.D7: timedelta(days=7),
+}
+
 
 def is_valid_url(url: str) -> bool:
     """
@@ -62,10 +80,10 @@ def parse_rss_date(entry: feedparser.FeedParserDict) -> datetime | None:
 
 
 def filter_by_time_range(
-    articles: list[ArticleCandidate],
+    articles: list[ArticleT],
     range_enum: TimeRange,
     now: datetime | None = None,
-) -> list[ArticleCandidate]:
+) -> list[ArticleT]:
     """
     Filters articles based on TimeRange (24h, 3d, 7d).
     Accepts an optional `now` parameter for deterministic testing.
@@ -73,37 +91,167 @@ def filter_by_time_range(
     if now is None:
         now = datetime.now(UTC)
 
-    if range_enum == TimeRange.H24:
-        delta = timedelta(hours=24)
-    elif range_enum == TimeRange.D3:
-        delta = timedelta(days=3)
-    elif range_enum == TimeRange.D7:
-        delta = timedelta(days=7)
-    else:
+    delta = TIME_RANGE_DELTAS.get(range_enum)
+    if delta is None:
         return articles
 
     cutoff = now - delta
     return [a for a in articles if a.published_at and a.published_at >= cutoff]
 
 
-def deduplicate_articles(articles: list[ArticleCandidate]) -> list[ArticleCandidate]:
+def deduplicate_articles(articles: list[ArticleT]) -> list[ArticleT]:
     """
     Deduplicates articles by canonical URL.
     """
     seen_urls = set()
     deduped = []
     for a in articles:
-        url_str = canonicalize_url(str(a.url))
+        url_str = canonical_url_of(a)
         if url_str not in seen_urls:
             seen_urls.add(url_str)
             deduped.append(a)
     return deduped
 
 
+FETCH_HEADERS = {
+    "User-Agent": (
+        "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
+        "AppleWebKit/537.36 (KHTML, like Gecko) "
+        "Chrome/91.0.4472.124 Safari/537.36"
+    )
+}
+
+def parse_feed_entries(content: bytes | str) -> list[FeedEntry]:
+    """
+    Parses raw feed bytes/XML into compact entries. Module-level and free of
+    pydantic objects so it can run in a worker process.
+    """
+    entries: list[FeedEntry] = []
+    for entry in feedparser.parse(content).entries:
+        published_at = parse_rss_date(entry)
+        entries.append(
+            (
+                getattr(entry, "title", None),
+                getattr(entry, "link", None),
+                to_epoch_us(published_at) if published_at else None,
+                getattr(entry, "summary", None),
+            )
+        )
+    return entries
+
+
+# Feed fetches currently in flight, shared across concurrent requests
+_feed_flight: SingleFlight[str, list[FeedEntry] | None] = SingleFlight()
+_async_feed_flight: AsyncSingleFlight[str, list[FeedEntry] | None] = AsyncSingleFlight()
+
+
+def get_feed_flight() -> SingleFlight[str, list[FeedEntry] | None]:
+    return _feed_flight
+
+
 class RSSGatherer:
     def __init__(self, timeout_seconds: int = 10):
         self.timeout_seconds = timeout_seconds
 
+    def fetch_feed(self, url: str) -> list[FeedEntry] | None:
+        """
+        Fetches and parses a feed, or returns None if the fetch failed.
+
+        Concurrent calls for the same URL (e.g. two digest requests that both
+        fall back to the same DAILY feed) share one network fetch and parse.
+        The parsed result is only read afterwards, never mutated. Parsing
+        runs in the process pool when one is configured.
+        """
+        return _feed_flight.do(url, lambda: self._fetch_and_parse(url))
+
+    def _fetch_and_parse(self, url: str) -> list[FeedEntry] | None:
+        shared = get_feed_cache()
+        if shared is not None:
+            return self._fetch_shared(shared, url)
+        backend = get_cache_backend()
+        if backend is None:
+            return self._fetch_direct(url)
+
+        def fill() -> bytes | None:
+            entries = self._fetch_direct(url)
+            return encode_feed_entries(entries) if entries is not None else None
+
+        blob = cached_fill(backend, f"feed:{url}", fill, get_settings().feed_cache_ttl)
+        try:
+            return decode_feed_entries(blob) if blob is not None else None
+        except CodecError:
+            return self._fetch_direct(url)
+
+    def _get(self, url: str, headers: dict[str, str]) -> requests.Response:
+        """
+        requests.get with the fetch's latency, status and size recorded per feed.
+        """
+        start = time.perf_counter()
+        try:
+            resp = requests.get(url, headers=headers, timeout=self.timeout_seconds)
+        except requests.RequestException:
+            record_feed_fetch(url, time.perf_counter() - start, None)
+            raise
+        record_feed_fetch(url, time.perf_counter() - start, resp.status_code, len(resp.content))
+        return resp
+
+    def _fetch_direct(self, url: str) -> list[FeedEntry] | None:
+        # Use requests with User-Agent and timeout
+        try:
+            resp = self._get(url, FETCH_HEADERS)
+            resp.raise_for_status()
+        except requests.RequestException as e:
+            logger.warning(f"Failed to fetch feed {url}: {e}")
+            return None
+        with time_stage("parse"):
+            return run_offloaded(parse_feed_entries, resp.content)
+
+    def _fetch_shared(self, shared: SharedFeedCache, url: str) -> list[FeedEntry] | None:
+        """
+        Serves a feed through the host-wide cache: fresh entries are reused,
+        otherwise the worker that wins the refresh lease fetches (conditionally,
+        with stored validators) while the others wait for it. If the wait
+        times out or the refresh fails, stale entries are better than none.
+        """
+        deadline = time.monotonic() + self.timeout_seconds
+        while True:
+            record = shared.lookup(url)
+            if record is not None and record.is_fresh(shared.now(), shared.ttl_seconds):
+                return record.entries
+            token = shared.try_acquire(url)
+            if token is not None:
+                return self._refresh_shared(shared, url, record, token)
+            if time.monotonic() >= deadline:
+                return record.entries if record else None
+            time.sleep(shared.poll_seconds)
+
+    def _refresh_shared(
+        self, shared: SharedFeedCache, url: str, record: FeedRecord | None, token: str
+    ) -> list[FeedEntry] | None:
+        stale = record.entries if record else None
+        headers = {**FETCH_HEADERS, **(record.conditional_headers() if record else {})}
+        try:
+            resp = self._get(url, headers)
+            if resp.status_code == 304 and stale is not None:
+                shared.touch(url, token)
+                return stale
+            resp.raise_for_status()
+        except requests.RequestException as e:
+            logger.warning(f"Failed to fetch feed {url}: {e}")
+            shared.release(url, token)
+            return stale
+        try:
+            with time_stage("parse"):
+                entries = run_offloaded(parse_feed_entries, resp.content)
+            shared.store(
+                url, token, entries, resp.headers.get("ETag"), resp.headers.get("Last-Modified")
+            )
+        except BaseException:
+            # Otherwise every other worker waits out the lease for nothing
+            shared.release(url, token)
+            raise
+        return entries
+
     def gather(
         self,
         publisher: Publisher,
@@ -111,39 +259,169 @@ class RSSGatherer:
         time_range: TimeRange,
         raw_xml: str | None = None,
         now: datetime | None = None,
-    ) -> list[ArticleCandidate]:
+    ) -> list[Article]:
         """
         Fetches or takes raw XML, parses, normalizes, and filters.
+        This is the ingestion boundary: links are validated here once and
+        carried as plain strings on the internal Article record afterwards.
+        Normalization and the time-range filter run per call on the (possibly
+        shared) parsed entries.
         """
         if raw_xml:
-            d = feedparser.parse(raw_xml)
+            with time_stage("parse"):
+                entries = parse_feed_entries(raw_xml)
         else:
-            # Use requests with User-Agent and timeout
-            headers = {
-                "User-Agent": (
-                    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
-                    "AppleWebKit/537.36 (KHTML, like Gecko) "
-                    "Chrome/91.0.4472.124 Safari/537.36"
-                )
-            }
-            try:
-                resp = requests.get(
-                    str(feed_registry.url), headers=headers, timeout=self.timeout_seconds
-                )
-                resp.raise_for_status()
-                d = feedparser.parse(resp.content)
-            except requests.RequestException as e:
-                logger.warning(f"Failed to fetch feed {feed_registry.url}: {e}")
+            parsed = self.fetch_feed(str(feed_registry.url))
+            if parsed is None:
                 return []
+            entries = parsed
+        return self.normalize_entries(publisher, feed_registry, entries, time_range, now)
+
+    async def fetch_feed_async(
+        self, url: str, client: httpx.AsyncClient
+    ) -> list[FeedEntry] | None:
+        """
+        Async fetch_feed: awaits the network on the event loop and parses on
+        the process pool (or CPU executor). Concurrent calls for a URL share
+        one fetch. Calls with the process-wide client share it across all
+        builds; a caller's own client is only shared with calls passing that
+        same client, so a fetch never runs on a client its followers did
+        not choose (and which its owner may close).
+        """
+        key = url if client is get_http_client() else f"{url}#{id(client)}"
+        return await _async_feed_flight.do(key, lambda: self._fetch_and_parse_async(url, client))
+
+    async def _fetch_and_parse_async(
+        self, url: str, client: httpx.AsyncClient
+    ) -> list[FeedEntry] | None:
+        shared = get_feed_cache()
+        if shared is not None:
+            return await self._fetch_shared_async(shared, url, client)
+        backend = get_cache_backend()
+        if backend is None:
+            return await self._fetch_direct_async(url, client)
+
+        async def fill() -> bytes | None:
+            entries = await self._fetch_direct_async(url, client)
+            return encode_feed_entries(entries) if entries is not None else None
+
+        blob = await cached_fill_async(backend, f"feed:{url}", fill, get_settings().feed_cache_ttl)
+        try:
+            return decode_feed_entries(blob) if blob is not None else None
+        except CodecError:
+            return await self._fetch_direct_async(url, client)
+
+    async def _get_async(
+        self, url: str, headers: dict[str, str], client: httpx.AsyncClient
+    ) -> httpx.Response:
+        start = time.perf_counter()
+        try:
+            resp = await client.get(url, headers=headers, timeout=self.timeout_seconds)
+        except httpx.HTTPError:
+            record_feed_fetch(url, time.perf_counter() - start, None)
+            raise
+        record_feed_fetch(url, time.perf_counter() - start, resp.status_code, len(resp.content))
+        return resp
 
-        candidates: list[ArticleCandidate] = []
+    async def _fetch_direct_async(
+        self, url: str, client: httpx.AsyncClient
+    ) -> list[FeedEntry] | None:
+        try:
+            resp = await self._get_async(url, FETCH_HEADERS, client)
+            resp.raise_for_status()
+        except httpx.HTTPError as e:
+            logger.warning(f"Failed to fetch feed {url}: {e}")
+            return None
+        with time_stage("parse"):
+            return await run_offloaded_async(parse_feed_entries, resp.content)
+
+    async def _fetch_shared_async(
+        self, shared: SharedFeedCache, url: str, client: httpx.AsyncClient
+    ) -> list[FeedEntry] | None:
+        """
+        Async _fetch_shared; SQLite calls run on the CPU executor.
+        """
+        deadline = time.monotonic() + self.timeout_seconds
+        while True:
+            record = await run_cpu(shared.lookup, url)
+            if record is not None and record.is_fresh(shared.now(), shared.ttl_seconds):
+                return record.entries
+            token = await run_cpu(shared.try_acquire, url)
+            if token is not None:
+                break
+            if time.monotonic() >= deadline:
+                return record.entries if record else None
+            await asyncio.sleep(shared.poll_seconds)
+
+        stale = record.entries if record else None
+        headers = {**FETCH_HEADERS, **(record.conditional_headers() if record else {})}
+        try:
+            resp = await self._get_async(url, headers, client)
+            if resp.status_code == 304 and stale is not None:
+                await run_cpu(shared.touch, url, token)
+                return stale
+            resp.raise_for_status()
+        except httpx.HTTPError as e:
+            logger.warning(f"Failed to fetch feed {url}: {e}")
+            await run_cpu(shared.release, url, token)
+            return stale
+        try:
+            with time_stage("parse"):
+                entries = await run_offloaded_async(parse_feed_entries, resp.content)
+            await run_cpu(
+                shared.store,
+                url,
+                token,
+                entries,
+                resp.headers.get("ETag"),
+                resp.headers.get("Last-Modified"),
+            )
+        except BaseException:
+            # Otherwise every other worker waits out the lease for nothing.
+            # Called directly so the lease is freed even when cancelled.
+            shared.release(url, token)
+            raise
+        return entries
+
+    async def gather_async(
+        self,
+        publisher: Publisher,
+        feed_registry: RegistryFeed,
+        time_range: TimeRange,
+        client: httpx.AsyncClient,
+        now: datetime | None = None,
+    ) -> list[Article]:
+        """
+        Async gather over a shared httpx client; normalization runs on the
+        CPU executor.
+        """
+        entries = await self.fetch_feed_async(str(feed_registry.url), client)
+        if entries is None:
+            return []
+        return await run_cpu(
+            self.normalize_entries, publisher, feed_registry, entries, time_range, now
+        )
+
+    @timed_stage("normalize")
+    def normalize_entries(
+        self,
+        publisher: Publisher,
+        feed_registry: RegistryFeed,
+        entries: list[FeedEntry],
+        time_range: TimeRange,
+        now: datetime | None = None,
+    ) -> list[Article]:
+        """
+        Validates parsed entries into Articles, then applies the time-range
+        filter and URL dedupe.
+        """
+        candidates: list[Article] = []
         skipped_count = {
             "no_link": 0, "invalid_url": 0,
             "domain_not_allowed": 0, "validation_error": 0
         }
 
-        for entry in d.entries:
-            link = getattr(entry, "link", None)
+        for title, link, published_us, summary in entries:
             if not link:
                 skipped_count["no_link"] += 1
                 continue
@@ -160,22 +438,21 @@ class RSSGatherer:
                 logger.debug(f"Skipping URL from non-allowed domain: {link}")
                 continue
 
-            published_at = parse_rss_date(entry)
+            published_at = from_epoch_us(published_us) if published_us is not None else None
 
-            # Rule 3: Normalize into ArticleCandidate
+            # Rule 3: Normalize into Article
             try:
-                candidate = ArticleCandidate(
-                    title=getattr(entry, "title", "No Title"),
-                    url=HttpUrl(link),
+                candidate = Article(
+                    title=title if title is not None else "No Title",
+                    url=str(HttpUrl(link)),
                     publisher_name=publisher.name,
                     published_at=published_at,
                     topic=feed_registry.topic,
-                    summary=getattr(entry, "summary", None),
+                    summary=summary,
                 )
                 candidates.append(candidate)
             except ValidationError as e:
                 skipped_count["validation_error"] += 1
-                title = getattr(entry, 'title', 'No Title')
                 logger.debug(f"Validation error for entry '{title}': {e}")
                 continue
 
@@ -188,6 +465,9 @@ class RSSGatherer:
                 f"domain_not_allowed={skipped_count['domain_not_allowed']}, "
                 f"validation_error={skipped_count['validation_error']})"
             )
+            for reason, count in skipped_count.items():
+                if count:
+                    ENTRIES_SKIPPED.inc(reason, amount=count)
 
         # Rule 4: Time-range filtering
         candidates = filter_by_time_range(candidates, time_range, now=now)
@@ -1,11 +1,29 @@
 from __future__ import annotations
 
-import hashlib
-from datetime import UTC, datetime
+import asyncio
+import logging
+import sys
+import time
+from collections.abc import AsyncIterator, Callable, Iterable, Sequence
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from datetime import UTC, datetime, timedelta
+from functools import partial
 from pathlib import Path
 
+import httpx
 from pydantic import HttpUrl
 
+from app.cache.backends import CacheBackend, CacheBackendError, get_cache_backend
+from app.cache.fragments import get_fragment_cache
+from app.cache.keys import digest_request_key, normalize_request
+from app.cache.single_flight import AsyncSingleFlight, SingleFlight
+from app.cache.snapshots import SnapshotStore
+from app.core.admission import get_admission
+from app.core.config import get_settings
+from app.core.executors import get_cpu_executor, run_cpu
+from app.core.http import get_http_client
+from app.core.metrics import time_stage
 from app.core.schemas import (
     Bullet,
     Citation,
@@ -13,16 +31,39 @@ from app.core.schemas import (
     DigestCard,
     DigestRequest,
     DigestResponse,
+    DigestStreamFrame,
     QAStatus,
+    Region,
+    StreamCard,
+    StreamHeader,
+    StreamQA,
+    StreamRemove,
+    TimeRange,
     Topic,
 )
-from app.core.source_registry import get_feeds_for_request, load_source_registry
-from app.pipeline.cluster.title_cluster import cluster_by_title_similarity
-from app.pipeline.gather.models import ArticleCandidate
-from app.pipeline.gather.rss_gatherer import RSSGatherer
-from app.pipeline.verify.dedupe import deduplicate_candidates
+from app.core.source_registry import (
+    Feed,
+    Publisher,
+    get_feeds_for_request,
+    load_source_registry,
+)
+from app.pipeline.format.cards import build_card, cluster_id, cluster_version
+from app.pipeline.gather.models import Article, as_article
+from app.pipeline.gather.rss_gatherer import TIME_RANGE_DELTAS, RSSGatherer
+from app.pipeline.rank.ranker import ClusterSummary, select_top_clusters, summarize_cluster
+from app.pipeline.shards import (
+    ShardKey,
+    ShardPartial,
+    build_shard_partial,
+    build_shared_partial,
+    get_shard_cache,
+    merge_partials,
+    shard_cache_key,
+)
 from app.pipeline.verify.topic_tagger import tag_topics
-from app.pipeline.verify.verify_items import filter_by_topics
+from app.storage.corpus import ArticleCorpus, get_corpus
+
+logger = logging.getLogger(__name__)
 
 SOURCES_PATH = Path(__file__).parent.parent / "resources" / "sources.yaml"
 
@@ -45,154 +86,562 @@ def refine_topic(title: str, summary: str | None, original_topic: Topic) -> Topi
     return Topic.DAILY
 
 
+_digest_flight: SingleFlight[str, DigestResponse] = SingleFlight()
+_async_digest_flight: AsyncSingleFlight[str, DigestResponse] = AsyncSingleFlight()
+
+
+def get_digest_flight() -> SingleFlight[str, DigestResponse]:
+    return _digest_flight
+
+
+def get_async_digest_flight() -> AsyncSingleFlight[str, DigestResponse]:
+    return _async_digest_flight
+
+
 def build_digest(req: DigestRequest) -> DigestResponse:
+    """
+    Builds a digest, coalescing concurrent identical requests.
+
+    Requests with the same normalized key that arrive while a build is in
+    flight wait for it and share its response (with their own request
+    echoed back), so a burst of identical requests costs one build.
+    """
+    response = _digest_flight.do(
+        digest_request_key(req), lambda: _build_digest(normalize_request(req))
+    )
+    return _for_caller(response, req)
+
+
+async def build_digest_async(
+    req: DigestRequest, client: httpx.AsyncClient | None = None
+) -> DigestResponse:
+    """
+    Async build_digest for the API: feeds are fetched concurrently with
+    httpx and CPU-bound stages run on the CPU executor, so a build holds
+    no threadpool worker while it waits on the network. Concurrent
+    identical requests share one build, as in build_digest. Builds go
+    through admission control and raise Overloaded when it sheds them.
+    """
+    response = await _async_digest_flight.do(
+        digest_request_key(req), lambda: _admitted_build(normalize_request(req), client)
+    )
+    return _for_caller(response, req)
+
+
+async def _admitted_build(
+    req: DigestRequest, client: httpx.AsyncClient | None
+) -> DigestResponse:
+    # Only the shared build takes a slot; coalesced callers wait on it
+    async with get_admission().slot():
+        return await _build_digest_async(req, client)
+
+
+def _for_caller(response: DigestResponse, req: DigestRequest) -> DigestResponse:
+    if response.request == req:
+        return response
+    return response.model_copy(update={"request": req})
+
+
+def build_digests(reqs: Sequence[DigestRequest]) -> list[DigestResponse]:
+    """
+    Builds many digests with one shared gather, returned in input order.
+
+    The union of feeds the requests need is gathered once, each shard
+    (dedupe, tagging, clustering) is computed once, and only the
+    per-request merge, rank and card steps run per digest, in parallel on
+    the CPU executor. Identical requests are built once.
+    """
+    start = time.perf_counter()
+    now = datetime.now(UTC)
+    batch = _plan_batch(reqs)
+    corpus = get_corpus()
+    if batch.union.keys:
+        _ingest(_feeds_to_ingest(batch.union), batch.widest_range, corpus)
+    partials = _shard_partials(batch.union.keys, corpus, now)
+    built = dict(
+        zip(
+            batch.plans,
+            get_cpu_executor().map(
+                lambda key: _finish_planned(batch.requests[key], batch.plans[key], partials, now),
+                batch.plans,
+            ),
+            strict=True,
+        )
+    )
+    return _batch_results(reqs, built, start)
+
+
+async def build_digests_async(
+    reqs: Sequence[DigestRequest], client: httpx.AsyncClient | None = None
+) -> list[DigestResponse]:
+    """
+    Async build_digests: the shared gather fetches concurrently with httpx
+    and the per-request steps run concurrently on the CPU executor. The
+    whole batch takes one admission slot.
+    """
+    start = time.perf_counter()
+    now = datetime.now(UTC)
+    async with get_admission().slot():
+        batch = await run_cpu(_plan_batch, reqs)
+        corpus = get_corpus()
+        if batch.union.keys:
+            async with _http_client(client) as http:
+                await _ingest_async(_feeds_to_ingest(batch.union), batch.widest_range, corpus, http)
+        partials = await run_cpu(_shard_partials, batch.union.keys, corpus, now)
+        responses = await asyncio.gather(
+            *(
+                run_cpu(_finish_planned, batch.requests[key], plan, partials, now)
+                for key, plan in batch.plans.items()
+            )
+        )
+    return _batch_results(reqs, dict(zip(batch.plans, responses, strict=True)), start)
+
+
+def _batch_results(
+    reqs: Sequence[DigestRequest], built: dict[str, DigestResponse], start: float
+) -> list[DigestResponse]:
+    results = [_for_caller(built[digest_request_key(req)], req) for req in reqs]
+    elapsed = time.perf_counter() - start
+    logger.info(
+        "Built %d digests (%d unique) in %.0f ms, %.1f digests/s",
+        len(results),
+        len(built),
+        elapsed * 1000,
+        len(results) / elapsed if elapsed > 0 else float("inf"),
+    )
+    return results
+
+
+async def stream_digest(
+    req: DigestRequest,
+    client: httpx.AsyncClient | None = None,
+    on_complete: Callable[[DigestResponse], object] | None = None,
+) -> AsyncIterator[DigestStreamFrame]:
+    """
+    Streams a digest as feeds arrive instead of after the slowest one.
+
+    Frames: a header, then "card" frames as stories enter the top cards,
+    "update" frames when a sent card's cluster grows (or its lead changes)
+    as slower feeds merge in, "remove" frames for cards pushed out, and a
+    final "qa" frame with the QA status and final card order. Provisional
+    rounds never touch the shard cache; the final round is the regular
+    build, whose response is passed to `on_complete` (e.g. for caching).
+    The stream holds an admission slot from the header on, so Overloaded
+    is raised before the first frame.
+    """
+    now = datetime.now(UTC)
+    norm = normalize_request(req)
+    plan = await run_cpu(_plan_shards, norm)
+    if isinstance(plan, DigestResponse):
+        for frame in stream_frames(_for_caller(plan, req)):
+            yield frame
+        return
+
+    feeds = _feeds_to_ingest(plan)
+    corpus = get_corpus()
+    tracker = CardTracker()
+    async with get_admission().slot():
+        yield StreamHeader(generated_at=now, request=req, pending_feeds=len(feeds))
+
+        if feeds:
+            gatherer = RSSGatherer()
+            async with _http_client(client) as http:
+                tasks = {
+                    asyncio.ensure_future(
+                        _gather_safely(gatherer, pub, feed, norm.range, http)
+                    ): region
+                    for region, pub, feed in feeds
+                }
+                pending = set(tasks)
+                try:
+                    while pending:
+                        done, pending = await asyncio.wait(
+                            pending, return_when=asyncio.FIRST_COMPLETED
+                        )
+                        for task in done:
+                            await run_cpu(_upsert, corpus, task.result(), tasks[task])
+                        if pending:
+                            cards = await run_cpu(_provisional_cards, norm, plan, corpus, now)
+                            for frame in tracker.update(cards):
+                                yield frame
+                finally:
+                    for task in pending:
+                        task.cancel()
+
+        response = _for_caller(await run_cpu(_assemble, norm, plan, corpus, now), req)
+    if on_complete is not None:
+        on_complete(response)
+    for frame in tracker.update(response.cards):
+        yield frame
+    yield StreamQA(
+        qa_status=response.qa_status,
+        qa_notes=response.qa_notes,
+        card_ids=[c.id for c in response.cards],
+    )
+
+
+def stream_frames(response: DigestResponse) -> list[DigestStreamFrame]:
+    """
+    A finished digest (cached or mock) as stream frames.
+    """
+    frames: list[DigestStreamFrame] = [
+        StreamHeader(
+            schema_version=response.schema_version,
+            generated_at=response.generated_at,
+            request=response.request,
+        )
+    ]
+    frames.extend(CardTracker().update(response.cards))
+    frames.append(
+        StreamQA(
+            qa_status=response.qa_status,
+            qa_notes=response.qa_notes,
+            card_ids=[c.id for c in response.cards],
+        )
+    )
+    return frames
+
+
+class CardTracker:
+    """
+    Diffs successive card lists of a stream. A new card that shares a
+    source URL with a sent card is the same story, revised.
+    """
+
+    def __init__(self) -> None:
+        self._sent: dict[str, tuple[DigestCard, frozenset[str]]] = {}
+
+    def update(self, cards: list[DigestCard]) -> list[DigestStreamFrame]:
+        unmatched = dict(self._sent)
+        sent: dict[str, tuple[DigestCard, frozenset[str]]] = {}
+        changes: list[DigestStreamFrame] = []
+        for rank, card in enumerate(cards):
+            urls = frozenset(str(s.url) for s in card.sources or [])
+            previous = next((cid for cid, (_, u) in unmatched.items() if u & urls), None)
+            if previous is None:
+                changes.append(StreamCard(type="card", rank=rank, card=card))
+            else:
+                old, _ = unmatched.pop(previous)
+                if old != card:
+                    changes.append(
+                        StreamCard(type="update", rank=rank, card=card, replaces=previous)
+                    )
+            sent[card.id] = (card, urls)
+        self._sent = sent
+        removed: list[DigestStreamFrame] = [StreamRemove(id=cid) for cid in unmatched]
+        return removed + changes
+
+
+def _provisional_cards(
+    req: DigestRequest, plan: _ShardPlan, corpus: ArticleCorpus, now: datetime
+) -> list[DigestCard]:
+    """
+    Top cards from what has been ingested so far. Missing shards are built
+    without caching them, since their feeds are still arriving.
+    """
+    shard_cache = get_shard_cache()
+    partials = [shard_cache.get(key) or build_shard_partial(key, corpus, now) for key in plan.keys]
+    if not any(p.window_size for p in partials):
+        return []
+    return _digest_from_partials(req, partials, now).cards
+
+
+def _build_digest(req: DigestRequest) -> DigestResponse:
     """
     Day 3 Implementation:
     Gather real news, refine topics, cluster related stories, and rank.
     """
     now = datetime.now(UTC)
 
-    # 1. Load Source Registry
-    registry = load_source_registry(SOURCES_PATH)
-    matches = get_feeds_for_request(registry, req.regions, req.topics)
+    plan = _plan_shards(req)
+    if isinstance(plan, DigestResponse):
+        return plan
+
+    corpus = get_corpus()
+    _ingest(_feeds_to_ingest(plan), req.range, corpus)
+    return _assemble(req, plan, corpus, now)
+
+
+async def _build_digest_async(
+    req: DigestRequest, client: httpx.AsyncClient | None
+) -> DigestResponse:
+    now = datetime.now(UTC)
+
+    plan = await run_cpu(_plan_shards, req)
+    if isinstance(plan, DigestResponse):
+        return plan
+
+    corpus = get_corpus()
+    async with _http_client(client) as http:
+        await _ingest_async(_feeds_to_ingest(plan), req.range, corpus, http)
+    return await run_cpu(_assemble, req, plan, corpus, now)
+
+
+@asynccontextmanager
+async def _http_client(client: httpx.AsyncClient | None) -> AsyncIterator[httpx.AsyncClient]:
+    """
+    The caller's client, or the process-wide one. Neither is closed here:
+    feed fetches are shared between builds, so a build must not close the
+    client a fetch it started is still using.
+    """
+    yield client if client is not None else get_http_client()
+
+
+@dataclass(slots=True)
+class _ShardPlan:
+    keys: list[ShardKey]
+    feeds_by_key: dict[ShardKey, list[tuple[Publisher, Feed]]]
+
+
+@dataclass(slots=True)
+class _BatchPlan:
+    """
+    Plans for the unique requests of a batch (by normalized key) and the
+    union of their shards.
+    """
+
+    requests: dict[str, DigestRequest]
+    plans: dict[str, _ShardPlan | DigestResponse]
+    union: _ShardPlan
+    widest_range: TimeRange
+
+
+def _plan_shards(
+    req: DigestRequest,
+    resolved: dict[ShardKey, list[tuple[Publisher, Feed]]] | None = None,
+) -> _ShardPlan | DigestResponse:
+    """
+    Resolves feeds per (region, topic) shard, or returns the mock digest
+    when no feeds are configured. `resolved` memoizes feeds per shard
+    across the requests of a batch.
+    """
+    # 1. Load Source Registry and resolve feeds per (region, topic) shard
+    keys: list[ShardKey] = [
+        (region, topic, req.range) for topic in req.topics for region in req.regions
+    ]
+    if resolved is None:
+        resolved = {}
+    unresolved = [key for key in keys if key not in resolved]
+    if unresolved:
+        with time_stage("registry_load"):
+            registry = load_source_registry(SOURCES_PATH)
+        for key in unresolved:
+            resolved[key] = get_feeds_for_request(registry, [key[0]], [key[1]])
+    feeds_by_key = {key: resolved[key] for key in keys}
 
     # 2. If no feeds found, return mock
-    if not matches:
+    if not any(feeds_by_key.values()):
         return build_mock_digest(
             req, notes=["No feeds configured for these regions/topics. Showing mock demo data."]
         )
+    return _ShardPlan(keys=keys, feeds_by_key=feeds_by_key)
+
+
+def _plan_batch(reqs: Sequence[DigestRequest]) -> _BatchPlan:
+    requests: dict[str, DigestRequest] = {}
+    plans: dict[str, _ShardPlan | DigestResponse] = {}
+    resolved: dict[ShardKey, list[tuple[Publisher, Feed]]] = {}
+    union = _ShardPlan(keys=[], feeds_by_key={})
+    widest_range = TimeRange.H24
+    for req in reqs:
+        key = digest_request_key(req)
+        if key in plans:
+            continue
+        requests[key] = normalize_request(req)
+        plan = plans[key] = _plan_shards(requests[key], resolved)
+        if isinstance(plan, DigestResponse):
+            continue
+        if TIME_RANGE_DELTAS[req.range] > TIME_RANGE_DELTAS[widest_range]:
+            widest_range = req.range
+        for shard in plan.keys:
+            if shard not in union.feeds_by_key:
+                union.keys.append(shard)
+                union.feeds_by_key[shard] = plan.feeds_by_key[shard]
+    return _BatchPlan(requests, plans, union, widest_range)
+
+
+def _feeds_to_ingest(plan: _ShardPlan) -> list[tuple[Region, Publisher, Feed]]:
+    """
+    3. Feeds to gather into the corpus: only for shards that are not cached
+    (locally or in the shared backend), and each feed once per region even
+    when several shards share it.
+    """
+    missing = get_shard_cache().missing(plan.keys)
+    backend = _shard_backend()
+    if backend is not None and missing:
+        try:
+            missing = [k for k in missing if backend.remaining_ttl(shard_cache_key(k)) is None]
+        except CacheBackendError:
+            pass
+    seen: set[tuple[Region, str]] = set()
+    feeds: list[tuple[Region, Publisher, Feed]] = []
+    for key in missing:
+        region = key[0]
+        for pub, feed in plan.feeds_by_key[key]:
+            if (region, str(feed.url)) not in seen:
+                seen.add((region, str(feed.url)))
+                feeds.append((region, pub, feed))
+    return feeds
+
+
+def _shard_backend() -> CacheBackend | None:
+    """
+    The shared cache backend for shard partials, unless shard caching is off.
+    """
+    if get_settings().shard_ttl_seconds <= 0:
+        return None
+    return get_cache_backend()
 
-    # 3. Gather real data
+
+def _ingest(
+    feeds: list[tuple[Region, Publisher, Feed]], range_enum: TimeRange, corpus: ArticleCorpus
+) -> None:
+    """
+    Gathers feeds and upserts them into the corpus. Failing feeds are skipped.
+    """
     gatherer = RSSGatherer()
-    all_candidates = []
-    for pub, feed in matches:
+    gathered_by_region: dict[Region, list[Article]] = {}
+    for region, pub, feed in feeds:
+        gathered = gathered_by_region.setdefault(region, [])
         try:
-            candidates = gatherer.gather(pub, feed, req.range)
-            all_candidates.extend(candidates)
+            candidates = gatherer.gather(pub, feed, range_enum)
+            gathered.extend(as_article(c) for c in candidates)
         except Exception:
             continue
+    for region, gathered in gathered_by_region.items():
+        _upsert(corpus, gathered, region)
 
-    # 4. If no articles found, return mock with note
-    if not all_candidates:
-        return build_mock_digest(
-            req, notes=["No recent articles found in feeds. Showing mock demo data."]
-        )
 
-    # Global deduplication across all gathered items using canonical URLs
-    unique_candidates = deduplicate_candidates(all_candidates)
+async def _ingest_async(
+    feeds: list[tuple[Region, Publisher, Feed]],
+    range_enum: TimeRange,
+    corpus: ArticleCorpus,
+    client: httpx.AsyncClient,
+) -> None:
+    """
+    _ingest with all feeds fetched concurrently.
+    """
+    gatherer = RSSGatherer()
+    results = await asyncio.gather(
+        *(_gather_safely(gatherer, pub, feed, range_enum, client) for _, pub, feed in feeds)
+    )
+    gathered_by_region: dict[Region, list[Article]] = {}
+    for (region, _, _), gathered in zip(feeds, results, strict=True):
+        gathered_by_region.setdefault(region, []).extend(gathered)
+    for region, gathered in gathered_by_region.items():
+        await run_cpu(_upsert, corpus, gathered, region)
+
 
-    # 5. Refine Topics and Filter by requested topics
-    refined_candidates = filter_by_topics(unique_candidates, req.topics)
+IngestListener = Callable[[Region, set[Topic]], None]
+_ingest_listeners: list[IngestListener] = []
 
-    # 6. Clustering related stories
-    # Use deterministic Jaccard-based clustering
-    clusters_members = cluster_by_title_similarity(refined_candidates)
 
-    # 7. Convert Clusters to DigestCards and Apply Constraints
-    cards: list[DigestCard] = []
-    topic_counts: dict[Topic, int] = {}
-
-    for members in clusters_members:
-        if len(cards) >= req.max_cards:
-            break
-            
-        # Select primary (latest date, then longest summary)
-        def get_sort_key(c: ArticleCandidate):
-            pub_date = c.published_at or datetime.min.replace(tzinfo=UTC)
-            summary_len = len(c.summary) if c.summary else 0
-            return (pub_date, summary_len)
-            
-        primary = max(members, key=get_sort_key)
-        
-        t = primary.topic
-        count = topic_counts.get(t, 0)
-        if count >= req.max_cards_per_topic:
-            continue
+def add_ingest_listener(listener: IngestListener) -> None:
+    """
+    Calls `listener(region, topics)`, from whichever thread ingested, each
+    time an ingest adds articles to the corpus for that region.
+    """
+    _ingest_listeners.append(listener)
 
-        # Combine unique citations across all members
-        unique_citations: list[Citation] = []
-        seen_urls = set()
-        seen_publishers = set()
-        
-        for m in members:
-            if str(m.url) not in seen_urls:
-                cit = Citation(
-                    publisher=m.publisher_name, 
-                    url=m.url, 
-                    published_at=m.published_at
-                )
-                unique_citations.append(cit)
-                seen_urls.add(str(m.url))
-                seen_publishers.add(m.publisher_name)
-
-        # Multi-source if more than one distinct publisher
-        confidence = (
-            ConfidenceTag.MULTI_SOURCE if len(seen_publishers) >= 2
-            else ConfidenceTag.SINGLE_SOURCE
-        )
 
-        # Simple ID generation from primary URL
-        cid = hashlib.md5(str(primary.url).encode()).hexdigest()[:12]
-
-        # Bullet generation: 1-3 bullets based on what's available
-        bullets: list[Bullet] = []
-        
-        # 1st bullet from primary summary
-        primary_text = "Headline summary from source."
-        if primary.summary:
-            clean_summary = primary.summary.split("<")[0].strip()
-            if clean_summary:
-                primary_text = clean_summary[:230]
-        
-        bullets.append(Bullet(text=primary_text, citations=[unique_citations[0]]))
-
-        # Add up to 2 more bullets if there are other members with summaries
-        for m in members:
-            if len(bullets) >= 3:
-                break
-            if m == primary:
-                continue
-            
-            if m.summary:
-                m_text = m.summary.split("<")[0].strip()
-                if m_text and m_text[:200] not in [b.text[:200] for b in bullets]:
-                    # Find citation for this member
-                    m_cit = next(
-                        (c for c in unique_citations if str(c.url) == str(m.url)),
-                        unique_citations[0],
-                    )
-                    bullets.append(Bullet(text=m_text[:230], citations=[m_cit]))
-
-        cards.append(
-            DigestCard(
-                id=f"rss-{cid}",
-                topic=t,
-                headline=primary.title[:155],
-                publisher=primary.publisher_name,
-                published_at=primary.published_at or now,
-                confidence=confidence,
-                bullets=bullets,
-                sources=unique_citations,
-            )
+def _upsert(corpus: ArticleCorpus, articles: list[Article], region: Region) -> None:
+    if not corpus.upsert_many(articles, region):
+        return
+    topics = {a.topic for a in articles}
+    # Before listeners rebuild: cached shards would hide the new articles
+    # and keep _feeds_to_ingest from fetching them again
+    _invalidate_shards(region, topics)
+    for listener in _ingest_listeners:
+        try:
+            listener(region, topics)
+        except Exception:
+            logger.exception("Ingest listener failed")
+
+
+def _invalidate_shards(region: Region, topics: set[Topic]) -> None:
+    """
+    Drops the cached shards of `region` that could contain articles of
+    `topics`, for every range. DAILY articles are every shard's fallback.
+    """
+    shard_topics = set(Topic) if Topic.DAILY in topics else topics
+    keys = [(region, t, r) for t in shard_topics for r in TimeRange]
+    get_shard_cache().discard(keys)
+    backend = _shard_backend()
+    if backend is None:
+        return
+    try:
+        for key in keys:
+            backend.delete(shard_cache_key(key))
+    except CacheBackendError as e:
+        logger.warning("Cache backend unavailable for shard invalidation: %s", e)
+
+
+async def _gather_safely(
+    gatherer: RSSGatherer,
+    pub: Publisher,
+    feed: Feed,
+    range_enum: TimeRange,
+    client: httpx.AsyncClient,
+) -> list[Article]:
+    try:
+        return await gatherer.gather_async(pub, feed, range_enum, client)
+    except Exception:
+        return []
+
+
+def _assemble(
+    req: DigestRequest, plan: _ShardPlan, corpus: ArticleCorpus, now: datetime
+) -> DigestResponse:
+    """
+    Everything after ingestion: shard partials, merge, rank, cards and QA.
+    """
+    partials = _shard_partials(plan.keys, corpus, now)
+    return _digest_from_partials(req, [partials[key] for key in plan.keys], now)
+
+
+def _shard_partials(
+    keys: list[ShardKey], corpus: ArticleCorpus, now: datetime
+) -> dict[ShardKey, ShardPartial]:
+    corpus.prune_if_due(now, timedelta(days=get_settings().article_retention_days))
+
+    # 4. Compute (or reuse) each shard's deduped, clustered partial
+    shard_cache = get_shard_cache()
+    backend = _shard_backend()
+    return {
+        key: shard_cache.get_or_build(
+            key,
+            partial(build_shard_partial, key, corpus, now)
+            if backend is None
+            else partial(build_shared_partial, key, corpus, now, backend),
         )
-        topic_counts[t] = count + 1
+        for key in keys
+    }
 
-    # Final Ranking: Multi-source first, then by date
-    cards.sort(
-        key=lambda x: (x.confidence == ConfidenceTag.MULTI_SOURCE, x.published_at),
-        reverse=True
-    )
 
-    # 8. QA Final Gate
-    # Ensure all cards have citations and meet basic quality
-    final_cards = []
-    for card in cards:
-        if not card.bullets or not card.sources:
-            continue
-        # Every bullet must have at least one citation
-        if any(not b.citations for b in card.bullets):
-            continue
-        final_cards.append(card)
+def _finish_planned(
+    req: DigestRequest,
+    plan: _ShardPlan | DigestResponse,
+    partials: dict[ShardKey, ShardPartial],
+    now: datetime,
+) -> DigestResponse:
+    if isinstance(plan, DigestResponse):
+        return plan
+    return _digest_from_partials(req, [partials[key] for key in plan.keys], now)
+
+
+def _digest_from_partials(
+    req: DigestRequest, partials: list[ShardPartial], now: datetime
+) -> DigestResponse:
+    """
+    The per-request steps: merge shards, rank, build cards and run QA.
+    """
+    if not any(p.window_size for p in partials):
+        return build_mock_digest(
+            req, notes=["No recent articles found in feeds. Showing mock demo data."]
+        )
+
+    winners = _rank(req, partials, now, req.max_cards, req.max_cards_per_topic)
+    final_cards = qa_cards(winners)
 
     qa_status = QAStatus.PASS if final_cards else QAStatus.FAIL
     qa_notes = ["Successfully gathered, refined, and clustered news from RSS."]
@@ -208,6 +657,123 @@ def build_digest(req: DigestRequest) -> DigestResponse:
     )
 
 
+def _rank(
+    req: DigestRequest,
+    partials: list[ShardPartial],
+    now: datetime,
+    max_cards: int,
+    max_cards_per_topic: int,
+) -> list[ClusterSummary]:
+    with time_stage("rank"):
+        # 5-6. Merge shards: cross-shard dedupe, topic fallback, cross-region clusters
+        clusters_members = merge_partials(
+            partials, req.topics, now - TIME_RANGE_DELTAS[req.range], req.publishers
+        )
+
+        # 7. Rank lightweight cluster summaries; cards are only built for winners
+        summaries = [
+            summarize_cluster(members, now, order=i) for i, members in enumerate(clusters_members)
+        ]
+        return select_top_clusters(summaries, max_cards, max_cards_per_topic)
+
+
+def qa_cards(summaries: Iterable[ClusterSummary]) -> list[DigestCard]:
+    """
+    Builds cards for ranked summaries and applies the QA gate. Unchanged
+    clusters reuse the card (and its serialized JSON) of earlier digests.
+    """
+    # 8. QA Final Gate
+    # Ensure all cards have citations and meet basic quality
+    fragments = get_fragment_cache()
+    with time_stage("card_build"):
+        cards = [
+            fragments.card((cluster_id(s.members), cluster_version(s)), partial(build_card, s))
+            for s in summaries
+        ]
+    final_cards = []
+    with time_stage("qa_gate"):
+        for card in cards:
+            if not card.bullets or not card.sources:
+                continue
+            # Every bullet must have at least one citation
+            if any(not b.citations for b in card.bullets):
+                continue
+            final_cards.append(card)
+    return final_cards
+
+
+@dataclass(slots=True)
+class RankedDigest:
+    """
+    A digest's whole ranked cluster list, before any cards are built.
+    `fallback` holds the mock digest when there was nothing to rank.
+    """
+
+    request: DigestRequest
+    generated_at: datetime
+    summaries: list[ClusterSummary]
+    fallback: DigestResponse | None = None
+
+
+_snapshot_store: SnapshotStore[RankedDigest] = SnapshotStore.from_settings(get_settings())
+
+
+def get_snapshot_store() -> SnapshotStore[RankedDigest]:
+    return _snapshot_store
+
+
+async def rank_digest_async(
+    req: DigestRequest, client: httpx.AsyncClient | None = None
+) -> RankedDigest:
+    """
+    build_digest_async up to ranking, over every cluster: no max_cards or
+    per-topic cap, and no cards built. Pagination slices the result.
+    """
+    now = datetime.now(UTC)
+    norm = normalize_request(req)
+    plan = await run_cpu(_plan_shards, norm)
+    if isinstance(plan, DigestResponse):
+        return RankedDigest(norm, plan.generated_at, [], fallback=plan)
+
+    corpus = get_corpus()
+    async with get_admission().slot():
+        async with _http_client(client) as http:
+            await _ingest_async(_feeds_to_ingest(plan), norm.range, corpus, http)
+        return await run_cpu(_rank_all, norm, plan, corpus, now)
+
+
+def _rank_all(
+    req: DigestRequest, plan: _ShardPlan, corpus: ArticleCorpus, now: datetime
+) -> RankedDigest:
+    partials = _shard_partials(plan.keys, corpus, now)
+    shard_partials = [partials[key] for key in plan.keys]
+    if not any(p.window_size for p in shard_partials):
+        return RankedDigest(req, now, [], fallback=_digest_from_partials(req, shard_partials, now))
+    summaries = _rank(req, shard_partials, now, sys.maxsize, sys.maxsize)
+    return RankedDigest(req, now, summaries)
+
+
+def page_cards(
+    ranked: RankedDigest, offset: int, limit: int
+) -> tuple[list[DigestCard], int | None]:
+    """
+    Cards for up to `limit` ranked clusters from `offset` (skipping any
+    that fail QA), and the offset of the next page, or None at the end.
+    """
+    if ranked.fallback is not None:
+        mock_cards = ranked.fallback.cards
+        end = offset + limit
+        return mock_cards[offset:end], end if end < len(mock_cards) else None
+
+    cards: list[DigestCard] = []
+    position = offset
+    while len(cards) < limit and position < len(ranked.summaries):
+        take = ranked.summaries[position : position + limit - len(cards)]
+        cards.extend(qa_cards(take))
+        position += len(take)
+    return cards, position if position < len(ranked.summaries) else None
+
+
 def build_mock_digest(req: DigestRequest, notes: list[str] | None = None) -> DigestResponse:
     """
     Fallback mock implementation.
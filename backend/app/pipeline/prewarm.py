@@ -0,0 +1,205 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import math
+import threading
+import time
+from collections.abc import Callable
+
+from app.cache.digest_cache import AsyncDigestBuilder, DigestCache, get_digest_cache
+from app.cache.keys import digest_request_key, normalize_request
+from app.core.admission import Overloaded
+from app.core.config import Settings, get_settings
+from app.core.schemas import DigestRequest
+from app.pipeline.orchestrator import build_digest_async
+
+logger = logging.getLogger(__name__)
+
+
+class DecayingCounter:
+    """
+    Exponentially decaying request counts per normalized request key.
+
+    A hit adds 1 to a key's score and scores halve every `half_life_seconds`,
+    so `top()` tracks what is popular now rather than since startup. Only
+    the `max_keys` highest scores are kept.
+    """
+
+    def __init__(
+        self,
+        half_life_seconds: float = 600.0,
+        max_keys: int = 1000,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.half_life_seconds = half_life_seconds
+        self.max_keys = max_keys
+        self._clock = clock
+        self._lock = threading.Lock()
+        # key -> (score at last update, last update time, normalized request)
+        self._scores: dict[str, tuple[float, float, DigestRequest]] = {}
+
+    def record(self, req: DigestRequest) -> None:
+        key = digest_request_key(req)
+        now = self._clock()
+        with self._lock:
+            entry = self._scores.get(key)
+            if entry is None:
+                self._scores[key] = (1.0, now, normalize_request(req))
+                if len(self._scores) > self.max_keys:
+                    self._evict(now)
+            else:
+                score, last, norm = entry
+                self._scores[key] = (self._decay(score, now - last) + 1.0, now, norm)
+
+    def score(self, req: DigestRequest) -> float:
+        now = self._clock()
+        with self._lock:
+            entry = self._scores.get(digest_request_key(req))
+            return 0.0 if entry is None else self._decay(entry[0], now - entry[1])
+
+    def top(self, n: int) -> list[tuple[DigestRequest, float]]:
+        """
+        Returns up to `n` normalized requests with their current scores, highest first.
+        """
+        now = self._clock()
+        with self._lock:
+            ranked = sorted(
+                (
+                    (norm, self._decay(score, now - last))
+                    for score, last, norm in self._scores.values()
+                ),
+                key=lambda item: item[1],
+                reverse=True,
+            )
+        return ranked[:n]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._scores.clear()
+
+    def __len__(self) -> int:
+        return len(self._scores)
+
+    def _decay(self, score: float, elapsed: float) -> float:
+        if self.half_life_seconds <= 0:
+            return score
+        return score * math.pow(0.5, elapsed / self.half_life_seconds)
+
+    def _evict(self, now: float) -> None:
+        ranked = sorted(
+            self._scores, key=lambda k: self._decay(self._scores[k][0], now - self._scores[k][1])
+        )
+        for key in ranked[: len(self._scores) - self.max_keys]:
+            del self._scores[key]
+
+
+class Prewarmer:
+    """
+    Keeps the most popular digests built ahead of demand.
+
+    Every `interval_seconds` a background task on the app's event loop
+    takes the `top_n` keys from the counter and rebuilds each one that is
+    missing from the digest cache or would expire before the next cycle.
+    Builds go through the same coalescing and admission control as
+    /digest, so a prewarm and a request for one key share a build, and a
+    cycle stops as soon as a build is shed. A cycle also stops early once
+    its builds have used `cpu_budget` (a fraction of one core) of the
+    interval in process CPU time (which counts any request work running
+    meanwhile), so prewarming cannot starve request handling.
+    """
+
+    def __init__(
+        self,
+        cache: DigestCache,
+        build: AsyncDigestBuilder,
+        counter: DecayingCounter | None = None,
+        top_n: int = 10,
+        interval_seconds: float = 15.0,
+        cpu_budget: float = 0.25,
+        cpu_clock: Callable[[], float] = time.process_time,
+    ):
+        self.cache = cache
+        self.build = build
+        self.counter = counter or DecayingCounter()
+        self.top_n = top_n
+        self.interval_seconds = interval_seconds
+        self.cpu_budget = cpu_budget
+        self._cpu_clock = cpu_clock
+        self._task: asyncio.Task[None] | None = None
+        self.builds = 0
+        self.budget_exhausted = 0
+
+    @classmethod
+    def from_settings(
+        cls, settings: Settings, cache: DigestCache, build: AsyncDigestBuilder
+    ) -> Prewarmer:
+        return cls(
+            cache,
+            build,
+            counter=DecayingCounter(half_life_seconds=settings.prewarm_half_life_seconds),
+            top_n=settings.prewarm_top_n,
+            interval_seconds=settings.prewarm_interval_seconds,
+            cpu_budget=settings.prewarm_cpu_budget,
+        )
+
+    def record(self, req: DigestRequest) -> None:
+        self.counter.record(req)
+
+    async def run_once(self) -> int:
+        """
+        Runs one prewarm cycle and returns how many digests were built.
+        """
+        budget = self.cpu_budget * self.interval_seconds
+        used = 0.0
+        built = 0
+        for req, _ in self.counter.top(self.top_n):
+            if self.cache.ttl_by_range.get(req.range, 0.0) <= 0:
+                continue
+            expires_in = self.cache.expires_in(req)
+            if expires_in is not None and expires_in > self.interval_seconds:
+                continue
+            if used >= budget:
+                self.budget_exhausted += 1
+                break
+            start = self._cpu_clock()
+            try:
+                self.cache.put(req, await self.build(req))
+                built += 1
+            except Overloaded:
+                # Requests need the build slots more than the cache does
+                break
+            except Exception:
+                logger.exception("Prewarm build failed for %s", digest_request_key(req))
+            used += self._cpu_clock() - start
+        self.builds += built
+        return built
+
+    def start(self) -> None:
+        """
+        Starts the prewarm loop on the running event loop.
+        """
+        if self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self._loop())
+
+    async def stop(self) -> None:
+        task, self._task = self._task, None
+        if task is not None:
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+
+    async def _loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval_seconds)
+            await self.run_once()
+
+
+_prewarmer = Prewarmer.from_settings(get_settings(), get_digest_cache(), build_digest_async)
+
+
+def get_prewarmer() -> Prewarmer:
+    """
+    Process-wide prewarmer. Requests are always recorded; the background
+    task only runs when NEWS_AGENT_PREWARM is enabled (see app.main).
+    """
+    return _prewarmer
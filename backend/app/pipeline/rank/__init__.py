@@ -0,0 +1 @@
+# Rank stage: cluster scoring and top-k selection
@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+import heapq
+from dataclasses import dataclass
+from datetime import UTC, datetime
+
+from app.core.schemas import Topic
+from app.pipeline.gather.models import Article
+
+_MIN_DATE = datetime.min.replace(tzinfo=UTC)
+
+
+@dataclass(slots=True)
+class ClusterSummary:
+    """
+    Lightweight view of a cluster used for ranking.
+    Cards are only built for the summaries that win a slot.
+    """
+
+    members: list[Article]
+    primary: Article
+    topic: Topic
+    publisher_count: int
+    published_at: datetime
+    order: int = 0
+
+    @property
+    def multi_source(self) -> bool:
+        return self.publisher_count >= 2
+
+
+def select_primary(members: list[Article]) -> Article:
+    """
+    Selects the primary article of a cluster (latest date, then longest summary).
+    """
+
+    def sort_key(c: Article) -> tuple[datetime, int]:
+        pub_date = c.published_at or _MIN_DATE
+        summary_len = len(c.summary) if c.summary else 0
+        return (pub_date, summary_len)
+
+    return max(members, key=sort_key)
+
+
+def summarize_cluster(
+    members: list[Article], now: datetime, order: int = 0
+) -> ClusterSummary:
+    """
+    Builds a ClusterSummary without touching any pydantic models.
+    """
+    primary = select_primary(members)
+    return ClusterSummary(
+        members=members,
+        primary=primary,
+        topic=primary.topic,
+        publisher_count=len({m.publisher_name for m in members}),
+        published_at=primary.published_at or now,
+        order=order,
+    )
+
+
+def rank_key(summary: ClusterSummary) -> tuple[bool, datetime, int]:
+    """
+    Multi-source first, then newest. Ties keep clustering order.
+    """
+    return (summary.multi_source, summary.published_at, -summary.order)
+
+
+def select_top_clusters(
+    summaries: list[ClusterSummary], max_cards: int, max_cards_per_topic: int
+) -> list[ClusterSummary]:
+    """
+    Returns the best `max_cards` summaries in rank order, with at most
+    `max_cards_per_topic` per topic.
+
+    Taking the top-q of every topic and then the top-k of that union is
+    equivalent to walking the full ranking with per-topic counters, but
+    runs in O(n log q) and never sorts the whole input.
+    """
+    by_topic: dict[Topic, list[ClusterSummary]] = {}
+    for s in summaries:
+        by_topic.setdefault(s.topic, []).append(s)
+
+    eligible: list[ClusterSummary] = []
+    for group in by_topic.values():
+        eligible.extend(heapq.nlargest(max_cards_per_topic, group, key=rank_key))
+
+    return heapq.nlargest(max_cards, eligible, key=rank_key)
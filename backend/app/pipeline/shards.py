@@ -0,0 +1,252 @@
+from __future__ import annotations
+
+import struct
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+from datetime import UTC, datetime
+
+from app.cache.backends import CacheBackend, cached_fill
+from app.cache.codec import CodecError, decode_articles, encode_articles
+from app.cache.ttl_cache import TTLCache
+from app.core.config import get_settings
+from app.core.metrics import CLUSTER_SIZE, DEDUPE_COLLAPSE, time_stage
+from app.core.schemas import Region, TimeRange, Topic
+from app.core.timeutil import from_epoch_us, to_epoch_us
+from app.pipeline.batch import (
+    ArticleBatch,
+    deduplicate_batch,
+    filter_batch_by_topics,
+)
+from app.pipeline.cluster.title_cluster import (
+    cluster_by_title_similarity,
+    jaccard,
+    tokenize_title,
+)
+from app.pipeline.gather.models import Article
+from app.pipeline.gather.rss_gatherer import TIME_RANGE_DELTAS
+from app.storage.corpus import ArticleCorpus
+
+ShardKey = tuple[Region, Topic, TimeRange]
+
+_EPOCH_MIN = datetime.min.replace(tzinfo=UTC)
+
+
+@dataclass(slots=True)
+class ShardPartial:
+    """
+    Everything one (region, topic, range) slice contributes to a digest.
+
+    `candidates` are deduped articles tagged with the shard topic and
+    `clusters` groups them by title. `fallback` keeps the DAILY-tagged
+    articles for requests where no requested topic matched anything.
+    """
+
+    key: ShardKey
+    built_at: datetime
+    window_size: int
+    candidates: list[Article] = field(default_factory=list)
+    clusters: list[list[Article]] = field(default_factory=list)
+    fallback: list[Article] = field(default_factory=list)
+
+
+def build_shard_partial(key: ShardKey, corpus: ArticleCorpus, now: datetime) -> ShardPartial:
+    """
+    Computes a shard from the corpus window (the corpus must already be ingested).
+    """
+    region, topic, range_enum = key
+    window = corpus.query_window(
+        now - TIME_RANGE_DELTAS[range_enum], [region], {topic, Topic.DAILY}
+    )
+    with time_stage("dedupe"):
+        batch = deduplicate_batch(ArticleBatch.from_articles(window))
+    if window:
+        DEDUPE_COLLAPSE.observe(1 - len(batch) / len(window))
+
+    # Tags are computed lazily by the first topic filter
+    with time_stage("tag_filter"):
+        candidates = filter_batch_by_topics(batch, [topic], daily_fallback=False).to_articles()
+        fallback: list[Article] = []
+        if topic != Topic.DAILY:
+            fallback = filter_batch_by_topics(
+                batch, [Topic.DAILY], daily_fallback=False
+            ).to_articles()
+
+    with time_stage("cluster"):
+        clusters = cluster_by_title_similarity(candidates)
+    for cluster in clusters:
+        CLUSTER_SIZE.observe(len(cluster))
+
+    return ShardPartial(
+        key=key,
+        built_at=now,
+        window_size=len(window),
+        candidates=candidates,
+        clusters=clusters,
+        fallback=fallback,
+    )
+
+
+# Shared-cache encoding of a partial: built_at, window_size, then the
+# candidate and fallback article blobs (app.cache.codec) and the clusters
+# as index lists into candidates.
+_PARTIAL = struct.Struct("<qIII")
+_U32 = struct.Struct("<I")
+
+
+def shard_cache_key(key: ShardKey) -> str:
+    region, topic, range_enum = key
+    return f"shard:{region.value}:{topic.value}:{range_enum.value}"
+
+
+def encode_partial(p: ShardPartial) -> bytes:
+    candidates = encode_articles(p.candidates)
+    fallback = encode_articles(p.fallback)
+    index = {id(a): i for i, a in enumerate(p.candidates)}
+    groups = bytearray(_U32.pack(len(p.clusters)))
+    for cluster in p.clusters:
+        groups += _U32.pack(len(cluster))
+        groups += struct.pack(f"<{len(cluster)}I", *(index[id(a)] for a in cluster))
+    header = _PARTIAL.pack(to_epoch_us(p.built_at), p.window_size, len(candidates), len(fallback))
+    return header + candidates + fallback + bytes(groups)
+
+
+def decode_partial(key: ShardKey, blob: bytes) -> ShardPartial:
+    try:
+        built_us, window_size, n_candidates, n_fallback = _PARTIAL.unpack_from(blob)
+        pos = _PARTIAL.size
+        candidates = decode_articles(blob[pos : pos + n_candidates])
+        pos += n_candidates
+        fallback = decode_articles(blob[pos : pos + n_fallback])
+        pos += n_fallback
+        (n_clusters,) = _U32.unpack_from(blob, pos)
+        pos += _U32.size
+        clusters: list[list[Article]] = []
+        for _ in range(n_clusters):
+            (size,) = _U32.unpack_from(blob, pos)
+            pos += _U32.size
+            indices = struct.unpack_from(f"<{size}I", blob, pos)
+            pos += 4 * size
+            clusters.append([candidates[i] for i in indices])
+    except (struct.error, IndexError) as e:
+        raise CodecError(str(e)) from e
+    return ShardPartial(
+        key=key,
+        built_at=from_epoch_us(built_us),
+        window_size=window_size,
+        candidates=candidates,
+        clusters=clusters,
+        fallback=fallback,
+    )
+
+
+def build_shared_partial(
+    key: ShardKey, corpus: ArticleCorpus, now: datetime, backend: CacheBackend
+) -> ShardPartial:
+    """
+    build_shard_partial through the shared cache backend, so one worker in
+    the fleet computes each shard per TTL and the others decode its result.
+    """
+    blob = cached_fill(
+        backend,
+        shard_cache_key(key),
+        lambda: encode_partial(build_shard_partial(key, corpus, now)),
+        get_settings().shard_ttl_seconds,
+    )
+    if blob is not None:
+        try:
+            return decode_partial(key, blob)
+        except CodecError:
+            pass
+    return build_shard_partial(key, corpus, now)
+
+
+def merge_partials(
+    partials: list[ShardPartial],
+    topics: list[Topic],
+    since: datetime,
+    publishers: list[str] | None = None,
+) -> list[list[Article]]:
+    """
+    Merges shard partials into one list of story clusters.
+
+    - Cross-shard dedupe by canonical URL: an article seen in several shards
+      stays with the earliest requested topic (then the earliest region).
+    - Articles older than `since` are dropped, so partials built slightly
+      earlier still honour the request window.
+    - Clusters of the same topic from different regions are merged when
+      their leads are similar titles.
+    - If no requested topic matched, DAILY fallback articles are clustered
+      instead (mirroring filter_by_topics).
+
+    A publisher filter changes which articles lead each cluster, so those
+    requests re-cluster the filtered candidates instead of reusing clusters.
+    """
+    topic_rank = {t: i for i, t in enumerate(topics)}
+    ordered = sorted(partials, key=lambda p: topic_rank.get(p.key[1], len(topic_rank)))
+    wanted = set(publishers) if publishers else None
+
+    def keep(a: Article) -> bool:
+        if a.published_at is None or a.published_at < since:
+            return False
+        return wanted is None or a.publisher_name in wanted
+
+    seen: set[str] = set()
+    clusters_by_topic: dict[Topic, list[list[Article]]] = {}
+    for p in ordered:
+        shard_clusters = p.clusters
+        if wanted is not None:
+            shard_clusters = cluster_by_title_similarity([a for a in p.candidates if keep(a)])
+        for cluster in shard_clusters:
+            members = [a for a in cluster if a.canonical_url not in seen and keep(a)]
+            if not members:
+                continue
+            seen.update(a.canonical_url for a in members)
+            clusters_by_topic.setdefault(p.key[1], []).append(members)
+
+    if not clusters_by_topic and Topic.DAILY not in topics:
+        fallback = _dedupe(a for p in ordered for a in p.fallback if keep(a))
+        return cluster_by_title_similarity(fallback)
+
+    merged: list[list[Article]] = []
+    for topic in sorted(clusters_by_topic, key=lambda t: topic_rank.get(t, len(topic_rank))):
+        merged.extend(_merge_similar(clusters_by_topic[topic]))
+    return merged
+
+
+def _dedupe(articles: Iterable[Article]) -> list[Article]:
+    seen: set[str] = set()
+    result: list[Article] = []
+    for a in articles:
+        if a.canonical_url not in seen:
+            seen.add(a.canonical_url)
+            result.append(a)
+    return result
+
+
+def _merge_similar(clusters: list[list[Article]], threshold: float = 0.60) -> list[list[Article]]:
+    """
+    Greedy merge of clusters whose leads match, newest lead first (the same
+    rule cluster_by_title_similarity applies to single articles). Clusters
+    from one shard never merge with each other, since their leads already
+    failed that test when the shard was clustered.
+    """
+    by_lead = sorted(clusters, key=lambda c: c[0].published_at or _EPOCH_MIN, reverse=True)
+    merged: list[list[Article]] = []
+    lead_tokens: list[set[str]] = []
+    for cluster in by_lead:
+        tokens = tokenize_title(cluster[0].title)
+        for i, existing in enumerate(lead_tokens):
+            if jaccard(tokens, existing) >= threshold:
+                merged[i].extend(cluster)
+                break
+        else:
+            merged.append(list(cluster))
+            lead_tokens.append(tokens)
+    return merged
+
+
+_shard_cache: TTLCache[ShardKey, ShardPartial] = TTLCache(get_settings().shard_ttl_seconds)
+
+
+def get_shard_cache() -> TTLCache[ShardKey, ShardPartial]:
+    return _shard_cache
@@ -0,0 +1,205 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+from collections.abc import AsyncGenerator, Awaitable, Callable
+from dataclasses import dataclass, field
+
+from app.cache.digest_cache import DigestCache, get_digest_cache
+from app.cache.keys import digest_request_key, normalize_request
+from app.core.config import Settings, get_settings
+from app.core.schemas import (
+    DigestRequest,
+    DigestResponse,
+    DigestStreamFrame,
+    Region,
+    StreamHeader,
+    StreamQA,
+    Topic,
+)
+from app.pipeline.orchestrator import (
+    CardTracker,
+    add_ingest_listener,
+    build_digest_async,
+    stream_frames,
+)
+
+logger = logging.getLogger(__name__)
+
+AsyncDigestBuilder = Callable[[DigestRequest], Awaitable[DigestResponse]]
+Batch = list[DigestStreamFrame]
+
+
+@dataclass(eq=False)
+class _Channel:
+    request: DigestRequest
+    subscribers: set[asyncio.Queue[Batch]] = field(default_factory=set)
+    tracker: CardTracker = field(default_factory=CardTracker)
+    latest: DigestResponse | None = None
+    task: asyncio.Task[None] | None = None
+    # Set when an ingest added articles this request reads
+    wake: asyncio.Event = field(default_factory=asyncio.Event)
+
+
+class SubscriptionHub:
+    """
+    Pushes digest changes to subscribers instead of having them poll.
+
+    Subscribers with the same normalized request share one channel: a
+    single task refreshes the digest and fans out only the changed cards,
+    as stream frames. A channel rebuilds as soon as `notify` reports new
+    articles for one of its regions and topics; otherwise it refreshes
+    every `interval_seconds` through the digest cache (so it also shares
+    builds with /digest). A new subscriber first gets the current digest
+    as a full frame sequence. A subscriber that falls `max_backlog` batches
+    behind is resynced with a full sequence. The channel stops with its
+    last subscriber.
+    """
+
+    def __init__(
+        self,
+        build: AsyncDigestBuilder,
+        cache: DigestCache,
+        interval_seconds: float = 30.0,
+        max_backlog: int = 16,
+    ):
+        self.build = build
+        self.cache = cache
+        self.interval_seconds = interval_seconds
+        self.max_backlog = max_backlog
+        self._channels: dict[str, _Channel] = {}
+        self.refreshes = 0
+
+    @classmethod
+    def from_settings(
+        cls, settings: Settings, cache: DigestCache, build: AsyncDigestBuilder
+    ) -> SubscriptionHub:
+        return cls(build, cache, interval_seconds=settings.subscription_interval_seconds)
+
+    async def subscribe(self, req: DigestRequest) -> AsyncGenerator[DigestStreamFrame]:
+        """
+        Frames for `req` until the caller stops iterating: the current
+        digest, then "card"/"update"/"remove" frames and a "qa" frame with
+        the new card order whenever the digest changes.
+        """
+        channel = self._channel(req)
+        queue: asyncio.Queue[Batch] = asyncio.Queue(self.max_backlog)
+        if channel.latest is not None:
+            queue.put_nowait(stream_frames(channel.latest))
+        channel.subscribers.add(queue)
+        try:
+            while True:
+                for frame in await queue.get():
+                    yield self._for_caller(frame, req)
+        finally:
+            channel.subscribers.discard(queue)
+            if not channel.subscribers:
+                self._close(channel)
+
+    def notify(self, region: Region, topics: set[Topic]) -> None:
+        """
+        Wakes the channels whose requests read articles newly ingested for
+        `region` and `topics`. Safe to call from any thread.
+        """
+        for channel in list(self._channels.values()):
+            req = channel.request
+            if region not in req.regions:
+                continue
+            # Every shard falls back to DAILY articles
+            if Topic.DAILY not in topics and topics.isdisjoint(req.topics):
+                continue
+            task = channel.task
+            if task is None or task.done():
+                continue
+            try:
+                task.get_loop().call_soon_threadsafe(channel.wake.set)
+            except RuntimeError:
+                pass  # its loop has closed
+
+    def channels(self) -> int:
+        return len(self._channels)
+
+    def subscribers(self) -> int:
+        return sum(len(c.subscribers) for c in self._channels.values())
+
+    def _channel(self, req: DigestRequest) -> _Channel:
+        key = digest_request_key(req)
+        channel = self._channels.get(key)
+        loop = asyncio.get_running_loop()
+        # A channel left behind by a closed loop (e.g. a finished test) is replaced
+        if channel is None or channel.task is None or channel.task.get_loop() is not loop:
+            channel = _Channel(normalize_request(req))
+            channel.task = loop.create_task(self._refresh(channel))
+            self._channels[key] = channel
+        return channel
+
+    def _close(self, channel: _Channel) -> None:
+        key = digest_request_key(channel.request)
+        if self._channels.get(key) is channel:
+            del self._channels[key]
+        if channel.task is not None:
+            channel.task.cancel()
+
+    async def _refresh(self, channel: _Channel) -> None:
+        woken = False
+        while True:
+            try:
+                if woken:
+                    # The cached digest predates the new articles
+                    built = await self.build(channel.request)
+                    response = self.cache.put(channel.request, built)
+                else:
+                    response = await self.cache.get_or_build_async(channel.request, self.build)
+            except Exception:
+                logger.exception("Subscription refresh failed for %s", channel.request)
+            else:
+                self.refreshes += 1
+                self._publish(channel, response)
+            # Articles this refresh's own build ingested are already in it
+            channel.wake.clear()
+            try:
+                await asyncio.wait_for(channel.wake.wait(), self.interval_seconds)
+                woken = True
+            except TimeoutError:
+                woken = False
+
+    def _publish(self, channel: _Channel, response: DigestResponse) -> None:
+        first = channel.latest is None
+        changes = channel.tracker.update(response.cards)
+        channel.latest = response
+        if first:
+            batch = stream_frames(response)
+        elif changes:
+            batch = [*changes, _qa(response)]
+        else:
+            return
+        for queue in channel.subscribers:
+            try:
+                queue.put_nowait(batch)
+            except asyncio.QueueFull:
+                # Too far behind to catch up on diffs: start it over
+                while not queue.empty():
+                    queue.get_nowait()
+                queue.put_nowait(stream_frames(response))
+
+    @staticmethod
+    def _for_caller(frame: DigestStreamFrame, req: DigestRequest) -> DigestStreamFrame:
+        if isinstance(frame, StreamHeader) and frame.request != req:
+            return frame.model_copy(update={"request": req})
+        return frame
+
+
+def _qa(response: DigestResponse) -> StreamQA:
+    return StreamQA(
+        qa_status=response.qa_status,
+        qa_notes=response.qa_notes,
+        card_ids=[c.id for c in response.cards],
+    )
+
+
+_hub = SubscriptionHub.from_settings(get_settings(), get_digest_cache(), build_digest_async)
+add_ingest_listener(_hub.notify)
+
+
+def get_subscription_hub() -> SubscriptionHub:
+    return _hub
@@ -1,11 +1,20 @@
 from __future__ import annotations
 
-from app.pipeline.gather.models import ArticleCandidate
+from app.pipeline.gather.models import Article, ArticleCandidate, ArticleT
 
 from .url_canonicalize import canonicalize_url
 
 
-def deduplicate_candidates(items: list[ArticleCandidate]) -> list[ArticleCandidate]:
+def canonical_url_of(item: Article | ArticleCandidate) -> str:
+    """
+    Returns the canonical URL, reusing the one computed at ingestion when available.
+    """
+    if isinstance(item, Article):
+        return item.canonical_url
+    return canonicalize_url(str(item.url))
+
+
+def deduplicate_candidates(items: list[ArticleT]) -> list[ArticleT]:
     """
     Deduplicates candidates based on canonical URL.
 
@@ -14,10 +23,10 @@ def deduplicate_candidates(items: list[ArticleCandidate]) -> list[ArticleCandida
     2. If both have published_at, keep newest
     3. Else prefer longer summary
     """
-    canonical_map: dict[str, ArticleCandidate] = {}
+    canonical_map: dict[str, ArticleT] = {}
 
     for item in items:
-        canonical = canonicalize_url(str(item.url))
+        canonical = canonical_url_of(item)
 
         if canonical not in canonical_map:
             canonical_map[canonical] = item
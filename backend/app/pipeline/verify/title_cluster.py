@@ -2,7 +2,7 @@ from __future__ import annotations
 
 import re
 
-from app.pipeline.gather.models import ArticleCandidate
+from app.pipeline.gather.models import ArticleT
 
 
 def get_title_signature(title: str) -> set[str]:
@@ -25,14 +25,14 @@ def calculate_similarity(sig1: set[str], sig2: set[str]) -> float:
 
 
 def cluster_articles(
-    items: list[ArticleCandidate], threshold: float = 0.60
-) -> list[list[ArticleCandidate]]:
+    items: list[ArticleT], threshold: float = 0.60
+) -> list[list[ArticleT]]:
     """
     Greedy clustering of articles based on title similarity.
     Items should be pre-sorted by published_at DESC for deterministic lead selection.
     Each item is only compared to the lead (newest) item of existing clusters.
     """
-    clusters: list[list[ArticleCandidate]] = []
+    clusters: list[list[ArticleT]] = []
 
     for item in items:
         assigned = False
@@ -1,13 +1,13 @@
 from app.core.schemas import Topic
-from app.pipeline.gather.models import ArticleCandidate
+from app.pipeline.gather.models import ArticleT
 
 from .topic_tagger import tag_topics
 
 
 def filter_by_topics(
-    items: list[ArticleCandidate], 
+    items: list[ArticleT], 
     requested: list[Topic]
-) -> list[ArticleCandidate]:
+) -> list[ArticleT]:
     """
     Tags candidates and filters them based on requested topics.
     Maintains existing item topic and adds new ones based on keywords.
@@ -15,7 +15,7 @@ def filter_by_topics(
     If no matches and DAILY is not requested, falls back to items tagged DAILY.
     """
     requested_set = set(requested)
-    results: list[ArticleCandidate] = []
+    results: list[ArticleT] = []
 
     # First pass: direct matches
     for item in items:
@@ -0,0 +1 @@
+# Storage: persistent article corpus
@@ -0,0 +1,215 @@
+from __future__ import annotations
+
+import sqlite3
+import threading
+import time
+from collections.abc import Iterable
+from datetime import datetime, timedelta
+from functools import lru_cache
+from pathlib import Path
+
+from app.core.config import get_settings
+from app.core.schemas import Region, Topic
+from app.core.timeutil import from_epoch_us, to_epoch_us
+from app.pipeline.gather.models import Article
+
+# Regions are stored as a bitmask so an article syndicated to several
+# regional feeds stays a single row keyed by canonical URL.
+REGION_BITS: dict[Region, int] = {r: 1 << i for i, r in enumerate(Region)}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS articles (
+    canonical_url TEXT PRIMARY KEY,
+    url TEXT NOT NULL,
+    title TEXT NOT NULL,
+    publisher TEXT NOT NULL,
+    topic TEXT NOT NULL,
+    regions INTEGER NOT NULL,
+    published_at INTEGER,
+    summary TEXT,
+    summary_len INTEGER NOT NULL,
+    ingested_at INTEGER NOT NULL
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_articles_published ON articles (published_at);
+CREATE INDEX IF NOT EXISTS idx_articles_topic_published ON articles (topic, published_at);
+CREATE INDEX IF NOT EXISTS idx_articles_publisher ON articles (publisher);
+"""
+
+# Same tie-breakers as deduplicate_candidates: a dated row beats an undated
+# one, the newer date wins, and two undated rows keep the longer summary.
+_NEW_WINS = """(
+    (excluded.published_at IS NOT NULL AND articles.published_at IS NULL)
+    OR (excluded.published_at > articles.published_at)
+    OR (excluded.published_at IS NULL AND articles.published_at IS NULL
+        AND excluded.summary_len > articles.summary_len)
+)"""
+
+_REPLACED_COLUMNS = ("url", "title", "publisher", "topic", "published_at", "summary", "summary_len")
+
+UPSERT_SQL = (
+    "INSERT INTO articles (canonical_url, url, title, publisher, topic, regions, "
+    "published_at, summary, summary_len, ingested_at) "
+    "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?) "
+    "ON CONFLICT (canonical_url) DO UPDATE SET "
+    "regions = articles.regions | excluded.regions, "
+    "ingested_at = excluded.ingested_at, "
+    + ", ".join(
+        f"{col} = CASE WHEN {_NEW_WINS} THEN excluded.{col} ELSE articles.{col} END"
+        for col in _REPLACED_COLUMNS
+    )
+)
+
+SELECT_COLUMNS = "canonical_url, url, title, publisher, topic, published_at, summary"
+
+
+def region_mask(regions: Iterable[Region]) -> int:
+    mask = 0
+    for r in regions:
+        mask |= REGION_BITS[r]
+    return mask
+
+
+class ArticleStore:
+    """
+    Embedded SQLite (WAL) corpus of normalized articles keyed by canonical URL.
+
+    WAL mode lets several uvicorn workers and restarts share one file: readers
+    never block the single writer. Connections are per thread because the
+    sync routes run on Starlette's threadpool.
+    """
+
+    def __init__(self, path: Path, prune_interval_seconds: float = 300.0):
+        self.path = path
+        self.prune_interval_seconds = prune_interval_seconds
+        self._local = threading.local()
+        self._last_prune: float | None = None
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as conn:
+            conn.executescript(SCHEMA)
+
+    def _connect(self) -> sqlite3.Connection:
+        conn: sqlite3.Connection | None = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def upsert_many(self, articles: Iterable[Article], region: Region) -> int:
+        """
+        Bulk-inserts articles for one region in a single transaction.
+        Existing rows gain the region bit and are replaced only if the
+        incoming article wins the dedupe tie-break. Returns how many dated
+        articles were new to the region.
+        """
+        bit = REGION_BITS[region]
+        ingested_at = time.time_ns() // 1000
+        rows = [
+            (
+                a.canonical_url,
+                a.url,
+                a.title,
+                a.publisher_name,
+                a.topic.value,
+                bit,
+                to_epoch_us(a.published_at) if a.published_at else None,
+                a.summary,
+                len(a.summary) if a.summary else 0,
+                ingested_at,
+            )
+            for a in articles
+        ]
+        dated = {row[0] for row in rows if row[6] is not None}
+        with self._connect() as conn:
+            known = self._in_region(conn, list(dated), bit)
+            conn.executemany(UPSERT_SQL, rows)
+        return len(dated - known)
+
+    @staticmethod
+    def _in_region(conn: sqlite3.Connection, urls: list[str], bit: int) -> set[str]:
+        known: set[str] = set()
+        # Chunked to stay under SQLite's bound-parameter limit
+        for i in range(0, len(urls), 500):
+            chunk = urls[i : i + 500]
+            placeholders = ", ".join("?" * len(chunk))
+            rows = conn.execute(
+                "SELECT canonical_url FROM articles "
+                f"WHERE canonical_url IN ({placeholders}) AND (regions & ?) != 0",
+                [*chunk, bit],
+            )
+            known.update(row[0] for row in rows)
+        return known
+
+    def query_window(
+        self,
+        since: datetime,
+        regions: Iterable[Region],
+        topics: Iterable[Topic] | None = None,
+    ) -> list[Article]:
+        """
+        Returns articles published at or after `since` for any of `regions`,
+        newest first. This is one range scan on the published_at index (or
+        on (topic, published_at) when topics are given).
+        """
+        sql = (
+            f"SELECT {SELECT_COLUMNS} FROM articles "
+            "WHERE published_at >= ? AND (regions & ?) != 0"
+        )
+        params: list[object] = [to_epoch_us(since), region_mask(regions)]
+        if topics is not None:
+            topic_values = sorted({t.value for t in topics})
+            sql += f" AND topic IN ({', '.join('?' * len(topic_values))})"
+            params.extend(topic_values)
+        sql += " ORDER BY published_at DESC"
+
+        rows = self._connect().execute(sql, params).fetchall()
+        return [
+            Article(
+                title=title,
+                url=url,
+                publisher_name=publisher,
+                published_at=from_epoch_us(published_at),
+                topic=Topic(topic),
+                summary=summary,
+                canonical_url=canonical_url,
+            )
+            for canonical_url, url, title, publisher, topic, published_at, summary in rows
+        ]
+
+    def prune(self, older_than: datetime) -> int:
+        """
+        Deletes articles published before `older_than`, and undated ones
+        that were last seen before it. Returns the number of rows removed.
+        """
+        cutoff = to_epoch_us(older_than)
+        with self._connect() as conn:
+            cur = conn.execute(
+                "DELETE FROM articles WHERE published_at < ? "
+                "OR (published_at IS NULL AND ingested_at < ?)",
+                (cutoff, cutoff),
+            )
+        self._last_prune = time.monotonic()
+        return cur.rowcount
+
+    def prune_if_due(self, now: datetime, retention: timedelta) -> int:
+        last = self._last_prune
+        if last is not None and time.monotonic() - last < self.prune_interval_seconds:
+            return 0
+        return self.prune(now - retention)
+
+    def count(self) -> int:
+        return int(self._connect().execute("SELECT COUNT(*) FROM articles").fetchone()[0])
+
+
+@lru_cache
+def _open_store(path: Path) -> ArticleStore:
+    return ArticleStore(path)
+
+
+def get_article_store() -> ArticleStore | None:
+    """
+    Returns the shared store when NEWS_AGENT_STORE_PATH is set, else None.
+    """
+    path = get_settings().article_store_path
+    return _open_store(path) if path else None
@@ -0,0 +1,49 @@
+from __future__ import annotations
+
+from collections.abc import Iterable
+from datetime import datetime, timedelta
+from typing import Protocol
+
+from app.core.config import get_settings
+from app.core.schemas import Region, Topic
+from app.pipeline.gather.models import Article
+
+from .article_store import get_article_store
+from .time_index import TimeBucketIndex
+
+
+class ArticleCorpus(Protocol):
+    """
+    Where gathered articles live between ingestion and digest building.
+    """
+
+    def upsert_many(self, articles: Iterable[Article], region: Region) -> int:
+        """
+        Stores articles gathered for `region`; returns how many dated
+        articles were new to that region.
+        """
+        ...
+
+    def query_window(
+        self,
+        since: datetime,
+        regions: Iterable[Region],
+        topics: Iterable[Topic] | None = None,
+    ) -> list[Article]: ...
+
+    def prune_if_due(self, now: datetime, retention: timedelta) -> int: ...
+
+
+_index = TimeBucketIndex(retention=timedelta(days=get_settings().article_retention_days))
+
+
+def get_article_index() -> TimeBucketIndex:
+    return _index
+
+
+def get_corpus() -> ArticleCorpus:
+    """
+    The SQLite store when NEWS_AGENT_STORE_PATH is set, else the in-memory index.
+    """
+    store = get_article_store()
+    return store if store is not None else _index
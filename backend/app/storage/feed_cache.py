@@ -0,0 +1,194 @@
+from __future__ import annotations
+
+import sqlite3
+import threading
+import time
+import uuid
+from collections.abc import Callable
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+
+from app.cache.codec import decode_feed_entries, encode_feed_entries
+from app.core.config import get_settings
+from app.pipeline.gather.models import FeedEntry
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS feeds (
+    url TEXT PRIMARY KEY,
+    etag TEXT,
+    last_modified TEXT,
+    fetched_at REAL,
+    entries BLOB,
+    lease_owner TEXT,
+    lease_until REAL
+) WITHOUT ROWID;
+"""
+
+
+@dataclass(slots=True)
+class FeedRecord:
+    url: str
+    entries: list[FeedEntry] | None
+    etag: str | None
+    last_modified: str | None
+    fetched_at: float | None
+
+    def is_fresh(self, now: float, ttl_seconds: float) -> bool:
+        return self.fetched_at is not None and now - self.fetched_at < ttl_seconds
+
+    def conditional_headers(self) -> dict[str, str]:
+        """
+        Validators for a conditional GET, only when there is a body to reuse.
+        """
+        headers: dict[str, str] = {}
+        if self.entries is None:
+            return headers
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+class SharedFeedCache:
+    """
+    Host-wide SQLite (WAL) cache of parsed feeds shared by uvicorn workers.
+
+    Each row holds a feed's parsed entries, its HTTP validators (ETag /
+    Last-Modified) and a refresh lease. A worker must take the lease before
+    fetching, so at most one worker refreshes a feed at a time; the others
+    serve the stored entries or wait for the lease holder. Leases expire,
+    so a crashed worker cannot block a feed forever. Times are wall-clock
+    seconds because they are compared across processes.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        ttl_seconds: float = 300.0,
+        lease_seconds: float = 30.0,
+        poll_seconds: float = 0.1,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.lease_seconds = lease_seconds
+        self.poll_seconds = poll_seconds
+        self._clock = clock
+        self._local = threading.local()
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as conn:
+            conn.executescript(SCHEMA)
+
+    def _connect(self) -> sqlite3.Connection:
+        conn: sqlite3.Connection | None = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def now(self) -> float:
+        return self._clock()
+
+    def lookup(self, url: str) -> FeedRecord | None:
+        row = (
+            self._connect()
+            .execute(
+                "SELECT etag, last_modified, fetched_at, entries FROM feeds WHERE url = ?", (url,)
+            )
+            .fetchone()
+        )
+        if row is None:
+            return None
+        etag, last_modified, fetched_at, blob = row
+        return FeedRecord(
+            url=url,
+            entries=decode_feed_entries(blob) if blob is not None else None,
+            etag=etag,
+            last_modified=last_modified,
+            fetched_at=fetched_at,
+        )
+
+    def try_acquire(self, url: str) -> str | None:
+        """
+        Takes the refresh lease for `url` and returns its token, or None if
+        another worker holds an unexpired lease. BEGIN IMMEDIATE takes
+        SQLite's write lock, which serializes competing workers.
+        """
+        now = self._clock()
+        token = uuid.uuid4().hex
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute("SELECT lease_until FROM feeds WHERE url = ?", (url,)).fetchone()
+            if row is not None and row[0] is not None and row[0] > now:
+                conn.execute("ROLLBACK")
+                return None
+            conn.execute(
+                "INSERT INTO feeds (url, lease_owner, lease_until) VALUES (?, ?, ?) "
+                "ON CONFLICT (url) DO UPDATE SET "
+                "lease_owner = excluded.lease_owner, lease_until = excluded.lease_until",
+                (url, token, now + self.lease_seconds),
+            )
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        return token
+
+    def store(
+        self,
+        url: str,
+        token: str,
+        entries: list[FeedEntry],
+        etag: str | None,
+        last_modified: str | None,
+    ) -> None:
+        """
+        Saves a fresh fetch and releases the lease held by `token`.
+        """
+        self._connect().execute(
+            "UPDATE feeds SET entries = ?, etag = ?, last_modified = ?, fetched_at = ?, "
+            "lease_owner = NULL, lease_until = NULL WHERE url = ? AND lease_owner = ?",
+            (encode_feed_entries(entries), etag, last_modified, self._clock(), url, token),
+        )
+
+    def touch(self, url: str, token: str) -> None:
+        """
+        Marks stored entries fresh after a 304 and releases the lease.
+        """
+        self._connect().execute(
+            "UPDATE feeds SET fetched_at = ?, lease_owner = NULL, lease_until = NULL "
+            "WHERE url = ? AND lease_owner = ?",
+            (self._clock(), url, token),
+        )
+
+    def release(self, url: str, token: str) -> None:
+        self._connect().execute(
+            "UPDATE feeds SET lease_owner = NULL, lease_until = NULL "
+            "WHERE url = ? AND lease_owner = ?",
+            (url, token),
+        )
+
+    def clear(self) -> None:
+        self._connect().execute("DELETE FROM feeds")
+
+
+@lru_cache
+def _open_cache(path: Path, ttl_seconds: float, lease_seconds: float) -> SharedFeedCache:
+    return SharedFeedCache(path, ttl_seconds=ttl_seconds, lease_seconds=lease_seconds)
+
+
+def get_feed_cache() -> SharedFeedCache | None:
+    """
+    Returns the shared feed cache when NEWS_AGENT_FEED_CACHE_PATH is set, else None.
+    """
+    settings = get_settings()
+    if settings.feed_cache_path is None:
+        return None
+    return _open_cache(
+        settings.feed_cache_path, settings.feed_cache_ttl, settings.feed_lease_seconds
+    )
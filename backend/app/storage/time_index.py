@@ -0,0 +1,151 @@
+from __future__ import annotations
+
+import bisect
+import threading
+from collections.abc import Iterable
+from datetime import datetime, timedelta
+
+from app.core.schemas import Region, Topic
+from app.core.timeutil import to_epoch_us
+from app.pipeline.gather.models import Article
+
+HOUR_US = 3_600_000_000
+DEFAULT_RETENTION = timedelta(days=7)
+
+
+def _newer(new: Article, existing: Article) -> bool:
+    """
+    Dedupe tie-break for two dated articles sharing a canonical URL.
+    """
+    assert new.published_at is not None and existing.published_at is not None
+    return new.published_at > existing.published_at
+
+
+class _Partition:
+    """
+    Articles of one (topic, region), grouped into hourly buckets.
+    `hours` stays sorted so window boundaries are found by bisection.
+    """
+
+    __slots__ = ("hours", "buckets", "locations")
+
+    def __init__(self) -> None:
+        self.hours: list[int] = []
+        self.buckets: dict[int, dict[str, Article]] = {}
+        self.locations: dict[str, int] = {}
+
+    def add(self, article: Article, hour: int) -> bool:
+        """
+        Stores the article; True if the partition did not have it yet.
+        """
+        key = article.canonical_url
+        old_hour = self.locations.get(key)
+        if old_hour is not None:
+            existing = self.buckets[old_hour][key]
+            if not _newer(article, existing):
+                return False
+            del self.buckets[old_hour][key]
+
+        bucket = self.buckets.get(hour)
+        if bucket is None:
+            bucket = self.buckets[hour] = {}
+            bisect.insort(self.hours, hour)
+        bucket[key] = article
+        self.locations[key] = hour
+        return old_hour is None
+
+    def evict_before(self, hour: int) -> int:
+        cut = bisect.bisect_left(self.hours, hour)
+        removed = 0
+        for h in self.hours[:cut]:
+            bucket = self.buckets.pop(h)
+            removed += len(bucket)
+            for key in bucket:
+                if self.locations.get(key) == h:
+                    del self.locations[key]
+        del self.hours[:cut]
+        return removed
+
+    def since(self, since_us: int) -> Iterable[Article]:
+        start = bisect.bisect_left(self.hours, since_us // HOUR_US)
+        for h in self.hours[start:]:
+            for a in self.buckets[h].values():
+                # Only the first bucket can straddle the boundary
+                if a.published_at is not None and to_epoch_us(a.published_at) >= since_us:
+                    yield a
+
+
+class TimeBucketIndex:
+    """
+    Process-wide in-memory article index partitioned by (topic, region) and
+    bucketed by hour.
+
+    A window query bisects each relevant partition to its first bucket and
+    never looks at older data; eviction drops whole buckets past the
+    retention horizon, so memory is bounded by feed volume over that horizon
+    rather than by process lifetime. Undated articles cannot fall inside any
+    window and are not indexed.
+    """
+
+    def __init__(self, retention: timedelta = DEFAULT_RETENTION):
+        self.retention = retention
+        self._partitions: dict[tuple[Topic, Region], _Partition] = {}
+        self._lock = threading.Lock()
+
+    def upsert_many(self, articles: Iterable[Article], region: Region) -> int:
+        """
+        Indexes dated articles under `region`. Returns how many were new to it.
+        """
+        added = 0
+        with self._lock:
+            for a in articles:
+                if a.published_at is None:
+                    continue
+                part = self._partitions.get((a.topic, region))
+                if part is None:
+                    part = self._partitions[(a.topic, region)] = _Partition()
+                added += part.add(a, to_epoch_us(a.published_at) // HOUR_US)
+        return added
+
+    def query_window(
+        self,
+        since: datetime,
+        regions: Iterable[Region],
+        topics: Iterable[Topic] | None = None,
+    ) -> list[Article]:
+        """
+        Returns articles published at or after `since`, newest first, deduped
+        across regions by canonical URL.
+        """
+        since_us = to_epoch_us(since)
+        region_set = set(regions)
+        topic_set = set(topics) if topics is not None else None
+
+        found: dict[str, Article] = {}
+        with self._lock:
+            for (topic, region), part in self._partitions.items():
+                if region not in region_set or (topic_set is not None and topic not in topic_set):
+                    continue
+                for a in part.since(since_us):
+                    existing = found.get(a.canonical_url)
+                    if existing is None or _newer(a, existing):
+                        found[a.canonical_url] = a
+
+        return sorted(found.values(), key=lambda a: a.published_at or since, reverse=True)
+
+    def prune(self, older_than: datetime) -> int:
+        hour = to_epoch_us(older_than) // HOUR_US
+        with self._lock:
+            return sum(part.evict_before(hour) for part in self._partitions.values())
+
+    def prune_if_due(self, now: datetime, retention: timedelta) -> int:
+        # Bucket eviction is a bisect plus a slice delete, so it runs every time
+        return self.prune(now - min(retention, self.retention))
+
+    def count(self) -> int:
+        with self._lock:
+            return sum(len(p.locations) for p in self._partitions.values())
+
+    def clear(self) -> None:
+        with self._lock:
+            self._partitions.clear()
@@ -0,0 +1,32 @@
+import pytest
+
+from app.cache.digest_cache import get_digest_cache
+from app.cache.digest_history import get_digest_history
+from app.cache.fragments import get_fragment_cache
+from app.pipeline.orchestrator import get_snapshot_store
+from app.pipeline.prewarm import get_prewarmer
+from app.pipeline.shards import get_shard_cache
+from app.storage.corpus import get_article_index
+
+
+@pytest.fixture(autouse=True)
+def reset_process_state():
+    """
+    The pipeline keeps process-wide state (article index, caches);
+    start every test from empty.
+    """
+    get_article_index().clear()
+    get_digest_cache().clear()
+    get_digest_history().clear()
+    get_fragment_cache().clear()
+    get_shard_cache().clear()
+    get_snapshot_store().clear()
+    get_prewarmer().counter.clear()
+    yield
+    get_article_index().clear()
+    get_digest_cache().clear()
+    get_digest_history().clear()
+    get_fragment_cache().clear()
+    get_shard_cache().clear()
+    get_snapshot_store().clear()
+    get_prewarmer().counter.clear()
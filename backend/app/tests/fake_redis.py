@@ -0,0 +1,152 @@
+"""
+A small in-process stand-in for a Redis server, speaking enough RESP2 for
+RedisBackend: PING, SELECT, GET, SET (PX/NX), PTTL, DEL, FLUSHDB and
+WATCH/UNWATCH/MULTI/EXEC.
+"""
+
+from __future__ import annotations
+
+import socketserver
+import threading
+import time
+from typing import Any
+
+
+class _Store:
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.data: dict[bytes, tuple[bytes, float | None]] = {}
+        self.versions: dict[bytes, int] = {}
+
+    def live(self, key: bytes) -> bytes | None:
+        entry = self.data.get(key)
+        if entry is None:
+            return None
+        if entry[1] is not None and time.monotonic() >= entry[1]:
+            del self.data[key]
+            self.bump(key)
+            return None
+        return entry[0]
+
+    def bump(self, key: bytes) -> None:
+        self.versions[key] = self.versions.get(key, 0) + 1
+
+
+def _encode(reply: Any) -> bytes:
+    if reply is None:
+        return b"$-1\r\n"
+    if isinstance(reply, Exception):
+        return b"-ERR %s\r\n" % str(reply).encode()
+    if isinstance(reply, str):
+        return b"+%s\r\n" % reply.encode()
+    if isinstance(reply, int):
+        return b":%d\r\n" % reply
+    if isinstance(reply, bytes):
+        return b"$%d\r\n%s\r\n" % (len(reply), reply)
+    return b"*%d\r\n" % len(reply) + b"".join(_encode(r) for r in reply)
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    server: FakeRedisServer
+
+    def handle(self) -> None:
+        watched: dict[bytes, int] = {}
+        queued: list[list[bytes]] | None = None
+        while True:
+            args = self._read_command()
+            if args is None:
+                return
+            name = args[0].upper()
+            store = self.server.store
+            if name == b"MULTI":
+                queued = []
+                reply: Any = "OK"
+            elif name == b"EXEC":
+                with store.lock:
+                    dirty = any(store.versions.get(k, 0) != v for k, v in watched.items())
+                    reply = None if dirty else [self._run(store, c) for c in queued or []]
+                queued, watched = None, {}
+            elif queued is not None:
+                queued.append(args)
+                reply = "QUEUED"
+            elif name == b"WATCH":
+                with store.lock:
+                    for key in args[1:]:
+                        watched[key] = store.versions.get(key, 0)
+                reply = "OK"
+            elif name == b"UNWATCH":
+                watched = {}
+                reply = "OK"
+            else:
+                with store.lock:
+                    reply = self._run(store, args)
+            self.wfile.write(_encode(reply))
+
+    def _read_command(self) -> list[bytes] | None:
+        line = self.rfile.readline()
+        if not line:
+            return None
+        count = int(line[1:-2])
+        args = []
+        for _ in range(count):
+            length = int(self.rfile.readline()[1:-2])
+            args.append(self.rfile.read(length + 2)[:-2])
+        return args
+
+    def _run(self, store: _Store, args: list[bytes]) -> Any:
+        name, rest = args[0].upper(), args[1:]
+        if name in (b"PING", b"SELECT"):
+            return "PONG" if name == b"PING" else "OK"
+        if name == b"GET":
+            return store.live(rest[0])
+        if name == b"SET":
+            key, value, options = rest[0], rest[1], [o.upper() for o in rest[2:]]
+            if b"NX" in options and store.live(key) is not None:
+                return None
+            expires_at = None
+            if b"PX" in options:
+                expires_at = time.monotonic() + int(options[options.index(b"PX") + 1]) / 1000
+            store.data[key] = (value, expires_at)
+            store.bump(key)
+            return "OK"
+        if name == b"PTTL":
+            if store.live(rest[0]) is None:
+                return -2
+            expires_at = store.data[rest[0]][1]
+            return -1 if expires_at is None else int((expires_at - time.monotonic()) * 1000)
+        if name == b"DEL":
+            removed = 0
+            for key in rest:
+                if store.data.pop(key, None) is not None:
+                    store.bump(key)
+                    removed += 1
+            return removed
+        if name == b"FLUSHDB":
+            for key in list(store.data):
+                store.bump(key)
+            store.data.clear()
+            return "OK"
+        return ValueError(f"unknown command {name.decode()}")
+
+
+class FakeRedisServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self) -> None:
+        super().__init__(("127.0.0.1", 0), _Handler)
+        self.store = _Store()
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"redis://{host!s}:{port}/0"
+
+    def __enter__(self) -> FakeRedisServer:
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.shutdown()
+        self.server_close()
@@ -0,0 +1,135 @@
+import asyncio
+from datetime import UTC, datetime
+from unittest.mock import MagicMock, patch
+
+import pytest
+from fastapi.testclient import TestClient
+from pydantic import HttpUrl
+
+from app.cache.digest_cache import get_digest_cache
+from app.core.admission import AdmissionController, Overloaded
+from app.core.schemas import DigestRequest, DigestResponse, QAStatus, Region, TimeRange, Topic
+from app.core.source_registry import Feed as RegistryFeed
+from app.core.source_registry import Publisher
+from app.main import app
+from app.pipeline.orchestrator import build_digest_async
+
+REQ = DigestRequest(
+    topics=[Topic.TECH],
+    range=TimeRange.D3,
+    regions=[Region.CANADA],
+    max_cards=10,
+    max_cards_per_topic=5,
+)
+BODY = REQ.model_dump(mode="json")
+
+
+def response(req: DigestRequest) -> DigestResponse:
+    return DigestResponse(
+        generated_at=datetime(2026, 1, 2, 3, 4, tzinfo=UTC), qa_status=QAStatus.PASS, request=req
+    )
+
+
+def test_queue_is_bounded_and_waits_time_out():
+    admission = AdmissionController(max_concurrent=1, max_queue=1, queue_timeout=0.05)
+    order = []
+
+    async def build(name: str, hold: float) -> None:
+        async with admission.slot():
+            order.append(name)
+            await asyncio.sleep(hold)
+
+    async def run():
+        first = asyncio.create_task(build("first", 0.02))
+        await asyncio.sleep(0)
+        queued = asyncio.create_task(build("queued", 0))
+        await asyncio.sleep(0)
+        with pytest.raises(Overloaded) as rejected:
+            await build("rejected", 0)
+        await asyncio.gather(first, queued)
+
+        slow = asyncio.create_task(build("slow", 0.2))
+        await asyncio.sleep(0)
+        with pytest.raises(Overloaded):
+            await build("timed out", 0)
+        await slow
+        return rejected.value
+
+    rejected = asyncio.run(run())
+
+    assert order == ["first", "queued", "slow"]
+    assert rejected.retry_after >= 1
+    assert (admission.rejected, admission.timed_out, admission.active) == (1, 1, 0)
+
+
+def test_identical_builds_share_one_slot():
+    admission = AdmissionController(max_concurrent=1, max_queue=0)
+
+    async def slow_build(req, client):
+        await asyncio.sleep(0.02)
+        return response(req)
+
+    async def run():
+        return await asyncio.gather(build_digest_async(REQ), build_digest_async(REQ))
+
+    with (
+        patch("app.pipeline.orchestrator.get_admission", return_value=admission),
+        patch("app.pipeline.orchestrator._build_digest_async", slow_build),
+    ):
+        results = asyncio.run(run())
+
+    assert len(results) == 2
+    assert (admission.admitted, admission.rejected) == (1, 0)
+
+
+def test_shed_digest_serves_the_last_cached_one_or_503():
+    calls = []
+
+    async def build(req):
+        calls.append(req)
+        if len(calls) > 1:
+            raise Overloaded("Digest build queue is full", 3)
+        return response(req)
+
+    client = TestClient(app)
+    with patch("app.api.routes.build_digest_async", build):
+        fresh = client.post("/digest", json=BODY).json()
+        entry = get_digest_cache().peek(REQ)
+        assert entry is not None
+        entry.expires_at = -1e9
+        stale = client.post("/digest", json=BODY).json()
+        get_digest_cache().clear()
+        unavailable = client.post("/digest", json=BODY)
+
+    assert fresh["qa_notes"] is None
+    assert stale["qa_notes"][-1].startswith("stale:")
+    assert "2026-01-02 03:04 UTC" in stale["qa_notes"][-1]
+    assert unavailable.status_code == 503
+    assert unavailable.headers["Retry-After"] == "3"
+
+
+@patch("app.pipeline.orchestrator.load_source_registry", return_value=MagicMock())
+@patch(
+    "app.pipeline.orchestrator.get_feeds_for_request",
+    return_value=[
+        (
+            Publisher(name="CBC", allowed_domains=["cbc.ca"], feeds=[]),
+            RegistryFeed(name="Tech", url=HttpUrl("https://cbc.ca/rss"), topic=Topic.TECH),
+        )
+    ],
+)
+def test_batch_stream_and_pages_are_admitted_or_503(*_):
+    # One build running and no queue: every other build is shed
+    admission = AdmissionController(max_concurrent=1, max_queue=0)
+    admission._active = 1
+    client = TestClient(app)
+    with patch("app.pipeline.orchestrator.get_admission", return_value=admission):
+        shed = [
+            client.post("/digests", json=[BODY]),
+            client.post("/digest/stream", json=BODY),
+            client.post("/digest/pages", json=BODY),
+        ]
+
+    assert [r.status_code for r in shed] == [503, 503, 503]
+    assert all(r.headers["Retry-After"] == "1" for r in shed)
+    assert admission.rejected == 3
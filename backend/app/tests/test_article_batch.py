@@ -0,0 +1,81 @@
+import random
+from datetime import UTC, datetime, timedelta
+
+from app.core.schemas import TimeRange, Topic
+from app.pipeline.batch import (
+    ArticleBatch,
+    deduplicate_batch,
+    filter_batch_by_publishers,
+    filter_batch_by_time_range,
+    filter_batch_by_topics,
+)
+from app.pipeline.gather.models import Article
+from app.pipeline.gather.rss_gatherer import filter_by_time_range
+from app.pipeline.verify.dedupe import deduplicate_candidates
+from app.pipeline.verify.verify_items import filter_by_topics
+
+NOW = datetime(2026, 1, 27, 12, 0, 0, tzinfo=UTC)
+
+TITLES = ["AI chip released", "Stock market crash", "New vaccine approved", "Weather update"]
+
+
+def random_articles(n: int, seed: int = 7) -> list[Article]:
+    rng = random.Random(seed)
+    articles = []
+    for i in range(n):
+        dated = rng.random() > 0.2
+        articles.append(
+            Article(
+                title=f"{rng.choice(TITLES)} {i}",
+                url=f"https://example.com/{rng.randrange(n // 3)}?utm_source={i}",
+                publisher_name=rng.choice(["A", "B", "C"]),
+                published_at=NOW - timedelta(hours=rng.randrange(200)) if dated else None,
+                topic=rng.choice(list(Topic)),
+                summary="x" * rng.randrange(5),
+            )
+        )
+    return articles
+
+
+def test_batch_dedupe_matches_sequential():
+    articles = random_articles(300)
+    expected = deduplicate_candidates(articles)
+    actual = deduplicate_batch(ArticleBatch.from_articles(articles)).to_articles()
+    assert [a is e for a, e in zip(actual, expected, strict=True)] == [True] * len(expected)
+
+
+def test_batch_time_range_matches_sequential():
+    articles = random_articles(300)
+    batch = ArticleBatch.from_articles(articles)
+    for r in TimeRange:
+        expected = filter_by_time_range(articles, r, now=NOW)
+        assert filter_batch_by_time_range(batch, r, now=NOW).to_articles() == expected
+
+
+def test_batch_topics_match_sequential_without_mutation():
+    articles = random_articles(120)
+    original_topics = [a.topic for a in articles]
+
+    for requested in ([Topic.TECH], [Topic.FINANCE, Topic.TECH], [Topic.DAILY]):
+        actual = filter_batch_by_topics(ArticleBatch.from_articles(articles), requested)
+        assert [a.topic for a in articles] == original_topics
+
+        copies = [Article(a.title, a.url, a.publisher_name, a.published_at, a.topic, a.summary)
+                  for a in articles]
+        expected = filter_by_topics(copies, requested)
+        assert [(a.url, a.topic) for a in actual.to_articles()] == [
+            (e.url, e.topic) for e in expected
+        ]
+
+
+def test_batch_topic_fallback_to_daily():
+    articles = [Article("Weather update", "https://a.com/1", "A", NOW, Topic.DAILY)]
+    result = filter_batch_by_topics(ArticleBatch.from_articles(articles), [Topic.HEALTH])
+    assert [a.topic for a in result.to_articles()] == [Topic.DAILY]
+
+
+def test_batch_publisher_filter():
+    batch = ArticleBatch.from_articles(random_articles(60))
+    result = filter_batch_by_publishers(batch, ["B", "Unknown"])
+    assert len(result) > 0
+    assert {a.publisher_name for a in result.to_articles()} == {"B"}
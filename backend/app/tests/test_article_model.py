@@ -0,0 +1,49 @@
+from datetime import UTC, datetime
+
+import pytest
+from pydantic import HttpUrl
+
+from app.core.schemas import Topic
+from app.pipeline.gather.models import Article, ArticleCandidate, as_article
+from app.pipeline.verify.dedupe import deduplicate_candidates
+
+DT = datetime(2026, 1, 27, 12, 0, 0, tzinfo=UTC)
+
+
+def test_article_is_slotted_and_canonicalized():
+    a = Article(
+        title="T",
+        url="https://Example.com/a?utm_source=x",
+        publisher_name="P",
+        published_at=DT,
+        topic=Topic.TECH,
+    )
+    assert a.canonical_url == "https://example.com/a"
+    assert not hasattr(a, "__dict__")
+    with pytest.raises(AttributeError):
+        a.extra = 1  # type: ignore[attr-defined]
+
+
+def test_candidate_round_trip():
+    c = ArticleCandidate(
+        title="T",
+        url=HttpUrl("https://example.com/a"),
+        publisher_name="P",
+        published_at=DT,
+        topic=Topic.HEALTH,
+        summary="S",
+    )
+    a = as_article(c)
+    assert isinstance(a.url, str)
+    assert a.url == str(c.url)
+    assert as_article(a) is a
+    assert a.to_candidate() == c
+
+
+def test_dedupe_accepts_internal_articles():
+    older = Article("Old", "https://example.com/a?ref=x", "P1", DT.replace(hour=10), Topic.TECH)
+    newer = Article("New", "https://example.com/a", "P2", DT, Topic.TECH)
+
+    results = deduplicate_candidates([older, newer])
+
+    assert results == [newer]
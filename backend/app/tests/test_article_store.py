@@ -0,0 +1,122 @@
+from datetime import UTC, datetime, timedelta
+from unittest.mock import MagicMock, patch
+
+from app.core.schemas import DigestRequest, QAStatus, Region, TimeRange, Topic
+from app.pipeline.gather.models import Article
+from app.pipeline.orchestrator import build_digest
+from app.pipeline.shards import get_shard_cache
+from app.storage.article_store import ArticleStore
+
+NOW = datetime(2026, 1, 27, 12, 0, 0, tzinfo=UTC)
+
+
+def make_article(
+    url: str, hours_ago: int | None = 0, summary: str | None = None, title: str = "T",
+    topic: Topic = Topic.TECH, publisher: str = "P",
+) -> Article:
+    published_at = None if hours_ago is None else NOW - timedelta(hours=hours_ago)
+    return Article(title, url, publisher, published_at, topic, summary)
+
+
+def test_upsert_follows_dedupe_tie_breakers(tmp_path):
+    store = ArticleStore(tmp_path / "articles.sqlite3")
+
+    store.upsert_many([make_article("https://a.com/1?utm_source=x", hours_ago=2, title="Old")],
+                      Region.UK)
+    store.upsert_many([make_article("https://a.com/1", hours_ago=1, title="New")], Region.UK)
+    store.upsert_many([make_article("https://a.com/1", hours_ago=None, title="Undated")],
+                      Region.UK)
+
+    results = store.query_window(NOW - timedelta(days=1), [Region.UK])
+    assert [a.title for a in results] == ["New"]
+    assert store.count() == 1
+
+
+def test_upsert_counts_articles_new_to_the_region(tmp_path):
+    store = ArticleStore(tmp_path / "articles.sqlite3")
+    first = [make_article("https://a.com/1"), make_article("https://a.com/2", hours_ago=None)]
+
+    assert store.upsert_many(first, Region.UK) == 1
+    assert store.upsert_many(first, Region.UK) == 0
+    assert store.upsert_many([make_article("https://a.com/1?utm_source=x")], Region.USA) == 1
+
+
+def test_undated_rows_keep_longer_summary(tmp_path):
+    store = ArticleStore(tmp_path / "articles.sqlite3")
+    store.upsert_many([make_article("https://a.com/1", hours_ago=None, summary="short")],
+                      Region.UK)
+    store.upsert_many([make_article("https://a.com/1", hours_ago=None, summary="much longer")],
+                      Region.UK)
+    store.upsert_many([make_article("https://a.com/1", hours_ago=None, summary="tiny")],
+                      Region.UK)
+
+    row = store._connect().execute("SELECT summary FROM articles").fetchone()
+    assert row[0] == "much longer"
+
+
+def test_query_window_by_region_and_topic(tmp_path):
+    store = ArticleStore(tmp_path / "articles.sqlite3")
+    store.upsert_many(
+        [
+            make_article("https://a.com/1", hours_ago=1),
+            make_article("https://a.com/2", hours_ago=30),
+            make_article("https://a.com/3", hours_ago=2, topic=Topic.FINANCE),
+        ],
+        Region.UK,
+    )
+    store.upsert_many([make_article("https://a.com/1", hours_ago=1)], Region.GLOBAL)
+
+    since = NOW - timedelta(hours=24)
+    assert [a.url for a in store.query_window(since, [Region.UK])] == [
+        "https://a.com/1",
+        "https://a.com/3",
+    ]
+    assert [a.url for a in store.query_window(since, [Region.GLOBAL])] == ["https://a.com/1"]
+    assert [a.url for a in store.query_window(since, [Region.UK], topics=[Topic.FINANCE])] == [
+        "https://a.com/3"
+    ]
+
+
+def test_prune_removes_old_rows(tmp_path):
+    store = ArticleStore(tmp_path / "articles.sqlite3")
+    store.upsert_many(
+        [
+            make_article("https://a.com/1", hours_ago=1),
+            make_article("https://a.com/2", hours_ago=200),
+        ],
+        Region.UK,
+    )
+    assert store.prune(NOW - timedelta(days=7)) == 1
+    assert store.count() == 1
+
+
+@patch("app.pipeline.orchestrator.get_corpus")
+@patch("app.pipeline.orchestrator.load_source_registry")
+@patch("app.pipeline.orchestrator.get_feeds_for_request")
+@patch("app.pipeline.orchestrator.RSSGatherer.gather")
+def test_digest_survives_failed_fetch_with_store(
+    mock_gather, mock_get_feeds, mock_load_registry, mock_get_store, tmp_path
+):
+    mock_load_registry.return_value = MagicMock()
+    mock_get_feeds.return_value = [("Publisher A", MagicMock())]
+    mock_get_store.return_value = ArticleStore(tmp_path / "articles.sqlite3")
+    now = datetime.now(UTC)
+    mock_gather.return_value = [
+        Article("AI chip news", "https://a.com/1", "A", now, Topic.TECH, "AI chip"),
+    ]
+    req = DigestRequest(
+        topics=[Topic.TECH],
+        range=TimeRange.H24,
+        regions=[Region.GLOBAL],
+        max_cards=10,
+        max_cards_per_topic=5,
+    )
+
+    assert len(build_digest(req).cards) == 1
+    get_shard_cache().clear()
+
+    # Every feed now fails, but the stored window still answers the request
+    mock_gather.side_effect = RuntimeError("feed down")
+    resp = build_digest(req)
+    assert resp.qa_status == QAStatus.PASS
+    assert [str(s.url) for s in resp.cards[0].sources or []] == ["https://a.com/1"]
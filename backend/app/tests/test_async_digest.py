@@ -0,0 +1,124 @@
+import asyncio
+from datetime import UTC, datetime, timedelta
+from email.utils import format_datetime
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+import httpx
+from pydantic import HttpUrl
+
+from app.core.schemas import DigestRequest, QAStatus, Region, TimeRange, Topic
+from app.core.source_registry import Feed as RegistryFeed
+from app.core.source_registry import Publisher
+from app.pipeline.gather.rss_gatherer import RSSGatherer
+from app.pipeline.orchestrator import build_digest_async
+
+TEST_NOW = datetime(2026, 1, 12, 12, 0, 0, tzinfo=UTC)
+PUBLISHER = Publisher(name="CBC", allowed_domains=["cbc.ca"], feeds=[])
+FEED = RegistryFeed(name="Top Stories", url=HttpUrl("https://cbc.ca/rss"), topic=Topic.TECH)
+
+
+def rss(*items: tuple[str, str]) -> bytes:
+    date = format_datetime(datetime.now(UTC) - timedelta(hours=1), usegmt=True)
+    body = "".join(
+        f"<item><title>{title}</title><link>{link}</link><pubDate>{date}</pubDate></item>"
+        for title, link in items
+    )
+    return f'<?xml version="1.0"?><rss version="2.0"><channel>{body}</channel></rss>'.encode()
+
+
+def counting_client(content: bytes) -> tuple[httpx.AsyncClient, list[str]]:
+    calls: list[str] = []
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(str(request.url))
+        await asyncio.sleep(0.05)
+        return httpx.Response(200, content=content)
+
+    return httpx.AsyncClient(transport=httpx.MockTransport(handler)), calls
+
+
+def test_gather_async_matches_sync_gather():
+    xml = (Path(__file__).parent / "fixtures" / "sample_rss.xml").read_bytes()
+    client, _ = counting_client(xml)
+    gatherer = RSSGatherer()
+
+    async def run():
+        async with client:
+            return await gatherer.gather_async(PUBLISHER, FEED, TimeRange.D3, client, now=TEST_NOW)
+
+    expected = gatherer.gather(PUBLISHER, FEED, TimeRange.D3, raw_xml=xml.decode(), now=TEST_NOW)
+    assert asyncio.run(run()) == expected
+
+
+def test_gather_async_returns_empty_on_http_error():
+    async def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(503)
+
+    async def run():
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            return await RSSGatherer().gather_async(PUBLISHER, FEED, TimeRange.H24, client)
+
+    assert asyncio.run(run()) == []
+
+
+@patch("app.pipeline.orchestrator.load_source_registry")
+@patch("app.pipeline.orchestrator.get_feeds_for_request")
+def test_concurrent_async_builds_share_fetch_and_build(mock_get_feeds, mock_load_registry):
+    mock_load_registry.return_value = MagicMock()
+    mock_get_feeds.return_value = [(PUBLISHER, FEED)]
+    client, calls = counting_client(
+        rss(("AI chip launch", "https://cbc.ca/1"), ("Robot startup raises", "https://cbc.ca/2"))
+    )
+    req = DigestRequest(
+        topics=[Topic.TECH],
+        range=TimeRange.H24,
+        regions=[Region.CANADA],
+        max_cards=10,
+        max_cards_per_topic=5,
+    )
+
+    async def run():
+        async with client:
+            return await asyncio.gather(*(build_digest_async(req, client) for _ in range(5)))
+
+    responses = asyncio.run(run())
+
+    assert len(calls) == 1
+    assert all(r is responses[0] for r in responses)
+    assert responses[0].qa_status == QAStatus.PASS
+    assert {c.headline for c in responses[0].cards} == {"AI chip launch", "Robot startup raises"}
+
+
+@patch("app.pipeline.orchestrator.load_source_registry", return_value=MagicMock())
+@patch("app.pipeline.orchestrator.get_feeds_for_request", return_value=[(PUBLISHER, FEED)])
+def test_cancelled_build_leaves_its_shared_feed_fetch_running(*_):
+    client, calls = counting_client(rss(("AI chip launch", "https://cbc.ca/1")))
+    requests = [
+        DigestRequest(
+            topics=[Topic.TECH],
+            range=time_range,
+            regions=[Region.CANADA],
+            max_cards=10,
+            max_cards_per_topic=5,
+        )
+        for time_range in (TimeRange.H24, TimeRange.D3)
+    ]
+
+    async def run():
+        with (
+            patch("app.pipeline.orchestrator.get_http_client", return_value=client),
+            patch("app.pipeline.gather.rss_gatherer.get_http_client", return_value=client),
+        ):
+            async with client:
+                leader = asyncio.create_task(build_digest_async(requests[0]))
+                await asyncio.sleep(0.02)
+                follower = asyncio.create_task(build_digest_async(requests[1]))
+                await asyncio.sleep(0.01)
+                leader.cancel()
+                return await follower
+
+    response = asyncio.run(run())
+
+    assert len(calls) == 1
+    assert [c.headline for c in response.cards] == ["AI chip launch"]
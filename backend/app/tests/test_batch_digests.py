@@ -0,0 +1,118 @@
+import asyncio
+from datetime import UTC, datetime, timedelta
+from unittest.mock import MagicMock, patch
+
+from fastapi.testclient import TestClient
+from pydantic import HttpUrl
+
+from app.core.schemas import DigestRequest, Region, TimeRange, Topic
+from app.core.source_registry import Feed as RegistryFeed
+from app.core.source_registry import Publisher
+from app.main import app
+from app.pipeline.gather.models import Article
+from app.pipeline.orchestrator import build_digest, build_digests, build_digests_async
+from app.pipeline.shards import get_shard_cache
+
+NOW = datetime.now(UTC)
+PUBLISHER = Publisher(name="CBC", allowed_domains=["cbc.ca"], feeds=[])
+FEEDS = {
+    topic: RegistryFeed(name=topic.value, url=HttpUrl(f"https://cbc.ca/{topic.value}"), topic=topic)
+    for topic in (Topic.TECH, Topic.FINANCE)
+}
+ARTICLES = {
+    Topic.TECH: [
+        Article("AI chip launch", "https://cbc.ca/1", "CBC", NOW - timedelta(hours=1), Topic.TECH),
+        Article("Robot startup", "https://cbc.ca/2", "CBC", NOW - timedelta(hours=30), Topic.TECH),
+    ],
+    Topic.FINANCE: [
+        Article("Stock market rally", "https://cbc.ca/3", "CBC", NOW, Topic.FINANCE),
+    ],
+}
+
+
+def request(topics: list[Topic], range_enum: TimeRange = TimeRange.H24) -> DigestRequest:
+    return DigestRequest(
+        topics=topics,
+        range=range_enum,
+        regions=[Region.CANADA],
+        max_cards=10,
+        max_cards_per_topic=5,
+    )
+
+
+def feeds_for(registry, regions, topics):
+    return [(PUBLISHER, FEEDS[t]) for t in topics if t in FEEDS]
+
+
+def gather(pub, feed, time_range, *args, **kwargs):
+    return list(ARTICLES[feed.topic])
+
+
+BATCH = [
+    request([Topic.TECH]),
+    request([Topic.FINANCE, Topic.TECH], TimeRange.D3),
+    request([Topic.TECH]),
+    request([Topic.HEALTH]),
+]
+
+
+def headlines(resp) -> list[str]:
+    return [c.headline for c in resp.cards]
+
+
+@patch("app.pipeline.orchestrator.load_source_registry", return_value=MagicMock())
+@patch("app.pipeline.orchestrator.get_feeds_for_request", side_effect=feeds_for)
+@patch("app.pipeline.orchestrator.RSSGatherer.gather", side_effect=gather)
+def test_batch_gathers_each_feed_once_and_keeps_input_order(mock_gather, *_):
+    results = build_digests(BATCH)
+
+    # Two feeds across the whole batch, gathered with the widest range
+    assert mock_gather.call_count == 2
+    assert {c.args[2] for c in mock_gather.call_args_list} == {TimeRange.D3}
+    assert [r.request for r in results] == BATCH
+    assert headlines(results[0]) == headlines(results[2]) == ["AI chip launch"]
+    assert set(headlines(results[1])) == {"AI chip launch", "Robot startup", "Stock market rally"}
+    assert results[3].cards[0].id == "mock-1"
+
+    # Each digest matches what a single build returns
+    get_shard_cache().clear()
+    for req, resp in zip(BATCH, results, strict=True):
+        assert headlines(build_digest(req)) == headlines(resp)
+
+
+@patch("app.pipeline.orchestrator.load_source_registry", return_value=MagicMock())
+@patch("app.pipeline.orchestrator.get_feeds_for_request", side_effect=feeds_for)
+@patch("app.pipeline.gather.rss_gatherer.RSSGatherer.gather_async")
+def test_async_batch_matches_sync_batch(mock_gather_async, *_):
+    async def gather_async(pub, feed, time_range, client, now=None):
+        return gather(pub, feed, time_range)
+
+    mock_gather_async.side_effect = gather_async
+    with patch("app.pipeline.orchestrator.RSSGatherer.gather", side_effect=gather):
+        expected = [headlines(r) for r in build_digests(BATCH)]
+    get_shard_cache().clear()
+
+    results = asyncio.run(build_digests_async(BATCH, client=MagicMock()))
+
+    assert mock_gather_async.call_count == 2
+    assert [headlines(r) for r in results] == expected
+
+
+@patch("app.pipeline.orchestrator.load_source_registry", return_value=MagicMock())
+@patch("app.pipeline.orchestrator.get_feeds_for_request", side_effect=feeds_for)
+@patch("app.pipeline.gather.rss_gatherer.RSSGatherer.gather_async")
+def test_digests_endpoint_serves_cached_entries_and_builds_the_rest(mock_gather_async, *_):
+    async def gather_async(pub, feed, time_range, client, now=None):
+        return gather(pub, feed, time_range)
+
+    mock_gather_async.side_effect = gather_async
+    client = TestClient(app)
+    body = [r.model_dump(mode="json") for r in BATCH[:2]]
+
+    first = client.post("/digests", json=body)
+    second = client.post("/digests", json=body[::-1])
+
+    assert first.status_code == second.status_code == 200
+    assert [d["request"]["topics"] for d in first.json()] == [["tech"], ["finance", "tech"]]
+    assert second.json() == first.json()[::-1]
+    assert mock_gather_async.call_count == 2
@@ -0,0 +1,229 @@
+import asyncio
+import io
+import math
+import threading
+import time
+from datetime import UTC, datetime
+from unittest.mock import patch
+
+import pytest
+
+from app.cache.backends import (
+    CacheBackendError,
+    MemoryBackend,
+    RedisBackend,
+    SQLiteBackend,
+    cached_fill,
+    cached_fill_async,
+)
+from app.cache.codec import (
+    CodecError,
+    decode_articles,
+    decode_feed_entries,
+    encode_articles,
+    encode_feed_entries,
+)
+from app.core.config import get_settings
+from app.core.schemas import Region, TimeRange, Topic
+from app.pipeline.gather.models import Article
+from app.pipeline.gather.rss_gatherer import RSSGatherer
+from app.pipeline.shards import ShardPartial, decode_partial, encode_partial
+from app.tests.fake_redis import FakeRedisServer
+
+NOW = datetime(2026, 1, 12, 12, 0, tzinfo=UTC)
+
+
+@pytest.fixture(params=["memory", "sqlite", "redis"])
+def backend(request, tmp_path):
+    if request.param == "memory":
+        yield MemoryBackend()
+    elif request.param == "sqlite":
+        yield SQLiteBackend(tmp_path / "cache.sqlite3")
+    else:
+        with FakeRedisServer() as server:
+            yield RedisBackend.from_url(server.url)
+
+
+def article(title: str, url: str, publisher: str = "CBC", summary: str | None = None) -> Article:
+    return Article(
+        title=title,
+        url=url,
+        publisher_name=publisher,
+        published_at=NOW,
+        topic=Topic.TECH,
+        summary=summary,
+    )
+
+
+def test_get_set_and_ttl(backend):
+    assert backend.get("k") is None
+    assert backend.remaining_ttl("k") is None
+
+    backend.set("k", b"v1")
+    assert backend.get("k") == b"v1"
+    assert backend.remaining_ttl("k") == math.inf
+
+    backend.set("k", b"v2", ttl=60)
+    assert backend.get("k") == b"v2"
+    assert 0 < backend.remaining_ttl("k") <= 60
+
+    backend.delete("k")
+    assert backend.get("k") is None
+
+
+def test_entries_expire(backend):
+    backend.set("k", b"v", ttl=0.05)
+    time.sleep(0.1)
+    assert backend.get("k") is None
+    assert backend.remaining_ttl("k") is None
+
+
+def test_compare_and_set(backend):
+    assert backend.compare_and_set("k", None, b"a")
+    assert not backend.compare_and_set("k", None, b"b")
+    assert not backend.compare_and_set("k", b"stale", b"b")
+    assert backend.compare_and_set("k", b"a", b"b", ttl=60)
+    assert backend.get("k") == b"b"
+
+
+def test_cached_fill_runs_one_fill_across_callers(backend):
+    calls = []
+
+    def fill() -> bytes:
+        calls.append(1)
+        time.sleep(0.1)
+        return b"payload"
+
+    results: list[bytes | None] = []
+    threads = [
+        threading.Thread(target=lambda: results.append(cached_fill(backend, "feed:x", fill, 60)))
+        for _ in range(4)
+    ]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join(5)
+
+    assert results == [b"payload"] * 4
+    assert len(calls) == 1
+
+
+def test_memory_backend_evicts_least_recently_used():
+    backend = MemoryBackend(max_entries=2)
+    backend.set("a", b"1")
+    backend.set("b", b"2")
+    backend.get("a")
+    backend.set("c", b"3")
+    assert backend.get("b") is None
+    assert backend.get("a") == b"1"
+
+
+def test_unreachable_redis_degrades_to_fill():
+    backend = RedisBackend(port=1, timeout=0.2)
+    with pytest.raises(CacheBackendError):
+        backend.get("k")
+    assert cached_fill(backend, "k", lambda: b"fresh", 60) == b"fresh"
+
+
+def test_fill_errors_propagate_and_release_the_lock():
+    backend = MemoryBackend()
+
+    def fill() -> bytes:
+        raise CacheBackendError("upstream store is down")
+
+    async def fill_async() -> bytes:
+        return fill()
+
+    with pytest.raises(CacheBackendError):
+        cached_fill(backend, "k", fill, 60)
+    with pytest.raises(CacheBackendError):
+        asyncio.run(cached_fill_async(backend, "k", fill_async, 60))
+    assert cached_fill(backend, "k", lambda: b"fresh", 60, wait_seconds=0) == b"fresh"
+
+
+def test_redis_reconnects_after_the_server_closes_the_connection():
+    with FakeRedisServer() as server:
+        backend = RedisBackend.from_url(server.url)
+        backend.set("k", b"v")
+        # What the connection reads once the server has closed it
+        backend._local.conn._file = io.BytesIO(b"")
+
+        with pytest.raises(CacheBackendError):
+            backend.get("k")
+        assert backend.get("k") == b"v"
+
+
+def test_failed_redis_transaction_does_not_poison_the_connection():
+    with FakeRedisServer() as server:
+        backend = RedisBackend.from_url(server.url)
+        backend.set("k", b"v")
+        call = backend._call
+
+        def fail_inside_multi(*args):
+            if args[0] == "SET":
+                raise CacheBackendError("ERR wrong number of arguments")
+            return call(*args)
+
+        with (
+            patch.object(backend, "_call", side_effect=fail_inside_multi),
+            pytest.raises(CacheBackendError),
+        ):
+            backend.compare_and_set("k", b"v", b"w")
+
+        # A connection left in MULTI would answer QUEUED here
+        assert backend.get("k") == b"v"
+
+
+def test_article_codec_roundtrip_is_compact():
+    articles = [
+        article(f"Story {i}", f"https://cbc.ca/news/{i}?utm_source=rss", summary="s" * i)
+        for i in range(50)
+    ]
+    articles.append(
+        Article(
+            title="Undated",
+            url="https://bbc.co.uk/x",
+            publisher_name="BBC",
+            published_at=None,
+            topic=Topic.DAILY,
+        )
+    )
+    blob = encode_articles(articles)
+
+    assert decode_articles(blob) == articles
+    assert len(blob) < len(repr(articles)) / 4
+    with pytest.raises(CodecError):
+        decode_feed_entries(blob)
+
+
+def test_feed_entry_codec_roundtrip():
+    entries = [("Title", "https://cbc.ca/a", 1_700_000_000_000_000, None), (None, None, None, "s")]
+    assert decode_feed_entries(encode_feed_entries(entries)) == entries
+
+
+def test_shard_partial_roundtrip_keeps_cluster_membership():
+    a, b, c = (article(t, f"https://cbc.ca/{i}") for i, t in enumerate("abc"))
+    key = (Region.CANADA, Topic.TECH, TimeRange.H24)
+    partial = ShardPartial(key, NOW, 3, candidates=[a, b, c], clusters=[[a, c], [b]], fallback=[b])
+
+    decoded = decode_partial(key, encode_partial(partial))
+
+    assert decoded == partial
+    assert decoded.clusters[0][0] is decoded.candidates[0]
+
+
+def test_gatherer_reads_feeds_through_the_backend(monkeypatch):
+    monkeypatch.setenv("NEWS_AGENT_CACHE_BACKEND", "redis")
+    with FakeRedisServer() as server:
+        monkeypatch.setenv("NEWS_AGENT_CACHE_URL", server.url)
+        get_settings.cache_clear()
+        entries = [("Title", "https://cbc.ca/a", None, None)]
+        try:
+            with patch.object(RSSGatherer, "_fetch_direct", return_value=entries) as fetch:
+                assert RSSGatherer().fetch_feed("https://cbc.ca/rss") == entries
+                # A second worker finds the entries in the shared backend
+                assert RSSGatherer().fetch_feed("https://cbc.ca/rss") == entries
+            assert fetch.call_count == 1
+        finally:
+            monkeypatch.undo()
+            get_settings.cache_clear()
@@ -0,0 +1,65 @@
+import json
+from datetime import UTC, datetime, timedelta
+
+from app.api.responses import FastJSONResponse
+from app.cache.fragments import get_fragment_cache
+from app.core.schemas import DigestRequest, DigestResponse, QAStatus, Region, TimeRange, Topic
+from app.pipeline.format.versioning import digest_version
+from app.pipeline.gather.models import Article
+from app.pipeline.orchestrator import qa_cards
+from app.pipeline.rank.ranker import summarize_cluster
+
+NOW = datetime.now(UTC)
+CHIP = Article("AI chip launch", "https://bbc.co.uk/1", "BBC", NOW - timedelta(hours=2), Topic.TECH)
+ROBOT = Article("Robot startup", "https://cbc.ca/2", "CBC", NOW - timedelta(hours=1), Topic.TECH)
+CHIP_FOLLOWUP = Article("AI chip launch", "https://cbc.ca/1", "CBC", NOW, Topic.TECH)
+
+
+def digest(regions: list[Region], *clusters: list[Article]) -> DigestResponse:
+    req = DigestRequest(
+        topics=[Topic.TECH],
+        range=TimeRange.H24,
+        regions=regions,
+        max_cards=10,
+        max_cards_per_topic=5,
+    )
+    cards = qa_cards(summarize_cluster(members, NOW) for members in clusters)
+    return DigestResponse(generated_at=NOW, qa_status=QAStatus.PASS, request=req, cards=cards)
+
+
+def test_digests_with_the_same_story_share_its_card_and_fragment():
+    fragments = get_fragment_cache()
+    uk = digest([Region.UK], [CHIP])
+    both = digest([Region.UK, Region.CANADA], [ROBOT], [CHIP])
+
+    assert both.cards[1] is uk.cards[0]
+    assert (fragments.hits, fragments.misses) == (1, 2)
+    assert fragments.fragment(both.cards[1]) is fragments.fragment(uk.cards[0])
+
+
+def test_a_grown_cluster_gets_a_new_version_under_the_same_id():
+    alone = digest([Region.UK], [CHIP]).cards[0]
+    grown = digest([Region.UK], [CHIP, CHIP_FOLLOWUP]).cards[0]
+
+    assert grown.id == alone.id
+    assert grown is not alone
+    assert [str(c.url) for c in grown.sources or []] == [CHIP.url, CHIP_FOLLOWUP.url]
+
+
+def test_spliced_response_matches_a_full_serialization():
+    response = digest([Region.UK, Region.CANADA], [CHIP, CHIP_FOLLOWUP], [ROBOT])
+    response.qa_notes = ["note"]
+
+    body = FastJSONResponse(response).render(response)
+
+    assert body == response.model_dump_json().encode()
+    assert json.loads(body)["cards"][0]["id"] == response.cards[0].id
+
+
+def test_version_ignores_generated_at_but_not_cards():
+    first = digest([Region.UK], [CHIP])
+    later = first.model_copy(update={"generated_at": NOW + timedelta(minutes=5)})
+    grown = digest([Region.UK], [CHIP, CHIP_FOLLOWUP])
+
+    assert digest_version(later) == digest_version(first)
+    assert digest_version(grown) != digest_version(first)
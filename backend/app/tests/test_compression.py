@@ -0,0 +1,114 @@
+from datetime import UTC, datetime, timedelta
+from unittest.mock import patch
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.api.compression import SUPPORTED_ENCODINGS, compress, negotiate
+from app.core.config import get_settings
+from app.core.schemas import DigestRequest, DigestResponse, QAStatus, Region, TimeRange, Topic
+from app.main import app
+from app.pipeline.gather.models import Article
+from app.pipeline.orchestrator import qa_cards
+from app.pipeline.rank.ranker import summarize_cluster
+
+NOW = datetime.now(UTC)
+REQ = DigestRequest(
+    topics=[Topic.TECH],
+    range=TimeRange.H24,
+    regions=[Region.CANADA],
+    max_cards=10,
+    max_cards_per_topic=5,
+)
+BODY = REQ.model_dump(mode="json")
+
+
+def digest() -> DigestResponse:
+    clusters = [
+        [Article(f"Story {i}", f"https://cbc.ca/{i}", "CBC", NOW - timedelta(hours=i), Topic.TECH)]
+        for i in range(8)
+    ]
+    cards = qa_cards(summarize_cluster(members, NOW) for members in clusters)
+    return DigestResponse(generated_at=NOW, qa_status=QAStatus.PASS, request=REQ, cards=cards)
+
+
+@pytest.fixture
+def built():
+    response = digest()
+
+    async def build(req):
+        return response
+
+    with patch("app.api.routes.build_digest_async", build):
+        yield response
+
+
+def test_negotiation_follows_q_values():
+    # br when the brotli package is installed, else gzip
+    preferred = SUPPORTED_ENCODINGS[0]
+    assert negotiate("gzip, deflate, br") == preferred
+    assert negotiate("br;q=0.5, gzip") == "gzip"
+    assert negotiate("*") == preferred
+    assert negotiate("gzip;q=0, identity") is None
+    assert negotiate("") is None
+
+
+def test_digest_is_compressed_per_accept_encoding(built):
+    client = TestClient(app)
+    plain = client.post("/digest", json=BODY, headers={"Accept-Encoding": "identity"})
+    encoded = {
+        coding: client.post("/digest", json=BODY, headers={"Accept-Encoding": coding})
+        for coding in SUPPORTED_ENCODINGS
+    }
+
+    assert "content-encoding" not in plain.headers
+    for coding, response in encoded.items():
+        assert response.headers["content-encoding"] == coding
+        assert int(response.headers["content-length"]) < len(plain.content)
+        assert "Accept-Encoding" in response.headers["vary"]
+        assert response.json() == plain.json()
+
+
+def test_cached_digest_is_compressed_once(built):
+    client = TestClient(app)
+    with patch("app.api.responses.compress", wraps=compress) as compressor:
+        first = client.post("/digest", json=BODY, headers={"Accept-Encoding": "gzip"})
+        again = client.post("/digest", json=BODY, headers={"Accept-Encoding": "gzip"})
+
+    assert compressor.call_count == 1
+    assert again.content == first.content
+
+
+def test_small_bodies_and_disabled_compression_stay_plain(built, monkeypatch):
+    client = TestClient(app)
+    monkeypatch.setenv("NEWS_AGENT_COMPRESS_MIN_BYTES", "1000000")
+    get_settings.cache_clear()
+    small = client.post("/digest", json=BODY, headers={"Accept-Encoding": "gzip"})
+    monkeypatch.setenv("NEWS_AGENT_COMPRESS_MIN_BYTES", "0")
+    monkeypatch.setenv("NEWS_AGENT_COMPRESSION", "false")
+    get_settings.cache_clear()
+    disabled = client.post("/digest", json=BODY, headers={"Accept-Encoding": "gzip"})
+    monkeypatch.undo()
+    get_settings.cache_clear()
+
+    assert "content-encoding" not in small.headers
+    assert "content-encoding" not in disabled.headers
+
+
+def test_each_coding_has_its_own_etag_for_one_version(built):
+    client = TestClient(app)
+    plain = client.post("/digest", json=BODY, headers={"Accept-Encoding": "identity"})
+    gz = client.post("/digest", json=BODY, headers={"Accept-Encoding": "gzip"})
+    cross = client.post(
+        "/digest",
+        json=BODY,
+        headers={"Accept-Encoding": "identity", "If-None-Match": gz.headers["ETag"]},
+    )
+    since = client.post("/digest/delta", params={"since": gz.headers["ETag"]}, json=BODY)
+
+    version = plain.headers["ETag"].strip('"')
+    assert gz.headers["ETag"] == f'"{version}-gzip"'
+    assert cross.status_code == 304
+    assert cross.headers["ETag"] == plain.headers["ETag"]
+    assert "Accept-Encoding" in cross.headers["vary"]
+    assert since.status_code == 304
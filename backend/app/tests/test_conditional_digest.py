@@ -0,0 +1,126 @@
+import asyncio
+from datetime import UTC, datetime, timedelta
+from unittest.mock import patch
+
+from fastapi.testclient import TestClient
+from pydantic import HttpUrl
+
+from app.cache.digest_cache import get_digest_cache
+from app.core.schemas import (
+    Bullet,
+    Citation,
+    DigestCard,
+    DigestRequest,
+    DigestResponse,
+    QAStatus,
+    Topic,
+)
+from app.main import app
+from app.pipeline.format.cards import build_card
+from app.pipeline.gather.models import Article
+from app.pipeline.rank.ranker import summarize_cluster
+
+NOW = datetime.now(UTC)
+BODY = {"topics": ["tech"], "range": "3d", "regions": ["canada"]}
+
+
+def card(cid: str, headline: str) -> DigestCard:
+    citation = Citation(publisher="CBC", url=HttpUrl(f"https://cbc.ca/{cid}"), published_at=NOW)
+    return DigestCard(
+        id=cid,
+        topic=Topic.TECH,
+        headline=headline,
+        publisher="CBC",
+        published_at=NOW,
+        bullets=[Bullet(text=headline, citations=[citation])],
+        sources=[citation],
+    )
+
+
+class Builds:
+    """
+    Stands in for build_digest_async, returning a scripted card list per build.
+    """
+
+    def __init__(self, *card_lists: list[DigestCard]):
+        self.card_lists = list(card_lists)
+
+    async def __call__(self, req: DigestRequest) -> DigestResponse:
+        cards = self.card_lists.pop(0) if len(self.card_lists) > 1 else self.card_lists[0]
+        return DigestResponse(
+            generated_at=datetime.now(UTC), qa_status=QAStatus.PASS, request=req, cards=cards
+        )
+
+
+def test_card_id_is_stable_when_a_newer_article_joins():
+    three_hours_ago = NOW - timedelta(hours=3)
+    older = Article("AI chip launch", "https://cbc.ca/1", "CBC", three_hours_ago, Topic.TECH)
+    newer = Article("AI chip launch", "https://bbc.co.uk/1", "BBC", NOW, Topic.TECH)
+
+    alone = build_card(summarize_cluster([older], NOW))
+    grown = build_card(summarize_cluster([older, newer], NOW))
+
+    assert grown.publisher == "BBC"
+    assert grown.id == alone.id
+
+
+def test_unchanged_digest_answers_304_to_its_etag():
+    client = TestClient(app)
+    builds = Builds([card("rss-aaaaaa", "A")])
+    with patch("app.api.routes.build_digest_async", builds):
+        first = client.post("/digest", json=BODY)
+        etag = first.headers["ETag"]
+        unchanged = client.post("/digest", json=BODY, headers={"If-None-Match": etag})
+        stale = client.post("/digest", json=BODY, headers={"If-None-Match": '"other"'})
+
+    assert first.status_code == 200
+    assert unchanged.status_code == 304
+    assert unchanged.headers["ETag"] == etag
+    assert stale.status_code == 200 and stale.headers["ETag"] == etag
+
+
+def test_304_is_answered_without_rendering_the_body():
+    client = TestClient(app)
+    builds = Builds([card("rss-aaaaaa", "A")])
+    with patch("app.api.routes.build_digest_async", builds):
+        etag = client.post("/digest", json=BODY).headers["ETag"]
+        with patch("app.api.routes.FastJSONResponse") as render:
+            unchanged = client.post("/digest", json=BODY, headers={"If-None-Match": etag})
+
+    assert unchanged.status_code == 304
+    assert unchanged.headers["ETag"] == etag
+    render.assert_not_called()
+
+
+def test_rebuild_with_same_cards_keeps_the_cached_response():
+    cache = get_digest_cache()
+    req = DigestRequest.model_validate(BODY)
+    first = cache.put(req, asyncio.run(Builds([card("rss-aaaaaa", "A")])(req)))
+    rebuilt = cache.put(req, asyncio.run(Builds([card("rss-aaaaaa", "A")])(req)))
+    changed = cache.put(req, asyncio.run(Builds([card("rss-aaaaaa", "B")])(req)))
+
+    assert rebuilt is first
+    assert changed is not first
+
+
+def test_delta_reports_added_changed_and_removed_cards():
+    client = TestClient(app)
+    a, b, c = card("rss-aaaaaa", "A"), card("rss-bbbbbb", "B"), card("rss-cccccc", "C")
+    builds = Builds([a, b], [card("rss-aaaaaa", "A grew"), c])
+
+    with patch("app.api.routes.build_digest_async", builds):
+        first = client.post("/digest", json=BODY)
+        version = first.headers["ETag"]
+        same = client.post("/digest/delta", params={"since": version}, json=BODY)
+        get_digest_cache().clear()
+        delta = client.post("/digest/delta", params={"since": version}, json=BODY).json()
+        unknown = client.post("/digest/delta", params={"since": "nope"}, json=BODY).json()
+
+    assert same.status_code == 304
+    assert delta["full"] is False
+    assert [x["id"] for x in delta["added"]] == ["rss-cccccc"]
+    assert [x["headline"] for x in delta["changed"]] == ["A grew"]
+    assert delta["removed"] == ["rss-bbbbbb"]
+    assert delta["order"] == ["rss-aaaaaa", "rss-cccccc"]
+    assert unknown["full"] is True
+    assert len(unknown["added"]) == 2
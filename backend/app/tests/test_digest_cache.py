@@ -0,0 +1,125 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import UTC, datetime
+
+from app.cache.digest_cache import DigestCache
+from app.cache.keys import digest_request_key
+from app.core.schemas import DigestRequest, DigestResponse, QAStatus, Region, TimeRange, Topic
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def make_request(topics=None, regions=None, time_range=TimeRange.H24) -> DigestRequest:
+    return DigestRequest(
+        topics=topics or [Topic.TECH, Topic.FINANCE],
+        regions=regions or [Region.USA, Region.UK],
+        range=time_range,
+        max_cards=12,
+        max_cards_per_topic=5,
+    )
+
+
+class CountingBuilder:
+    def __init__(self) -> None:
+        self.calls = 0
+        self.lock = threading.Lock()
+
+    def __call__(self, req: DigestRequest) -> DigestResponse:
+        with self.lock:
+            self.calls += 1
+            note = f"build {self.calls}"
+        return DigestResponse(
+            generated_at=datetime.now(UTC), qa_status=QAStatus.PASS, request=req, qa_notes=[note]
+        )
+
+
+def make_cache(clock: FakeClock, **kwargs) -> DigestCache:
+    ttls = {TimeRange.H24: 60.0, TimeRange.D3: 300.0, TimeRange.D7: 0.0}
+    return DigestCache(ttl_by_range=ttls, clock=clock, **kwargs)
+
+
+def test_key_ignores_list_order_and_duplicates():
+    a = make_request(topics=[Topic.TECH, Topic.FINANCE], regions=[Region.USA, Region.UK])
+    b = make_request(
+        topics=[Topic.FINANCE, Topic.TECH, Topic.TECH], regions=[Region.UK, Region.USA]
+    )
+    assert digest_request_key(a) == digest_request_key(b)
+    assert digest_request_key(a) != digest_request_key(make_request(time_range=TimeRange.D3))
+
+
+def test_hit_echoes_caller_request():
+    cache = make_cache(FakeClock())
+    build = CountingBuilder()
+    first = make_request(topics=[Topic.FINANCE, Topic.TECH])
+    second = make_request(topics=[Topic.TECH, Topic.FINANCE])
+
+    cache.get_or_build(first, build)
+    resp = cache.get_or_build(second, build)
+
+    assert build.calls == 1
+    assert resp.request.topics == [Topic.TECH, Topic.FINANCE]
+    assert cache.hits == 1
+
+
+def test_ttl_per_range_and_disabled_range():
+    clock = FakeClock()
+    cache = make_cache(clock, stale_seconds=0)
+    build = CountingBuilder()
+
+    cache.get_or_build(make_request(), build)
+    clock.now = 61
+    cache.get_or_build(make_request(), build)
+    assert build.calls == 2
+
+    # TTL 0 disables caching for 7d requests
+    cache.get_or_build(make_request(time_range=TimeRange.D7), build)
+    cache.get_or_build(make_request(time_range=TimeRange.D7), build)
+    assert build.calls == 4
+
+
+def test_stale_while_revalidate_runs_one_background_rebuild():
+    clock = FakeClock()
+    cache = make_cache(clock, stale_seconds=100)
+    cache.get_or_build(make_request(), CountingBuilder())
+
+    release = threading.Event()
+    rebuilt = CountingBuilder()
+
+    def slow_build(req: DigestRequest) -> DigestResponse:
+        release.wait(5)
+        return rebuilt(req)
+
+    clock.now = 70
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        responses = list(
+            pool.map(lambda _: cache.get_or_build(make_request(), slow_build), range(20))
+        )
+    assert {r.qa_notes[0] for r in responses if r.qa_notes} == {"build 1"}
+
+    release.set()
+    cache._executor.shutdown(wait=True)
+    assert rebuilt.calls == 1
+    assert cache.stale_hits == 20
+    entry = cache.peek(make_request())
+    assert entry is not None and not entry.refreshing and entry.expires_at == 130
+
+
+def test_lru_eviction():
+    cache = make_cache(FakeClock(), max_entries=2)
+    build = CountingBuilder()
+    requests = [make_request(regions=[r]) for r in (Region.USA, Region.UK, Region.CHINA)]
+
+    cache.get_or_build(requests[0], build)
+    cache.get_or_build(requests[1], build)
+    cache.get_or_build(requests[0], build)  # refresh recency
+    cache.get_or_build(requests[2], build)  # evicts requests[1]
+
+    assert len(cache) == 2
+    assert cache.peek(requests[1]) is None
+    assert cache.peek(requests[0]) is not None
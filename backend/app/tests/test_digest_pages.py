@@ -0,0 +1,121 @@
+import asyncio
+from datetime import UTC, datetime, timedelta
+from unittest.mock import MagicMock, patch
+
+from fastapi.testclient import TestClient
+from pydantic import HttpUrl
+
+from app.cache.snapshots import SnapshotStore, decode_cursor, encode_cursor
+from app.core.schemas import DigestRequest, TimeRange, Topic
+from app.core.source_registry import Feed as RegistryFeed
+from app.core.source_registry import Publisher
+from app.main import app
+from app.pipeline import orchestrator
+from app.pipeline.gather.models import Article
+from app.pipeline.shards import get_shard_cache
+from app.storage.corpus import get_article_index
+
+NOW = datetime.now(UTC)
+PUBLISHER = Publisher(name="CBC", allowed_domains=["cbc.ca"], feeds=[])
+FEED = RegistryFeed(name="Tech", url=HttpUrl("https://cbc.ca/rss"), topic=Topic.TECH)
+BODY = {"topics": ["tech"], "range": "24h", "regions": ["canada"], "max_cards": 5}
+
+
+def stories(n: int, start: int = 0) -> list[Article]:
+    return [
+        Article(
+            f"Alpha{i} beta{i} gamma{i}",
+            f"https://cbc.ca/{i}",
+            "CBC",
+            NOW - timedelta(minutes=i),
+            FEED.topic,
+        )
+        for i in range(start, start + n)
+    ]
+
+
+class Gather:
+    def __init__(self, articles: list[Article]):
+        self.articles = articles
+
+    async def __call__(self, pub, feed, time_range, client, now=None):
+        return list(self.articles)
+
+
+def pages(client: TestClient, limit: int) -> list[dict]:
+    result, cursor = [], None
+    while True:
+        params = {"limit": limit} | ({"cursor": cursor} if cursor else {})
+        page = client.post("/digest/pages", params=params, json=BODY).json()
+        result.append(page)
+        cursor = page["next_cursor"]
+        if cursor is None:
+            return result
+
+
+@patch("app.pipeline.orchestrator.load_source_registry", return_value=MagicMock())
+@patch("app.pipeline.orchestrator.get_feeds_for_request", return_value=[(PUBLISHER, FEED)])
+def test_pages_walk_the_whole_ranking_past_max_cards(*_):
+    gather = Gather(stories(23))
+    with patch("app.pipeline.gather.rss_gatherer.RSSGatherer.gather_async", gather):
+        result = pages(TestClient(app), limit=10)
+
+    assert [len(p["cards"]) for p in result] == [10, 10, 3]
+    headlines = [c["headline"] for p in result for c in p["cards"]]
+    assert headlines == [f"Alpha{i} beta{i} gamma{i}" for i in range(23)]
+    assert {p["snapshot"] for p in result} == {result[0]["snapshot"]}
+    assert result[0]["total_clusters"] == 23
+
+
+@patch("app.pipeline.orchestrator.load_source_registry", return_value=MagicMock())
+@patch("app.pipeline.orchestrator.get_feeds_for_request", return_value=[(PUBLISHER, FEED)])
+def test_later_pages_come_from_the_snapshot_and_only_build_their_cards(*_):
+    client = TestClient(app)
+    gather = Gather(stories(15))
+    with patch("app.pipeline.gather.rss_gatherer.RSSGatherer.gather_async", gather):
+        first = client.post("/digest/pages", params={"limit": 5}, json=BODY).json()
+
+        # Newer stories arrive; the open scroll must not shift
+        get_shard_cache().clear()
+        get_article_index().clear()
+        gather.articles = stories(15, start=100)
+        with patch.object(orchestrator, "build_card", wraps=orchestrator.build_card) as build:
+            second = client.post(
+                "/digest/pages", params={"limit": 5, "cursor": first["next_cursor"]}, json=BODY
+            ).json()
+
+    assert build.call_count == 5
+    assert [c["headline"] for c in second["cards"]] == [
+        f"Alpha{i} beta{i} gamma{i}" for i in range(5, 10)
+    ]
+
+
+def test_bad_and_expired_cursors():
+    client = TestClient(app)
+    bad = client.post("/digest/pages", params={"cursor": "!!"}, json=BODY)
+    expired = client.post("/digest/pages", params={"cursor": encode_cursor("gone", 10)}, json=BODY)
+
+    assert bad.status_code == 400
+    assert expired.status_code == 410
+    assert decode_cursor(encode_cursor("abc", 42)) == ("abc", 42)
+
+
+def test_first_pages_rerank_after_the_digest_ttl_but_cursors_stay_pinned():
+    now = [0.0]
+    store: SnapshotStore[int] = SnapshotStore(
+        fresh_by_range={TimeRange.H24: 60.0}, ttl_seconds=600.0, clock=lambda: now[0]
+    )
+    req = DigestRequest.model_validate(BODY)
+    rankings = iter(range(10))
+
+    async def rank(_: DigestRequest) -> int:
+        return next(rankings)
+
+    first = asyncio.run(store.latest_or_rank(req, rank))
+    now[0] = 59.0
+    assert asyncio.run(store.latest_or_rank(req, rank)) is first
+
+    now[0] = 61.0
+    second = asyncio.run(store.latest_or_rank(req, rank))
+    assert (first.ranked, second.ranked) == (0, 1)
+    assert store.get(first.id) is first
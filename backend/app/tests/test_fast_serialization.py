@@ -0,0 +1,97 @@
+import json
+from datetime import UTC, datetime, timedelta
+from unittest.mock import patch
+
+from fastapi.testclient import TestClient
+
+from app.api.responses import FastJSONResponse
+from app.cache.model_memo import ModelMemo
+from app.core.schemas import (
+    DigestCard,
+    DigestRequest,
+    DigestResponse,
+    QAStatus,
+    Region,
+    TimeRange,
+    Topic,
+)
+from app.main import app
+from app.pipeline.format.cards import build_card
+from app.pipeline.gather.models import Article
+from app.pipeline.rank.ranker import summarize_cluster
+
+NOW = datetime.now(UTC)
+REQ = DigestRequest(
+    topics=[Topic.TECH],
+    range=TimeRange.H24,
+    regions=[Region.CANADA],
+    max_cards=10,
+    max_cards_per_topic=5,
+)
+
+
+def cards() -> list[DigestCard]:
+    articles = [
+        Article("AI chip launch", "https://cbc.ca/1", "CBC", NOW - timedelta(hours=2), Topic.TECH),
+        Article("AI chip launch", "https://bbc.co.uk/1", "BBC", NOW, Topic.TECH),
+    ]
+    return [build_card(summarize_cluster(articles, NOW))]
+
+
+def test_rebuilt_cards_share_validated_urls():
+    first, second = cards()[0], cards()[0]
+
+    assert first.bullets[0].citations[0].url is second.bullets[0].citations[0].url
+    assert first == second
+
+
+def test_model_memo_computes_once_per_instance():
+    calls: list[DigestCard] = []
+
+    def card_id(card: DigestCard) -> str:
+        calls.append(card)
+        return card.id
+
+    memo = ModelMemo(card_id, max_entries=1)
+    first, second = cards()[0], cards()[0]
+
+    assert memo(first) == memo(first) == first.id
+    assert len(calls) == 1
+
+    # Equal but distinct instances are separate entries; the bound evicts
+    memo(second)
+    memo(first)
+    assert len(calls) == 3
+    assert len(memo) == 1
+
+
+def test_fast_response_renders_models_and_lists_of_models():
+    response = DigestResponse(generated_at=NOW, qa_status=QAStatus.PASS, request=REQ, cards=cards())
+
+    single = json.loads(FastJSONResponse(response).render(response))
+    many = json.loads(FastJSONResponse(None).render([response, response]))
+
+    assert single == json.loads(response.model_dump_json())
+    assert many == [single, single]
+
+
+def test_digest_endpoint_returns_the_fast_response():
+    response = DigestResponse(generated_at=NOW, qa_status=QAStatus.PASS, request=REQ, cards=cards())
+
+    async def build(req):
+        return response
+
+    client = TestClient(app)
+    with (
+        patch("app.api.routes.build_digest_async", build),
+        patch(
+            "app.api.responses._rendered_digests.fn", wraps=lambda m: m.model_dump_json().encode()
+        ) as dump,
+    ):
+        first = client.post("/digest", json=REQ.model_dump(mode="json"))
+        again = client.post("/digest", json=REQ.model_dump(mode="json"))
+
+    assert DigestResponse.model_validate(first.json()) == response
+    # The cached digest is rendered once and its bytes are served again
+    assert again.content == first.content
+    assert dump.call_count == 1
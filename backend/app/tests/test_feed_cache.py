@@ -0,0 +1,108 @@
+import threading
+import time
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from app.core.config import get_settings
+from app.pipeline.gather.rss_gatherer import RSSGatherer, parse_feed_entries
+from app.storage.feed_cache import SharedFeedCache, get_feed_cache
+
+FEED_URL = "https://cbc.ca/rss"
+XML = (Path(__file__).parent / "fixtures" / "sample_rss.xml").read_bytes()
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 1_000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def shared_cache(tmp_path, monkeypatch):
+    monkeypatch.setenv("NEWS_AGENT_FEED_CACHE_PATH", str(tmp_path / "feeds.sqlite3"))
+    monkeypatch.setenv("NEWS_AGENT_FEED_CACHE_TTL", "0")
+    get_settings.cache_clear()
+    cache = get_feed_cache()
+    assert cache is not None
+    yield cache
+    monkeypatch.undo()
+    get_settings.cache_clear()
+
+
+def response(status: int, content: bytes = b"", headers: dict[str, str] | None = None):
+    return MagicMock(status_code=status, content=content, headers=headers or {})
+
+
+def test_only_one_worker_holds_the_refresh_lease(tmp_path):
+    clock = FakeClock()
+    path = tmp_path / "feeds.sqlite3"
+    worker_a = SharedFeedCache(path, lease_seconds=30, clock=clock)
+    worker_b = SharedFeedCache(path, lease_seconds=30, clock=clock)
+
+    token = worker_a.try_acquire(FEED_URL)
+    assert token is not None
+    assert worker_b.try_acquire(FEED_URL) is None
+
+    worker_a.store(FEED_URL, token, parse_feed_entries(XML), '"v1"', None)
+    record = worker_b.lookup(FEED_URL)
+    assert record is not None and record.entries == parse_feed_entries(XML)
+    assert record.conditional_headers() == {"If-None-Match": '"v1"'}
+
+    # An abandoned lease expires so another worker can take over
+    assert worker_b.try_acquire(FEED_URL) is not None
+    assert worker_a.try_acquire(FEED_URL) is None
+    clock.now += 31
+    assert worker_a.try_acquire(FEED_URL) is not None
+
+
+def test_refresh_uses_validators_and_reuses_entries_on_304(shared_cache):
+    calls = []
+
+    def fake_get(url, headers, timeout):
+        calls.append(headers)
+        if "If-None-Match" in headers:
+            return response(304)
+        return response(200, XML, {"ETag": '"v1"', "Last-Modified": "Mon, 12 Jan 2026"})
+
+    with patch("app.pipeline.gather.rss_gatherer.requests.get", side_effect=fake_get):
+        first = RSSGatherer().fetch_feed(FEED_URL)
+        second = RSSGatherer().fetch_feed(FEED_URL)
+
+    assert first == second == parse_feed_entries(XML)
+    assert calls[1]["If-None-Match"] == '"v1"'
+    assert calls[1]["If-Modified-Since"] == "Mon, 12 Jan 2026"
+
+
+def test_waiting_worker_gets_the_lease_holders_entries(shared_cache):
+    shared_cache.ttl_seconds = 60
+    # Another worker is refreshing the feed
+    other_worker = SharedFeedCache(shared_cache.path)
+    token = other_worker.try_acquire(FEED_URL)
+    assert token is not None
+
+    fetched: list[str] = []
+    with patch("app.pipeline.gather.rss_gatherer.requests.get", side_effect=fetched.append):
+        result: list = []
+        waiter = threading.Thread(target=lambda: result.append(RSSGatherer().fetch_feed(FEED_URL)))
+        waiter.start()
+        time.sleep(0.2)
+        other_worker.store(FEED_URL, token, parse_feed_entries(XML), None, None)
+        waiter.join(5)
+
+    assert fetched == []
+    assert result == [parse_feed_entries(XML)]
+
+
+def test_failed_parse_releases_the_refresh_lease(shared_cache):
+    with (
+        patch("app.pipeline.gather.rss_gatherer.requests.get", return_value=response(200, XML)),
+        patch("app.pipeline.gather.rss_gatherer.run_offloaded", side_effect=RuntimeError),
+        pytest.raises(RuntimeError),
+    ):
+        RSSGatherer().fetch_feed(FEED_URL)
+
+    assert shared_cache.try_acquire(FEED_URL) is not None
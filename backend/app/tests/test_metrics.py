@@ -0,0 +1,144 @@
+import asyncio
+from datetime import UTC, datetime, timedelta
+from email.utils import format_datetime
+from unittest.mock import MagicMock, patch
+
+import httpx
+from fastapi.testclient import TestClient
+from pydantic import HttpUrl
+
+from app.core.metrics import (
+    CLUSTER_SIZE,
+    ENTRIES_SKIPPED,
+    FEED_FETCHES,
+    STAGE_SECONDS,
+    MetricsRegistry,
+    get_metrics,
+)
+from app.core.schemas import DigestRequest, DigestResponse, QAStatus, Region, TimeRange, Topic
+from app.core.source_registry import Feed as RegistryFeed
+from app.core.source_registry import Publisher
+from app.main import app
+from app.pipeline.orchestrator import build_digest_async, get_async_digest_flight
+
+CBC = Publisher(name="CBC", allowed_domains=["cbc.ca"], feeds=[])
+FEED_URL = "https://cbc.ca/rss"
+FEEDS = [(CBC, RegistryFeed(name="Tech", url=HttpUrl(FEED_URL), topic=Topic.TECH))]
+REQ = DigestRequest(
+    topics=[Topic.TECH],
+    range=TimeRange.H24,
+    regions=[Region.CANADA],
+    max_cards=10,
+    max_cards_per_topic=5,
+)
+STAGES = ["registry_load", "parse", "normalize", "dedupe", "tag_filter", "cluster", "card_build"]
+
+
+def rss() -> bytes:
+    date = format_datetime(datetime.now(UTC) - timedelta(hours=1), usegmt=True)
+    items = [
+        ("AI chip launch today", "https://cbc.ca/1"),
+        ("AI chip launch today", "https://cbc.ca/1"),
+        ("Robot startup raises", "https://elsewhere.com/2"),
+    ]
+    body = "".join(
+        f"<item><title>{title}</title><link>{link}</link><pubDate>{date}</pubDate></item>"
+        for title, link in items
+    )
+    return f'<?xml version="1.0"?><rss version="2.0"><channel>{body}</channel></rss>'.encode()
+
+
+def test_registry_renders_prometheus_text():
+    registry = MetricsRegistry()
+    hits = registry.counter("hits_total", "Hits.", ("path",))
+    latency = registry.histogram("latency_seconds", "Latency.", buckets=(0.1, 1.0))
+    hits.inc('a"b')
+    hits.inc('a"b', amount=2)
+    latency.observe(0.05)
+    latency.observe(0.5)
+    latency.observe(3)
+
+    lines = registry.render().splitlines()
+
+    assert "# TYPE hits_total counter" in lines
+    assert 'hits_total{path="a\\"b"} 3' in lines
+    assert 'latency_seconds_bucket{le="0.1"} 1' in lines
+    assert 'latency_seconds_bucket{le="1.0"} 2' in lines
+    assert 'latency_seconds_bucket{le="+Inf"} 3' in lines
+    assert "latency_seconds_sum 3.55" in lines
+    assert "latency_seconds_count 3" in lines
+
+
+def test_disabled_registry_records_nothing():
+    registry = MetricsRegistry(enabled=False)
+    hits = registry.counter("hits_total", "Hits.")
+    hits.inc()
+    with registry.histogram("latency_seconds", "Latency.").time():
+        pass
+
+    assert hits.value() == 0
+    assert "latency_seconds_count" not in registry.render()
+
+
+@patch("app.pipeline.orchestrator.load_source_registry", return_value=MagicMock())
+@patch("app.pipeline.orchestrator.get_feeds_for_request", return_value=FEEDS)
+def test_a_build_records_stages_feeds_and_skips(*_):
+    stages = {stage: STAGE_SECONDS.count(stage) for stage in STAGES}
+    fetched = FEED_FETCHES.value(FEED_URL, "200")
+    skipped = ENTRIES_SKIPPED.value("domain_not_allowed")
+    clusters = CLUSTER_SIZE.count()
+
+    async def run():
+        transport = httpx.MockTransport(lambda request: httpx.Response(200, content=rss()))
+        async with httpx.AsyncClient(transport=transport) as client:
+            return await build_digest_async(REQ, client)
+
+    assert asyncio.run(run()).cards
+
+    assert all(STAGE_SECONDS.count(stage) > stages[stage] for stage in STAGES)
+    assert FEED_FETCHES.value(FEED_URL, "200") == fetched + 1
+    assert ENTRIES_SKIPPED.value("domain_not_allowed") == skipped + 1
+    assert CLUSTER_SIZE.count() > clusters
+
+
+def test_metrics_endpoint_exposes_cache_lookups(monkeypatch):
+    client = TestClient(app)
+    response = client.get("/metrics")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    assert 'news_agent_cache_lookups_total{cache="digest",result="miss"}' in response.text
+    assert "# TYPE news_agent_stage_seconds histogram" in response.text
+
+    monkeypatch.setattr(get_metrics(), "enabled", False)
+    assert client.get("/metrics").status_code == 404
+
+
+def scrape(client: TestClient) -> dict[str, float]:
+    samples = {}
+    for line in client.get("/metrics").text.splitlines():
+        if line.startswith("news_agent_digest_flight"):
+            name, value = line.rsplit(" ", 1)
+            samples[name] = float(value)
+    return samples
+
+
+def test_metrics_endpoint_exposes_async_digest_coalescing(monkeypatch):
+    monkeypatch.setattr(get_async_digest_flight(), "executions", 0)
+    monkeypatch.setattr(get_async_digest_flight(), "coalesced", 0)
+
+    async def slow_build(req, client):
+        await asyncio.sleep(0.02)
+        return DigestResponse(generated_at=datetime.now(UTC), qa_status=QAStatus.PASS, request=req)
+
+    async def run():
+        return await asyncio.gather(*(build_digest_async(REQ) for _ in range(4)))
+
+    with patch("app.pipeline.orchestrator._build_digest_async", slow_build):
+        asyncio.run(run())
+    samples = scrape(TestClient(app))
+
+    assert samples['news_agent_digest_flight_calls_total{flight="async",result="executed"}'] == 1
+    assert samples['news_agent_digest_flight_calls_total{flight="async",result="coalesced"}'] == 3
+    assert samples['news_agent_digest_flight_coalescing_ratio{flight="async"}'] == 0.75
+    assert 'news_agent_digest_flight_coalescing_ratio{flight="sync"}' in samples
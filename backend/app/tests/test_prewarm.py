@@ -0,0 +1,133 @@
+import asyncio
+from datetime import UTC, datetime
+from unittest.mock import patch
+
+import pytest
+
+from app.cache.digest_cache import DigestCache
+from app.core.admission import AdmissionController
+from app.core.schemas import DigestRequest, DigestResponse, QAStatus, Region, TimeRange, Topic
+from app.pipeline.orchestrator import build_digest_async
+from app.pipeline.prewarm import DecayingCounter, Prewarmer
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def make_request(region: Region = Region.USA, time_range=TimeRange.H24) -> DigestRequest:
+    return DigestRequest(
+        topics=[Topic.TECH],
+        regions=[region],
+        range=time_range,
+        max_cards=12,
+        max_cards_per_topic=5,
+    )
+
+
+def fake_build(req: DigestRequest) -> DigestResponse:
+    return DigestResponse(generated_at=datetime.now(UTC), qa_status=QAStatus.PASS, request=req)
+
+
+def test_counter_decays_and_ranks_by_recent_popularity():
+    clock = FakeClock()
+    counter = DecayingCounter(half_life_seconds=10, clock=clock)
+    for _ in range(4):
+        counter.record(make_request(Region.USA))
+
+    clock.now = 20  # USA has decayed to 1.0
+    for _ in range(2):
+        counter.record(make_request(Region.UK))
+
+    assert counter.score(make_request(Region.USA)) == pytest.approx(1.0)
+    assert [req.regions for req, _ in counter.top(2)] == [[Region.UK], [Region.USA]]
+
+
+def test_counter_keeps_only_highest_scores():
+    counter = DecayingCounter(max_keys=2, clock=FakeClock())
+    for region, hits in ((Region.USA, 3), (Region.UK, 2), (Region.CHINA, 1)):
+        for _ in range(hits):
+            counter.record(make_request(region))
+
+    assert len(counter) == 2
+    assert counter.score(make_request(Region.USA)) == 3
+
+
+def test_run_once_builds_missing_and_expiring_top_keys():
+    clock = FakeClock()
+    ttls = {TimeRange.H24: 60.0, TimeRange.D3: 300.0, TimeRange.D7: 0.0}
+    cache = DigestCache(ttl_by_range=ttls, clock=clock)
+    built: list[DigestRequest] = []
+
+    async def build(req: DigestRequest) -> DigestResponse:
+        built.append(req)
+        return fake_build(req)
+
+    prewarmer = Prewarmer(
+        cache, build, DecayingCounter(clock=clock), top_n=2, interval_seconds=15, cpu_budget=1.0
+    )
+    for region, hits in ((Region.USA, 3), (Region.UK, 2), (Region.CHINA, 1)):
+        for _ in range(hits):
+            prewarmer.record(make_request(region))
+    prewarmer.record(make_request(time_range=TimeRange.D7))  # uncacheable, skipped
+
+    assert asyncio.run(prewarmer.run_once()) == 2
+    assert {r.regions[0] for r in built} == {Region.USA, Region.UK}
+    assert cache.get_fresh(make_request(Region.USA)) is not None
+    assert cache.misses == 0
+
+    # Fresh entries are left alone until they would expire before the next cycle
+    clock.now = 30
+    assert asyncio.run(prewarmer.run_once()) == 0
+    clock.now = 50
+    assert asyncio.run(prewarmer.run_once()) == 2
+
+
+def test_run_once_stops_when_cpu_budget_is_spent():
+    cpu = FakeClock()
+
+    async def expensive_build(req: DigestRequest) -> DigestResponse:
+        cpu.now += 1.0
+        return fake_build(req)
+
+    cache = DigestCache(ttl_by_range={TimeRange.H24: 60.0})
+    prewarmer = Prewarmer(
+        cache, expensive_build, top_n=3, interval_seconds=10, cpu_budget=0.1, cpu_clock=cpu
+    )
+    for region in (Region.USA, Region.UK, Region.CHINA):
+        prewarmer.record(make_request(region))
+
+    assert asyncio.run(prewarmer.run_once()) == 1
+    assert prewarmer.budget_exhausted == 1
+
+
+def test_prewarm_shares_the_build_of_an_overlapping_request_and_its_admission():
+    cache = DigestCache(ttl_by_range={TimeRange.H24: 60.0})
+    prewarmer = Prewarmer(cache, build_digest_async, interval_seconds=10, cpu_budget=1.0)
+    prewarmer.record(make_request(Region.USA))
+    admission = AdmissionController(max_concurrent=1)
+    builds: list[DigestRequest] = []
+
+    async def slow_build(req, client):
+        builds.append(req)
+        await asyncio.sleep(0.02)
+        return fake_build(req)
+
+    async def run():
+        request = asyncio.create_task(cache.get_or_build_async(make_request(), build_digest_async))
+        await asyncio.sleep(0)
+        return await prewarmer.run_once(), await request
+
+    with (
+        patch("app.pipeline.orchestrator.get_admission", return_value=admission),
+        patch("app.pipeline.orchestrator._build_digest_async", slow_build),
+    ):
+        prewarmed, _ = asyncio.run(run())
+
+    assert prewarmed == 1
+    assert len(builds) == 1
+    assert admission.admitted == 1
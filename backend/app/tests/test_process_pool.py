@@ -0,0 +1,71 @@
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+
+import pytest
+
+from app.core.config import get_settings
+from app.core.executors import get_process_pool, shutdown_process_pool
+from app.core.schemas import Topic
+from app.pipeline.batch import ArticleBatch
+from app.pipeline.cluster.title_cluster import cluster_by_title_similarity
+from app.pipeline.gather.models import Article
+from app.pipeline.gather.rss_gatherer import parse_feed_entries
+
+NOW = datetime(2026, 1, 12, 12, 0, 0, tzinfo=UTC)
+TITLES = ["AI chip launch", "AI chip launch today", "Stock market rally", "Local parade"]
+
+
+def make_articles(n: int) -> list[Article]:
+    return [
+        Article(
+            f"{TITLES[i % len(TITLES)]}",
+            f"https://a.com/{i}",
+            "A",
+            NOW - timedelta(minutes=i),
+            Topic.DAILY,
+            "market update" if i % 3 else None,
+        )
+        for i in range(n)
+    ]
+
+
+@pytest.fixture
+def enable_pool(monkeypatch):
+    def enable() -> None:
+        monkeypatch.setenv("NEWS_AGENT_PROCESS_WORKERS", "2")
+        monkeypatch.setenv("NEWS_AGENT_PROCESS_MIN_ITEMS", "10")
+        get_settings.cache_clear()
+
+    yield enable
+    shutdown_process_pool()
+    monkeypatch.undo()
+    get_settings.cache_clear()
+
+
+def test_pool_disabled_by_default():
+    assert get_process_pool() is None
+
+
+def test_parse_feed_entries_is_compact():
+    xml = (Path(__file__).parent / "fixtures" / "sample_rss.xml").read_bytes()
+    entries = parse_feed_entries(xml)
+    assert entries
+    for entry in entries:
+        assert all(v is None or type(v) in (str, int) for v in entry)
+
+
+def test_pool_results_match_in_process(enable_pool):
+    articles = make_articles(40)
+    xml = (Path(__file__).parent / "fixtures" / "sample_rss.xml").read_bytes()
+    expected_tags = ArticleBatch.from_articles(articles).ensure_tags().tolist()
+    expected_clusters = cluster_by_title_similarity(articles)
+
+    enable_pool()
+    pool = get_process_pool()
+    assert pool is not None
+
+    assert ArticleBatch.from_articles(articles).ensure_tags().tolist() == expected_tags
+    assert cluster_by_title_similarity(articles) == expected_clusters
+    assert pool.submit(parse_feed_entries, xml).result() == parse_feed_entries(xml)
+    # Inputs below the size threshold stay in-process
+    assert len(cluster_by_title_similarity(make_articles(5))) == 3
@@ -0,0 +1,69 @@
+from datetime import UTC, datetime, timedelta
+
+from app.core.schemas import ConfidenceTag, Topic
+from app.pipeline.format.cards import build_card
+from app.pipeline.gather.models import Article
+from app.pipeline.rank.ranker import select_top_clusters, summarize_cluster
+
+NOW = datetime(2026, 1, 27, 12, 0, 0, tzinfo=UTC)
+
+
+def make_article(
+    n: int, topic: Topic = Topic.TECH, publisher: str = "Pub", hours_ago: int = 0,
+    summary: str | None = None,
+) -> Article:
+    return Article(
+        title=f"Story {n}",
+        url=f"https://example.com/{n}",
+        publisher_name=publisher,
+        published_at=NOW - timedelta(hours=hours_ago),
+        topic=topic,
+        summary=summary or f"Summary {n}",
+    )
+
+
+def test_truncation_happens_after_ranking():
+    # The multi-source cluster comes last in clustering order but must still win
+    clusters = [[make_article(i, hours_ago=i)] for i in range(5)]
+    clusters.append(
+        [make_article(10, publisher="A", hours_ago=20), make_article(11, publisher="B")]
+    )
+    summaries = [summarize_cluster(m, NOW, order=i) for i, m in enumerate(clusters)]
+
+    winners = select_top_clusters(summaries, max_cards=2, max_cards_per_topic=5)
+
+    assert [w.members[0].title for w in winners] == ["Story 10", "Story 0"]
+    assert winners[0].multi_source
+
+
+def test_per_topic_quota_skips_to_next_best():
+    clusters = [[make_article(i, topic=Topic.TECH, hours_ago=i)] for i in range(4)]
+    clusters.append([make_article(9, topic=Topic.FINANCE, hours_ago=9)])
+    summaries = [summarize_cluster(m, NOW, order=i) for i, m in enumerate(clusters)]
+
+    winners = select_top_clusters(summaries, max_cards=3, max_cards_per_topic=2)
+
+    assert [w.primary.title for w in winners] == ["Story 0", "Story 1", "Story 9"]
+
+
+def test_ties_keep_clustering_order():
+    clusters = [[make_article(i)] for i in range(3)]
+    summaries = [summarize_cluster(m, NOW, order=i) for i, m in enumerate(clusters)]
+
+    winners = select_top_clusters(summaries, max_cards=3, max_cards_per_topic=3)
+
+    assert [w.order for w in winners] == [0, 1, 2]
+
+
+def test_build_card_citations_and_bullets():
+    lead = make_article(1, publisher="A", summary="Lead summary<p>html</p>")
+    other = make_article(2, publisher="B", hours_ago=1, summary="Second view")
+    dup_text = make_article(3, publisher="B", hours_ago=2, summary="Second view")
+
+    card = build_card(summarize_cluster([lead, other, dup_text], NOW))
+
+    assert card.confidence == ConfidenceTag.MULTI_SOURCE
+    assert len(card.sources or []) == 3
+    assert [b.text for b in card.bullets] == ["Lead summary", "Second view"]
+    assert str(card.bullets[0].citations[0].url) == "https://example.com/1"
+    assert str(card.bullets[1].citations[0].url) == "https://example.com/2"
@@ -88,3 +88,40 @@ def test_real_feeds_schema_validation():
     cbc = next(pub for pub in canada.publishers if pub.name == "CBC News")
     tech_feed = next(f for f in cbc.feeds if f.topic == Topic.TECH)
     assert str(tech_feed.url) == "https://www.cbc.ca/cmlink/rss-technology"
+
+
+def test_concurrent_gathers_share_one_fetch():
+    import threading
+    import time
+    from concurrent.futures import ThreadPoolExecutor
+    from unittest.mock import MagicMock, patch
+
+    fixture_path = Path(__file__).parent / "fixtures" / "sample_rss.xml"
+    xml_bytes = fixture_path.read_bytes()
+    feed_registry = RegistryFeed(
+        name="Top Stories", url=HttpUrl("https://cbc.ca/rss"), topic=Topic.DAILY
+    )
+    publisher = Publisher(name="CBC", allowed_domains=["cbc.ca"], feeds=[])
+    release = threading.Event()
+    calls = []
+
+    def slow_get(url, **kwargs):
+        calls.append(url)
+        release.wait(5)
+        return MagicMock(content=xml_bytes)
+
+    with patch("app.pipeline.gather.rss_gatherer.requests.get", side_effect=slow_get):
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            futures = [
+                pool.submit(RSSGatherer().gather, publisher, feed_registry, r, now=TEST_NOW)
+                for r in (TimeRange.H24, TimeRange.D3, TimeRange.H24, TimeRange.D3)
+            ]
+            time.sleep(0.1)
+            release.set()
+            results = [f.result() for f in futures]
+
+    assert len(calls) == 1
+    # Each request applied its own time range to the shared parsed feed
+    assert [len(r) for r in results] == [1, 2, 1, 2]
+    # and got its own Article objects
+    assert results[0][0] is not results[2][0]
@@ -0,0 +1,99 @@
+from datetime import UTC, datetime, timedelta
+from unittest.mock import MagicMock, patch
+
+from app.core.schemas import DigestRequest, Region, TimeRange, Topic
+from app.pipeline.gather.models import Article
+from app.pipeline.orchestrator import build_digest
+from app.pipeline.shards import build_shard_partial, get_shard_cache, merge_partials
+from app.storage.time_index import TimeBucketIndex
+
+NOW = datetime.now(UTC)
+SINCE = NOW - timedelta(hours=24)
+
+
+def article(title: str, url: str, topic: Topic, publisher: str = "A", hours_ago: int = 1):
+    return Article(title, url, publisher, NOW - timedelta(hours=hours_ago), topic, title)
+
+
+def partial_for(region: Region, topic: Topic, articles: list[Article]):
+    index = TimeBucketIndex()
+    index.upsert_many(articles, region)
+    return build_shard_partial((region, topic, TimeRange.H24), index, NOW)
+
+
+def test_same_story_from_two_regions_merges_into_one_cluster():
+    usa = partial_for(
+        Region.USA,
+        Topic.TECH,
+        [article("Chipmaker unveils faster processor", "https://a.com/1", Topic.TECH)],
+    )
+    uk = partial_for(
+        Region.UK,
+        Topic.TECH,
+        [article("Chipmaker unveils faster processor", "https://b.co.uk/1", Topic.TECH, "B", 2)],
+    )
+
+    clusters = merge_partials([usa, uk], [Topic.TECH], SINCE)
+
+    assert len(clusters) == 1
+    assert [a.publisher_name for a in clusters[0]] == ["A", "B"]
+
+
+def test_cross_shard_dedupe_keeps_first_requested_topic():
+    both = article(
+        "Stock market rallies on AI startup", "https://a.com/1?utm_source=x", Topic.DAILY
+    )
+    tech = partial_for(Region.USA, Topic.TECH, [both])
+    finance = partial_for(Region.USA, Topic.FINANCE, [both])
+
+    clusters = merge_partials([tech, finance], [Topic.FINANCE, Topic.TECH], SINCE)
+
+    assert [[a.topic for a in c] for c in clusters] == [[Topic.FINANCE]]
+
+
+def test_daily_fallback_when_no_requested_topic_matches():
+    daily = partial_for(
+        Region.USA,
+        Topic.HEALTH,
+        [article("Local parade draws crowds", "https://a.com/1", Topic.DAILY)],
+    )
+
+    clusters = merge_partials([daily], [Topic.HEALTH], SINCE)
+
+    assert [[a.topic for a in c] for c in clusters] == [[Topic.DAILY]]
+
+
+def test_merge_drops_articles_outside_request_window():
+    shard = partial_for(
+        Region.USA,
+        Topic.TECH,
+        [article("Old robot news", "https://a.com/1", Topic.TECH, hours_ago=5)],
+    )
+    assert merge_partials([shard], [Topic.TECH], NOW - timedelta(hours=2)) == []
+
+
+@patch("app.pipeline.orchestrator.load_source_registry")
+@patch("app.pipeline.orchestrator.get_feeds_for_request")
+@patch("app.pipeline.orchestrator.RSSGatherer.gather")
+def test_overlapping_requests_reuse_cached_shards(mock_gather, mock_get_feeds, mock_load_registry):
+    mock_load_registry.return_value = MagicMock()
+    mock_get_feeds.return_value = [("Publisher A", MagicMock())]
+    mock_gather.return_value = [article("AI chip news", "https://a.com/1", Topic.TECH)]
+
+    def request(regions: list[Region]) -> DigestRequest:
+        return DigestRequest(
+            topics=[Topic.TECH],
+            range=TimeRange.H24,
+            regions=regions,
+            max_cards=10,
+            max_cards_per_topic=5,
+        )
+
+    build_digest(request([Region.USA]))
+    assert mock_gather.call_count == 1
+
+    # Only the UK shard is new; the USA partial comes from the shard cache
+    resp = build_digest(request([Region.USA, Region.UK]))
+    assert mock_gather.call_count == 2
+    assert len(resp.cards) == 1
+    assert get_shard_cache().hits == 1
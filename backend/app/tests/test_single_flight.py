@@ -0,0 +1,91 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import UTC, datetime
+from unittest.mock import patch
+
+import pytest
+
+from app.cache.single_flight import SingleFlight
+from app.core.schemas import DigestRequest, DigestResponse, QAStatus, Region, TimeRange, Topic
+from app.pipeline.orchestrator import build_digest, get_digest_flight
+
+
+def run_concurrently(n: int, fn, release: threading.Event):
+    with ThreadPoolExecutor(max_workers=n) as pool:
+        futures = [pool.submit(fn) for _ in range(n)]
+        # Give every worker time to join the in-flight call
+        time.sleep(0.1)
+        release.set()
+    return futures
+
+
+def test_concurrent_calls_share_one_execution():
+    flight: SingleFlight[str, int] = SingleFlight()
+    release = threading.Event()
+    calls = []
+
+    def work() -> int:
+        calls.append(1)
+        release.wait(5)
+        return 42
+
+    futures = run_concurrently(10, lambda: flight.do("k", work), release)
+
+    assert [f.result() for f in futures] == [42] * 10
+    assert len(calls) == 1
+    assert flight.executions == 1
+    assert flight.coalesced == 9
+    assert flight.coalescing_ratio == pytest.approx(0.9)
+    assert flight.in_flight() == 0
+
+
+def test_errors_propagate_to_waiters_and_are_not_cached():
+    flight: SingleFlight[str, int] = SingleFlight()
+    release = threading.Event()
+
+    def fail() -> int:
+        release.wait(5)
+        raise RuntimeError("boom")
+
+    futures = run_concurrently(4, lambda: flight.do("k", fail), release)
+
+    for f in futures:
+        with pytest.raises(RuntimeError):
+            f.result()
+    assert flight.do("k", lambda: 1) == 1
+
+
+def test_build_digest_coalesces_equivalent_requests():
+    release = threading.Event()
+    built: list[DigestRequest] = []
+
+    def slow_build(req: DigestRequest) -> DigestResponse:
+        built.append(req)
+        release.wait(5)
+        return DigestResponse(generated_at=datetime.now(UTC), qa_status=QAStatus.PASS, request=req)
+
+    requests = [
+        DigestRequest(
+            topics=topics,
+            range=TimeRange.H24,
+            regions=[Region.USA],
+            max_cards=12,
+            max_cards_per_topic=5,
+        )
+        for topics in ([Topic.TECH, Topic.FINANCE], [Topic.FINANCE, Topic.TECH])
+    ]
+    flight = get_digest_flight()
+    flight.reset_stats()
+
+    with patch("app.pipeline.orchestrator._build_digest", side_effect=slow_build):
+        with ThreadPoolExecutor(max_workers=6) as pool:
+            futures = [pool.submit(build_digest, requests[i % 2]) for i in range(6)]
+            time.sleep(0.1)
+            release.set()
+            responses = [f.result() for f in futures]
+
+    assert len(built) == 1
+    assert flight.executions == 1 and flight.coalesced == 5
+    # Every caller gets its own request echoed back
+    assert [r.request.topics for r in responses] == [requests[i % 2].topics for i in range(6)]
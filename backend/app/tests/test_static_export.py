@@ -0,0 +1,100 @@
+import gzip
+import json
+from collections.abc import Sequence
+from datetime import UTC, datetime
+
+from pydantic import HttpUrl
+
+from app.api.responses import render_model
+from app.core.schemas import (
+    Bullet,
+    Citation,
+    DigestCard,
+    DigestRequest,
+    DigestResponse,
+    QAStatus,
+    Topic,
+)
+from app.export.snapshots import expand_matrix, export_snapshots, load_matrix
+from app.pipeline.format.versioning import digest_version
+
+NOW = datetime.now(UTC)
+MATRIX = {
+    "defaults": {"max_cards": 10},
+    "matrix": {"topics": [["tech"], ["finance"]], "range": ["24h", "3d"], "regions": [["uk"]]},
+    "requests": [
+        {"topics": ["tech"], "range": "24h", "regions": ["uk"]},
+        {"topics": ["health", "tech"], "regions": ["canada", "usa"]},
+    ],
+}
+
+
+def card(cid: str, headline: str) -> DigestCard:
+    citation = Citation(publisher="CBC", url=HttpUrl(f"https://cbc.ca/{cid}"), published_at=NOW)
+    return DigestCard(
+        id=cid,
+        topic=Topic.TECH,
+        headline=headline,
+        publisher="CBC",
+        published_at=NOW,
+        bullets=[Bullet(text=headline, citations=[citation])],
+        sources=[citation],
+    )
+
+
+def builds(cards: list[DigestCard]):
+    def build(reqs: Sequence[DigestRequest]) -> list[DigestResponse]:
+        return [
+            DigestResponse(
+                generated_at=datetime.now(UTC), qa_status=QAStatus.PASS, request=req, cards=cards
+            )
+            for req in reqs
+        ]
+
+    return build
+
+
+def test_matrix_expands_every_combination_once():
+    reqs = expand_matrix(MATRIX)
+
+    # The first listed request repeats a matrix cell
+    assert len(reqs) == 5
+    assert {(r.topics[0].value, r.range.value) for r in reqs[:4]} == {
+        ("tech", "24h"),
+        ("tech", "3d"),
+        ("finance", "24h"),
+        ("finance", "3d"),
+    }
+    assert all(r.max_cards == 10 for r in reqs)
+    assert len(load_matrix()) > 1
+
+
+def test_export_writes_served_bytes_precompressed_under_their_version(tmp_path):
+    reqs = expand_matrix(MATRIX)[:2]
+    build = builds([card("rss-aaaaaa", "A")])
+    manifest = export_snapshots(reqs, tmp_path, build=build)
+
+    assert json.loads((tmp_path / "manifest.json").read_bytes()) == manifest
+    assert len(list((tmp_path / "manifests").iterdir())) == 1
+    entry = manifest["digests"][0]
+    response = build(reqs[:1])[0]
+    body = (tmp_path / entry["path"]).read_bytes()
+    assert entry["path"] == f"digests/{digest_version(response)}.json"
+    assert json.loads(body)["cards"] == json.loads(render_model(response))["cards"]
+    gz = tmp_path / entry["encodings"]["gzip"]["path"]
+    assert gzip.decompress(gz.read_bytes()) == body
+    assert not list(tmp_path.rglob("*.tmp"))
+
+
+def test_unchanged_digests_keep_their_files_and_old_ones_are_pruned(tmp_path):
+    reqs = expand_matrix(MATRIX)[:1]
+    first = export_snapshots(reqs, tmp_path, keep=1, build=builds([card("rss-aaaaaa", "A")]))
+    again = export_snapshots(reqs, tmp_path, keep=1, build=builds([card("rss-aaaaaa", "A")]))
+    changed = export_snapshots(reqs, tmp_path, keep=1, build=builds([card("rss-aaaaaa", "B")]))
+
+    old, new = first["digests"][0], changed["digests"][0]
+    assert again["digests"][0] == old
+    assert new["path"] != old["path"]
+    assert not (tmp_path / old["path"]).exists()
+    assert (tmp_path / new["path"]).exists()
+    assert len(list((tmp_path / "manifests").iterdir())) == 1
@@ -0,0 +1,117 @@
+import asyncio
+import json
+import time
+from datetime import UTC, datetime, timedelta
+from email.utils import format_datetime
+from unittest.mock import MagicMock, patch
+
+import httpx
+from fastapi.testclient import TestClient
+from pydantic import HttpUrl
+
+from app.core.schemas import ConfidenceTag, DigestRequest, QAStatus, Region, TimeRange, Topic
+from app.core.source_registry import Feed as RegistryFeed
+from app.core.source_registry import Publisher
+from app.main import app
+from app.pipeline.orchestrator import build_digest_async, stream_digest
+
+FAST = Publisher(name="CBC", allowed_domains=["cbc.ca"], feeds=[])
+SLOW = Publisher(name="BBC", allowed_domains=["bbc.co.uk"], feeds=[])
+FEEDS = [
+    (FAST, RegistryFeed(name="Tech", url=HttpUrl("https://cbc.ca/rss"), topic=Topic.TECH)),
+    (SLOW, RegistryFeed(name="Tech", url=HttpUrl("https://bbc.co.uk/rss"), topic=Topic.TECH)),
+]
+REQ = DigestRequest(
+    topics=[Topic.TECH],
+    range=TimeRange.H24,
+    regions=[Region.CANADA],
+    max_cards=10,
+    max_cards_per_topic=5,
+)
+SLOW_SECONDS = 0.5
+
+
+def rss(*items: tuple[str, str]) -> bytes:
+    date = format_datetime(datetime.now(UTC) - timedelta(hours=1), usegmt=True)
+    body = "".join(
+        f"<item><title>{title}</title><link>{link}</link><pubDate>{date}</pubDate></item>"
+        for title, link in items
+    )
+    return f'<?xml version="1.0"?><rss version="2.0"><channel>{body}</channel></rss>'.encode()
+
+
+async def handler(request: httpx.Request) -> httpx.Response:
+    if request.url.host == "cbc.ca":
+        return httpx.Response(200, content=rss(("AI chip launch today", "https://cbc.ca/1")))
+    await asyncio.sleep(SLOW_SECONDS)
+    return httpx.Response(
+        200,
+        content=rss(
+            ("AI chip launch today", "https://bbc.co.uk/1"),
+            ("Robot startup raises", "https://bbc.co.uk/2"),
+        ),
+    )
+
+
+def mock_client() -> httpx.AsyncClient:
+    return httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+
+@patch("app.pipeline.orchestrator.load_source_registry", return_value=MagicMock())
+@patch("app.pipeline.orchestrator.get_feeds_for_request", return_value=FEEDS)
+def test_first_card_arrives_with_the_fastest_feed(*_):
+    async def run():
+        start = time.perf_counter()
+        async with mock_client() as client:
+            return [(f, time.perf_counter() - start) async for f in stream_digest(REQ, client)]
+
+    timed_frames = asyncio.run(run())
+    frames = [f for f, _ in timed_frames]
+
+    assert [f.type for f in frames] == ["header", "card", "update", "card", "qa"]
+    assert frames[0].pending_feeds == 2
+    first_card, first_at = timed_frames[1]
+    assert first_card.card.confidence == ConfidenceTag.SINGLE_SOURCE
+    assert first_at < SLOW_SECONDS
+
+    # The slow feed's copy of the story joins the first card's cluster
+    update = frames[2]
+    assert update.replaces == first_card.card.id
+    assert update.card.confidence == ConfidenceTag.MULTI_SOURCE
+    assert frames[-1].qa_status == QAStatus.PASS
+
+
+@patch("app.pipeline.orchestrator.load_source_registry", return_value=MagicMock())
+@patch("app.pipeline.orchestrator.get_feeds_for_request", return_value=FEEDS)
+def test_stream_ends_with_the_same_cards_as_a_regular_build(*_):
+    async def run():
+        async with mock_client() as client:
+            frames = [f async for f in stream_digest(REQ, client)]
+            return frames, await build_digest_async(REQ, client)
+
+    frames, response = asyncio.run(run())
+
+    assert frames[-1].card_ids == [c.id for c in response.cards]
+
+
+@patch("app.pipeline.orchestrator.load_source_registry", return_value=MagicMock())
+@patch("app.pipeline.orchestrator.get_feeds_for_request", return_value=FEEDS)
+def test_stream_endpoint_speaks_ndjson_and_sse(*_):
+    client = TestClient(app)
+    with patch("app.pipeline.orchestrator._http_client") as http_client:
+        http_client.return_value.__aenter__.return_value = mock_client()
+        ndjson = client.post("/digest/stream", json=REQ.model_dump(mode="json"))
+
+    assert ndjson.headers["content-type"].startswith("application/x-ndjson")
+    live = [json.loads(line)["type"] for line in ndjson.text.splitlines()]
+    assert live[0] == "header" and live[-1] == "qa"
+
+    # The finished digest was cached, so this replays it
+    sse = client.post(
+        "/digest/stream",
+        json=REQ.model_dump(mode="json"),
+        headers={"Accept": "text/event-stream"},
+    )
+    events = [line[len("event: ") :] for line in sse.text.splitlines() if line.startswith("event")]
+    assert sse.headers["content-type"].startswith("text/event-stream")
+    assert events == ["header", "card", "card", "qa"]
@@ -0,0 +1,213 @@
+import asyncio
+from datetime import UTC, datetime, timedelta
+from email.utils import format_datetime
+from unittest.mock import MagicMock, patch
+
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+from pydantic import HttpUrl
+from starlette.websockets import WebSocketDisconnect
+
+from app.cache.digest_cache import DigestCache
+from app.core.schemas import (
+    Bullet,
+    Citation,
+    DigestCard,
+    DigestRequest,
+    DigestResponse,
+    QAStatus,
+    Region,
+    StreamHeader,
+    TimeRange,
+    Topic,
+)
+from app.core.source_registry import Feed, Publisher
+from app.main import app
+from app.pipeline import orchestrator
+from app.pipeline.gather.models import Article
+from app.pipeline.orchestrator import build_digest_async
+from app.pipeline.subscriptions import SubscriptionHub
+from app.storage.time_index import TimeBucketIndex
+
+NOW = datetime.now(UTC)
+REQ = DigestRequest(
+    topics=[Topic.TECH, Topic.FINANCE],
+    range=TimeRange.H24,
+    regions=[Region.CANADA],
+    max_cards=10,
+    max_cards_per_topic=5,
+)
+
+
+def card(cid: str, headline: str) -> DigestCard:
+    citation = Citation(publisher="CBC", url=HttpUrl(f"https://cbc.ca/{cid}"), published_at=NOW)
+    return DigestCard(
+        id=cid,
+        topic=Topic.TECH,
+        headline=headline,
+        publisher="CBC",
+        published_at=NOW,
+        bullets=[Bullet(text=headline, citations=[citation])],
+        sources=[citation],
+    )
+
+
+class Builds:
+    """
+    Scripted digest builds: one card list per refresh, the last repeating.
+    """
+
+    def __init__(self, *card_lists: list[DigestCard]):
+        self.card_lists = list(card_lists)
+        self.calls = 0
+
+    async def __call__(self, req: DigestRequest) -> DigestResponse:
+        cards = self.card_lists[min(self.calls, len(self.card_lists) - 1)]
+        self.calls += 1
+        return DigestResponse(
+            generated_at=datetime.now(UTC), qa_status=QAStatus.PASS, request=req, cards=cards
+        )
+
+
+def hub(builds: Builds) -> SubscriptionHub:
+    # No digest TTL, so every refresh reaches the builder
+    return SubscriptionHub(builds, DigestCache(ttl_by_range={}), interval_seconds=0.01)
+
+
+async def take(frames, n: int) -> list[str]:
+    return [(await anext(frames)).type for _ in range(n)]
+
+
+def test_subscribers_to_one_request_share_a_channel_and_get_only_changes():
+    a, b = card("rss-aaaaaa", "A"), card("rss-bbbbbb", "B")
+    builds = Builds([a], [a], [card("rss-aaaaaa", "A grew"), b])
+    subscriptions = hub(builds)
+    reordered = REQ.model_copy(update={"topics": [Topic.FINANCE, Topic.TECH]})
+
+    async def run():
+        first = subscriptions.subscribe(REQ)
+        second = subscriptions.subscribe(reordered)
+        initial = await take(first, 3)
+        header = await anext(second)
+        assert subscriptions.channels() == 1
+        assert isinstance(header, StreamHeader) and header.request == reordered
+        await take(second, 2)
+        changes = await take(first, 3), await take(second, 3)
+        await first.aclose()
+        await second.aclose()
+        return initial, changes
+
+    initial, changes = asyncio.run(run())
+
+    assert initial == ["header", "card", "qa"]
+    # The unchanged second refresh pushed nothing
+    assert changes == (["update", "card", "qa"], ["update", "card", "qa"])
+    assert subscriptions.channels() == 0
+    assert builds.calls == subscriptions.refreshes
+
+
+def test_websocket_subscription(monkeypatch):
+    builds = Builds([card("rss-aaaaaa", "A")], [card("rss-aaaaaa", "A"), card("rss-bbbbbb", "B")])
+    monkeypatch.setattr("app.api.routes.get_subscription_hub", lambda: hub(builds))
+    client = TestClient(app)
+
+    with client.websocket_connect("/digest/subscribe") as ws:
+        ws.send_json(REQ.model_dump(mode="json"))
+        frames = [ws.receive_json() for _ in range(5)]
+
+    assert [f["type"] for f in frames] == ["header", "card", "qa", "card", "qa"]
+    assert frames[3]["card"]["id"] == "rss-bbbbbb"
+    assert frames[4]["card_ids"] == ["rss-aaaaaa", "rss-bbbbbb"]
+
+    with client.websocket_connect("/digest/subscribe") as ws:
+        ws.send_json({"topics": ["nope"]})
+        with pytest.raises(WebSocketDisconnect) as closed:
+            ws.receive_json()
+    assert closed.value.code == 1007
+
+
+def test_ingested_articles_wake_matching_channels_before_the_interval():
+    builds = Builds([card("rss-aaaaaa", "A")], [card("rss-aaaaaa", "A"), card("rss-bbbbbb", "B")])
+    # A fresh digest cache and a long interval: only a notify rebuilds
+    subscriptions = SubscriptionHub(
+        builds, DigestCache(ttl_by_range={TimeRange.H24: 600.0}), interval_seconds=600
+    )
+
+    async def run():
+        frames = subscriptions.subscribe(REQ)
+        await take(frames, 3)
+        await asyncio.to_thread(subscriptions.notify, Region.UK, {Topic.TECH})
+        await asyncio.to_thread(subscriptions.notify, Region.CANADA, {Topic.HEALTH})
+        await asyncio.sleep(0.05)
+        calls = builds.calls
+        await asyncio.to_thread(subscriptions.notify, Region.CANADA, {Topic.TECH})
+        changes = await asyncio.wait_for(take(frames, 2), 1)
+        await frames.aclose()
+        return calls, changes
+
+    calls, changes = asyncio.run(run())
+
+    assert calls == 1
+    assert changes == ["card", "qa"]
+
+
+def test_only_ingests_that_add_articles_notify(monkeypatch):
+    notified = []
+    monkeypatch.setattr(orchestrator, "_ingest_listeners", [lambda *args: notified.append(args)])
+    index = TimeBucketIndex()
+    story = Article("Chip launch", "https://cbc.ca/1", "CBC", NOW, Topic.TECH)
+
+    orchestrator._upsert(index, [story], Region.CANADA)
+    orchestrator._upsert(index, [story], Region.CANADA)
+    orchestrator._upsert(index, [story], Region.UK)
+
+    assert notified == [(Region.CANADA, {Topic.TECH}), (Region.UK, {Topic.TECH})]
+
+
+def rss(*titles: str) -> bytes:
+    date = format_datetime(datetime.now(UTC) - timedelta(hours=1), usegmt=True)
+    body = "".join(
+        f"<item><title>{title}</title><link>https://cbc.ca/{i}</link><pubDate>{date}</pubDate></item>"
+        for i, title in enumerate(titles)
+    )
+    return f'<?xml version="1.0"?><rss version="2.0"><channel>{body}</channel></rss>'.encode()
+
+
+@patch("app.pipeline.orchestrator.load_source_registry", return_value=MagicMock())
+@patch("app.pipeline.orchestrator.get_feeds_for_request")
+def test_woken_channel_sees_articles_another_range_ingested(mock_get_feeds, _, monkeypatch):
+    feed = Feed(name="Top Stories", url=HttpUrl("https://cbc.ca/rss"), topic=Topic.TECH)
+    mock_get_feeds.return_value = [
+        (Publisher(name="CBC", allowed_domains=["cbc.ca"], feeds=[]), feed)
+    ]
+    feed_xml = [rss("AI chip launch")]
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, content=feed_xml[0])
+
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    subscriptions = SubscriptionHub(
+        lambda req: build_digest_async(req, client),
+        DigestCache(ttl_by_range={TimeRange.H24: 600.0}),
+        interval_seconds=600,
+    )
+    monkeypatch.setattr(orchestrator, "_ingest_listeners", [subscriptions.notify])
+    req = REQ.model_copy(update={"topics": [Topic.TECH]})
+
+    async def run():
+        frames = subscriptions.subscribe(req)
+        initial = await take(frames, 3)
+        feed_xml[0] = rss("AI chip launch", "Quantum computer unveiled", "Robot startup raises")
+        await build_digest_async(req.model_copy(update={"range": TimeRange.D7}), client)
+        changes = [await asyncio.wait_for(anext(frames), 1) for _ in range(3)]
+        await frames.aclose()
+        await client.aclose()
+        return initial, changes
+
+    initial, changes = asyncio.run(run())
+
+    assert initial == ["header", "card", "qa"]
+    assert [f.type for f in changes] == ["card", "card", "qa"]
+    # The 24h rebuild merged the articles the 7d build ingested
+    assert len(changes[-1].card_ids) == 3
@@ -0,0 +1,92 @@
+from datetime import UTC, datetime, timedelta
+from unittest.mock import MagicMock, patch
+
+from app.core.schemas import DigestRequest, Region, TimeRange, Topic
+from app.pipeline.gather.models import Article
+from app.pipeline.orchestrator import build_digest
+from app.pipeline.shards import get_shard_cache
+from app.storage.time_index import TimeBucketIndex
+
+NOW = datetime(2026, 1, 27, 12, 30, 0, tzinfo=UTC)
+
+
+def make_article(n: int, hours_ago: float, topic: Topic = Topic.TECH, url: str = "") -> Article:
+    return Article(
+        title=f"Story {n}",
+        url=url or f"https://example.com/{n}",
+        publisher_name="P",
+        published_at=NOW - timedelta(hours=hours_ago),
+        topic=topic,
+    )
+
+
+def test_window_boundary_inside_a_bucket():
+    index = TimeBucketIndex()
+    # 23.9h and 24.1h old land in neighbouring hourly buckets
+    index.upsert_many([make_article(1, 23.9), make_article(2, 24.1), make_article(3, 1)],
+                      Region.UK)
+
+    results = index.query_window(NOW - timedelta(hours=24), [Region.UK])
+
+    assert [a.title for a in results] == ["Story 3", "Story 1"]
+
+
+def test_query_only_touches_requested_partitions():
+    index = TimeBucketIndex()
+    index.upsert_many([make_article(1, 1), make_article(2, 2, topic=Topic.FINANCE)], Region.UK)
+    index.upsert_many([make_article(3, 1)], Region.USA)
+
+    since = NOW - timedelta(days=3)
+    assert [a.title for a in index.query_window(since, [Region.UK], [Topic.TECH])] == ["Story 1"]
+    assert len(index.query_window(since, [Region.UK, Region.USA])) == 3
+
+
+def test_upsert_moves_article_to_newer_bucket_and_dedupes_regions():
+    index = TimeBucketIndex()
+    index.upsert_many([make_article(1, 5, url="https://a.com/x")], Region.UK)
+    index.upsert_many([make_article(2, 1, url="https://a.com/x?utm_source=rss")], Region.UK)
+    index.upsert_many([make_article(3, 3, url="https://a.com/x")], Region.GLOBAL)
+
+    results = index.query_window(NOW - timedelta(days=1), [Region.UK, Region.GLOBAL])
+
+    assert [a.title for a in results] == ["Story 2"]
+    assert index.count() == 2
+
+
+def test_eviction_drops_old_buckets():
+    index = TimeBucketIndex(retention=timedelta(days=7))
+    index.upsert_many([make_article(i, hours_ago=i * 24) for i in range(10)], Region.UK)
+
+    removed = index.prune_if_due(NOW, timedelta(days=7))
+
+    assert removed == 2
+    assert index.count() == 8
+    assert len(index.query_window(NOW - timedelta(days=30), [Region.UK])) == 8
+
+
+@patch("app.pipeline.orchestrator.load_source_registry")
+@patch("app.pipeline.orchestrator.get_feeds_for_request")
+@patch("app.pipeline.orchestrator.RSSGatherer.gather")
+def test_digest_reads_window_from_index(mock_gather, mock_get_feeds, mock_load_registry):
+    mock_load_registry.return_value = MagicMock()
+    mock_get_feeds.return_value = [("Publisher A", MagicMock())]
+    now = datetime.now(UTC)
+    mock_gather.return_value = [
+        Article("AI chip news", "https://a.com/1", "A", now, Topic.TECH, "AI chip"),
+    ]
+    req = DigestRequest(
+        topics=[Topic.TECH],
+        range=TimeRange.H24,
+        regions=[Region.GLOBAL],
+        max_cards=10,
+        max_cards_per_topic=5,
+    )
+    build_digest(req)
+    get_shard_cache().clear()  # force the shard to be recomputed from the index
+
+    mock_gather.return_value = [
+        Article("Robot startup raises", "https://a.com/2", "A", now, Topic.TECH, "robot"),
+    ]
+    resp = build_digest(req)
+
+    assert len(resp.cards) == 2
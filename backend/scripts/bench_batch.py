@@ -0,0 +1,100 @@
+import copy
+import random
+import sys
+import time
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+
+# Add backend to path to import app modules
+sys.path.append(str(Path(__file__).parent.parent))
+from app.core.schemas import TimeRange, Topic
+from app.pipeline.batch import (
+    ArticleBatch,
+    deduplicate_batch,
+    filter_batch_by_publishers,
+    filter_batch_by_time_range,
+    filter_batch_by_topics,
+)
+from app.pipeline.gather.models import Article
+from app.pipeline.gather.rss_gatherer import filter_by_time_range
+from app.pipeline.verify.dedupe import deduplicate_candidates
+from app.pipeline.verify.verify_items import filter_by_topics
+
+N_ARTICLES = 100_000
+NOW = datetime.now(UTC)
+PUBLISHERS = [f"Publisher {i}" for i in range(40)]
+TITLES = [
+    "AI chip released by startup",
+    "Stock market rally continues",
+    "New vaccine study published",
+    "University launches new course",
+    "Local weather update",
+]
+
+
+def make_articles(n: int) -> list[Article]:
+    rng = random.Random(42)
+    return [
+        Article(
+            title=f"{rng.choice(TITLES)} {i}",
+            url=f"https://example.com/story/{rng.randrange(n // 2)}",
+            publisher_name=rng.choice(PUBLISHERS),
+            published_at=NOW - timedelta(minutes=rng.randrange(7 * 24 * 60)),
+            topic=rng.choice(list(Topic)),
+            summary="summary " * rng.randrange(20),
+        )
+        for i in range(n)
+    ]
+
+
+def timed(fn):
+    start = time.perf_counter()
+    fn()
+    return (time.perf_counter() - start) * 1000
+
+
+def main():
+    articles = make_articles(N_ARTICLES)
+    wanted = PUBLISHERS[:10]
+    wanted_set = set(wanted)
+    # filter_by_topics reassigns Article.topic in place, so it gets its own
+    # copies and the rows after it still see the original topics
+    topic_articles = [copy.copy(a) for a in articles]
+
+    build_ms = timed(lambda: ArticleBatch.from_articles(articles))
+    batch = ArticleBatch.from_articles(articles)
+    tag_ms = timed(batch.ensure_tags)
+
+    rows = [
+        (
+            "time range (24h)",
+            timed(lambda: filter_by_time_range(articles, TimeRange.H24, now=NOW)),
+            timed(lambda: filter_batch_by_time_range(batch, TimeRange.H24, now=NOW)),
+        ),
+        (
+            "publishers (10/40)",
+            timed(lambda: [a for a in articles if a.publisher_name in wanted_set]),
+            timed(lambda: filter_batch_by_publishers(batch, wanted)),
+        ),
+        (
+            "topics (tech, finance)",
+            timed(lambda: filter_by_topics(topic_articles, [Topic.TECH, Topic.FINANCE])),
+            timed(lambda: filter_batch_by_topics(batch, [Topic.TECH, Topic.FINANCE])),
+        ),
+        (
+            "dedupe",
+            timed(lambda: deduplicate_candidates(articles)),
+            timed(lambda: deduplicate_batch(batch)),
+        ),
+    ]
+
+    print(f"{N_ARTICLES} articles")
+    print(f"batch build: {build_ms:.1f} ms, one-time tagging: {tag_ms:.1f} ms")
+    print("| Stage | list (ms) | batch (ms) | speedup |")
+    print("|---|---|---|---|")
+    for name, list_ms, batch_ms in rows:
+        print(f"| {name} | {list_ms:.1f} | {batch_ms:.1f} | {list_ms / batch_ms:.1f}x |")
+
+
+if __name__ == "__main__":
+    main()
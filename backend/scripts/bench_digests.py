@@ -0,0 +1,89 @@
+import itertools
+import random
+import sys
+import time
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+from unittest.mock import patch
+
+# Add backend to path to import app modules
+sys.path.append(str(Path(__file__).parent.parent))
+from app.core.schemas import DigestRequest, Region, TimeRange, Topic
+from app.pipeline.gather.models import Article
+from app.pipeline.orchestrator import build_digest, build_digests
+from app.pipeline.shards import get_shard_cache
+from app.storage.corpus import get_article_index
+
+N_REQUESTS = 500
+ITEMS_PER_FEED = 60
+NOW = datetime.now(UTC)
+WORDS = ["ai", "market", "vaccine", "course", "weather", "chip", "stock", "study", "city"]
+TOPICS = [Topic.TECH, Topic.FINANCE, Topic.HEALTH, Topic.LEARNING, Topic.DAILY]
+
+
+def make_requests(rng: random.Random, n: int) -> list[DigestRequest]:
+    """
+    Subscriber preferences: 1-2 topics, 1-2 regions, any range.
+    """
+    topic_sets = [list(c) for k in (1, 2) for c in itertools.combinations(TOPICS, k)]
+    region_sets = [list(c) for k in (1, 2) for c in itertools.combinations(Region, k)]
+    return [
+        DigestRequest(
+            topics=rng.choice(topic_sets),
+            regions=rng.choice(region_sets),
+            range=rng.choice(list(TimeRange)),
+            max_cards=10,
+            max_cards_per_topic=5,
+        )
+        for _ in range(n)
+    ]
+
+
+def fake_gather(publisher, feed, time_range, *args, **kwargs) -> list[Article]:
+    """
+    Stands in for the network: synthetic articles per feed, stable per URL.
+    """
+    rng = random.Random(str(feed.url))
+    domain = publisher.allowed_domains[0]
+    return [
+        Article(
+            title=" ".join(rng.choices(WORDS, k=6)),
+            url=f"https://{domain}/{feed.topic.value}/{i}",
+            publisher_name=publisher.name,
+            published_at=NOW - timedelta(minutes=rng.randrange(7 * 24 * 60)),
+            topic=feed.topic,
+        )
+        for i in range(ITEMS_PER_FEED)
+    ]
+
+
+def reset() -> None:
+    get_article_index().clear()
+    get_shard_cache().clear()
+
+
+def timed(fn) -> tuple[float, int]:
+    reset()
+    with patch("app.pipeline.orchestrator.RSSGatherer.gather", side_effect=fake_gather) as gather:
+        start = time.perf_counter()
+        fn()
+        return time.perf_counter() - start, gather.call_count
+
+
+def main():
+    requests = make_requests(random.Random(42), N_REQUESTS)
+
+    rows = [
+        ("one build_digest per request", timed(lambda: [build_digest(r) for r in requests])),
+        ("build_digests(batch)", timed(lambda: build_digests(requests))),
+    ]
+
+    print(f"{N_REQUESTS} requests, {ITEMS_PER_FEED} items per feed")
+    print("| Mode | seconds | digests/s | feed gathers |")
+    print("|---|---|---|---|")
+    for name, (seconds, gathers) in rows:
+        print(f"| {name} | {seconds:.2f} | {N_REQUESTS / seconds:.0f} | {gathers} |")
+
+
+if __name__ == "__main__":
+    main()
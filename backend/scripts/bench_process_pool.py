@@ -0,0 +1,76 @@
+import os
+import random
+import sys
+import time
+from datetime import UTC, datetime, timedelta
+from email.utils import format_datetime
+from pathlib import Path
+
+# Add backend to path to import app modules
+sys.path.append(str(Path(__file__).parent.parent))
+from app.core.config import get_settings
+from app.core.executors import get_process_pool, map_chunks, shutdown_process_pool
+from app.pipeline.batch import tag_masks_for
+from app.pipeline.gather.rss_gatherer import parse_feed_entries
+
+N_ARTICLES = 20_000
+N_FEEDS = 16
+ITEMS_PER_FEED = 200
+NOW = datetime.now(UTC)
+WORDS = ["ai", "market", "vaccine", "course", "weather", "chip", "stock", "study", "city"]
+
+
+def make_feed(rng: random.Random, n: int) -> bytes:
+    items = []
+    for i in range(n):
+        date = format_datetime(NOW - timedelta(minutes=rng.randrange(3 * 24 * 60)), usegmt=True)
+        title = " ".join(rng.choices(WORDS, k=6))
+        items.append(
+            f"<item><title>{title}</title><link>https://example.com/{i}</link>"
+            f"<pubDate>{date}</pubDate><description>{title} {title}</description></item>"
+        )
+    channel = "".join(items)
+    return f'<?xml version="1.0"?><rss version="2.0"><channel>{channel}</channel></rss>'.encode()
+
+
+def timed(fn):
+    start = time.perf_counter()
+    fn()
+    return (time.perf_counter() - start) * 1000
+
+
+def run(feeds: list[bytes], texts: list[tuple[str, str | None, int]], workers: int):
+    pool = get_process_pool()
+    if pool is None:
+        return (
+            timed(lambda: [parse_feed_entries(f) for f in feeds]),
+            timed(lambda: tag_masks_for(texts)),
+        )
+    # Warm the workers so spawn time is not measured
+    list(pool.map(parse_feed_entries, feeds[:workers]))
+    return (
+        timed(lambda: list(pool.map(parse_feed_entries, feeds))),
+        timed(lambda: map_chunks(tag_masks_for, texts)),
+    )
+
+
+def main():
+    rng = random.Random(42)
+    feeds = [make_feed(rng, ITEMS_PER_FEED) for _ in range(N_FEEDS)]
+    texts = [(" ".join(rng.choices(WORDS, k=6)), None, 0) for _ in range(N_ARTICLES)]
+
+    print(f"{N_FEEDS} feeds x {ITEMS_PER_FEED} items, {N_ARTICLES} articles to tag")
+    print("| Workers | parse feeds (ms) | tag articles (ms) |")
+    print("|---|---|---|")
+    for workers in sorted({0, 2, 4, os.cpu_count() or 1}):
+        os.environ["NEWS_AGENT_PROCESS_WORKERS"] = str(workers)
+        os.environ["NEWS_AGENT_PROCESS_MIN_ITEMS"] = "1"
+        get_settings.cache_clear()
+        parse_ms, tag_ms = run(feeds, texts, workers)
+        shutdown_process_pool()
+        label = "in-process" if workers == 0 else str(workers)
+        print(f"| {label} | {parse_ms:.1f} | {tag_ms:.1f} |")
+
+
+if __name__ == "__main__":
+    main()
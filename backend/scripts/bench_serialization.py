@@ -0,0 +1,128 @@
+import random
+import sys
+import time
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+
+# Add backend to path to import app modules
+sys.path.append(str(Path(__file__).parent.parent))
+from fastapi.routing import APIRoute
+
+from app.api.responses import FastJSONResponse, _dump_json
+from app.cache.fragments import get_fragment_cache
+from app.core.schemas import (
+    DigestCard,
+    DigestRequest,
+    DigestResponse,
+    QAStatus,
+    Region,
+    TimeRange,
+    Topic,
+)
+from app.pipeline.format.cards import _http_url, build_card
+from app.pipeline.format.versioning import _digest_version, digest_version
+from app.pipeline.gather.models import Article
+from app.pipeline.orchestrator import qa_cards
+from app.pipeline.rank.ranker import ClusterSummary, summarize_cluster
+
+N_CARDS = 50
+MEMBERS_PER_CARD = 4
+ROUNDS = 200
+NOW = datetime.now(UTC)
+WORDS = ["ai", "market", "vaccine", "course", "weather", "chip", "stock", "study", "city"]
+PUBLISHERS = [("CBC", "cbc.ca"), ("BBC", "bbc.co.uk"), ("CNN", "cnn.com"), ("NPR", "npr.org")]
+REQ = DigestRequest(
+    topics=[Topic.TECH],
+    range=TimeRange.D3,
+    regions=[Region.CANADA],
+    max_cards=N_CARDS,
+    max_cards_per_topic=20,
+)
+
+
+def make_summaries(rng: random.Random) -> list[ClusterSummary]:
+    summaries = []
+    for i in range(N_CARDS):
+        members = [
+            Article(
+                title=" ".join(rng.choices(WORDS, k=8)),
+                url=f"https://{domain}/tech/{i}",
+                publisher_name=name,
+                published_at=NOW - timedelta(minutes=rng.randrange(3 * 24 * 60)),
+                topic=Topic.TECH,
+                summary=" ".join(rng.choices(WORDS, k=30)),
+            )
+            for name, domain in PUBLISHERS[:MEMBERS_PER_CARD]
+        ]
+        summaries.append(summarize_cluster(members, NOW))
+    return summaries
+
+
+def per_round(fn) -> float:
+    fn()
+    start = time.perf_counter()
+    for _ in range(ROUNDS):
+        fn()
+    return (time.perf_counter() - start) / ROUNDS * 1000
+
+
+def main():
+    summaries = make_summaries(random.Random(42))
+    response = DigestResponse(
+        generated_at=NOW,
+        qa_status=QAStatus.PASS,
+        request=REQ,
+        cards=[build_card(s) for s in summaries],
+    )
+    field = APIRoute("/digest", lambda: None, response_model=DigestResponse).response_field
+    assert field is not None
+
+    def cold_build() -> list[DigestCard]:
+        _http_url.cache_clear()
+        return [build_card(s) for s in summaries]
+
+    def response_model_hit() -> bytes:
+        # Before: ETag hashed from a fresh dump, then FastAPI validates and dumps
+        _digest_version(response)
+        value, _ = field.validate(response, {}, loc=("response",))
+        return field.serialize_json(value)
+
+    def first_serve() -> bytes:
+        _digest_version(response)
+        return _dump_json(response)
+
+    def assemble() -> bytes:
+        # A digest for another request: build (or reuse) cards, ETag, body
+        fresh = DigestResponse(
+            generated_at=NOW, qa_status=QAStatus.PASS, request=REQ, cards=qa_cards(summaries)
+        )
+        _digest_version(fresh)
+        return _dump_json(fresh)
+
+    def new_stories() -> bytes:
+        get_fragment_cache().clear()
+        return assemble()
+
+    def fast_response_hit() -> bytes:
+        digest_version(response)
+        return FastJSONResponse(response).body
+
+    rows = [
+        ("build cards, URLs parsed", per_round(cold_build)),
+        ("build cards, URLs reused", per_round(lambda: [build_card(s) for s in summaries])),
+        ("cache hit, ETag + response_model dump", per_round(response_model_hit)),
+        ("cache hit, ETag + FastJSONResponse", per_round(fast_response_hit)),
+        ("first serve, ETag + FastJSONResponse", per_round(first_serve)),
+        ("new digest, every story new", per_round(new_stories)),
+        ("new digest, every story cached", per_round(assemble)),
+    ]
+
+    print(f"{N_CARDS}-card digest, {MEMBERS_PER_CARD} sources per card, {ROUNDS} rounds")
+    print("| Step | ms per digest |")
+    print("|---|---|")
+    for name, ms in rows:
+        print(f"| {name} | {ms:.3f} |")
+
+
+if __name__ == "__main__":
+    main()
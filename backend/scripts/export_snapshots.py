@@ -0,0 +1,37 @@
+import argparse
+import logging
+import sys
+import time
+from pathlib import Path
+
+# Add backend to path to import app modules
+sys.path.append(str(Path(__file__).parent.parent))
+from app.export.snapshots import MATRIX_PATH, export_snapshots, load_matrix
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Run the pipeline once and write static digest snapshots with a manifest."
+    )
+    parser.add_argument("out_dir", type=Path, help="directory served by the CDN or file server")
+    parser.add_argument(
+        "--matrix", type=Path, default=MATRIX_PATH, help="YAML/JSON file of requests to export"
+    )
+    parser.add_argument(
+        "--keep", type=int, default=3, help="past manifests whose files are kept (default 3)"
+    )
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s %(name)s: %(message)s")
+    reqs = load_matrix(args.matrix)
+    start = time.perf_counter()
+    manifest = export_snapshots(reqs, args.out_dir, keep=args.keep)
+    elapsed = time.perf_counter() - start
+
+    total = sum(entry["bytes"] for entry in manifest["digests"])
+    print(f"Exported {len(manifest['digests'])} digests ({total} bytes) in {elapsed:.1f}s")
+    print(f"Manifest: {args.out_dir / 'manifest.json'}")
+
+
+if __name__ == "__main__":
+    main()